@@ -0,0 +1,20 @@
+"""Shared DDL helpers for migrations of day-partitioned tables."""
+
+import datetime as dt
+
+from alembic import op
+
+PARTITION_DAYS = 3
+
+
+def create_day_partitions(table: str) -> None:
+    """Create daily partitions for today and the next days (UTC)."""
+    today = dt.datetime.now(dt.timezone.utc).date()
+
+    for offset in range(PARTITION_DAYS):
+        start = dt.datetime.combine(today + dt.timedelta(days=offset), dt.time(), dt.timezone.utc)
+        end = start + dt.timedelta(days=1)
+        op.execute(
+            f"CREATE TABLE {table}_p{start:%Y%m%d} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
@@ -0,0 +1,58 @@
+"""click_buckets
+
+Revision ID: 7e7a276dc8d9
+Revises: 8d3d3ff08fb1
+Create Date: 2026-10-18 10:47:51.203384
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+from partitions import create_day_partitions
+
+revision: str = "7e7a276dc8d9"
+down_revision: Union[str, None] = "8d3d3ff08fb1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ("clickminute", "clickhour"):
+        op.create_table(
+            table,
+            sa.Column("url_id", sa.Integer(), nullable=False),
+            sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("clicks", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["url_id"], ["urlpair.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("url_id", "bucket_start"),
+            postgresql_partition_by="RANGE (bucket_start)",
+        )
+        # Страховочная секция на случай, если плановая задача не успела
+        # создать дневную секцию.
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+        # Дневные секции создаются до переноса счётчиков: если строки за
+        # сегодня попадут в DEFAULT, секцию за сегодня уже не создать.
+        create_day_partitions(table)
+
+    # Переносим накопленные счётчики в бакеты, чтобы пересчёт окон
+    # не обнулил статистику сразу после миграции.
+    op.execute(
+        "INSERT INTO clickminute (url_id, bucket_start, clicks) "
+        "SELECT url_id, date_trunc('minute', now()), last_hour_clicks "
+        "FROM urlpairstat WHERE last_hour_clicks > 0"
+    )
+    op.execute(
+        "INSERT INTO clickhour (url_id, bucket_start, clicks) "
+        "SELECT url_id, date_trunc('hour', now()), last_day_clicks "
+        "FROM urlpairstat WHERE last_day_clicks > 0"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("clickhour")
+    op.drop_table("clickminute")
@@ -0,0 +1,45 @@
+"""click_events
+
+Revision ID: 97a3ad548863
+Revises: 7e7a276dc8d9
+Create Date: 2026-10-18 11:02:14.518220
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+from partitions import create_day_partitions
+
+revision: str = "97a3ad548863"
+down_revision: Union[str, None] = "7e7a276dc8d9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "clickevent",
+        sa.Column("id", sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column("ts", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("url_id", sa.Integer(), nullable=False),
+        sa.Column("referrer", sa.Text(), nullable=True),
+        sa.Column("user_agent_hash", sa.BigInteger(), nullable=True),
+        sa.Column("ip_prefix", postgresql.CIDR(), nullable=True),
+        sa.PrimaryKeyConstraint("id", "ts"),
+        postgresql_partition_by="RANGE (ts)",
+    )
+    op.create_index("ix_clickevent_url_id_ts", "clickevent", ["url_id", "ts"])
+    op.execute("CREATE TABLE clickevent_default PARTITION OF clickevent DEFAULT")
+    # Журнал может начать писать раньше первого запуска плановой задачи,
+    # поэтому дневные секции создаются сразу.
+    create_day_partitions("clickevent")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("clickevent")
@@ -0,0 +1,38 @@
+"""expires_at_index
+
+Revision ID: 6d236185133d
+Revises: 860c7a1670f2
+Create Date: 2026-10-18 11:34:08.772341
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "6d236185133d"
+down_revision: Union[str, None] = "860c7a1670f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_urlpair_expires_at",
+        "urlpair",
+        ["expires_at"],
+        unique=False,
+        postgresql_where=sa.text("is_activated"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_urlpair_expires_at",
+        table_name="urlpair",
+        postgresql_where=sa.text("is_activated"),
+    )
@@ -0,0 +1,40 @@
+"""keyset_indexes
+
+Revision ID: 8d3d3ff08fb1
+Revises: 600e5ccbaab7
+Create Date: 2026-10-18 10:41:27.604112
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "8d3d3ff08fb1"
+down_revision: Union[str, None] = "600e5ccbaab7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_urlpairstat_last_hour_clicks_url_id",
+        "urlpairstat",
+        [sa.text("last_hour_clicks DESC"), "url_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_urlpairstat_last_day_clicks_url_id",
+        "urlpairstat",
+        [sa.text("last_day_clicks DESC"), "url_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_urlpairstat_last_day_clicks_url_id", table_name="urlpairstat")
+    op.drop_index("ix_urlpairstat_last_hour_clicks_url_id", table_name="urlpairstat")
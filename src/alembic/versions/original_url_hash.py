@@ -0,0 +1,46 @@
+"""original_url_hash
+
+Revision ID: 600e5ccbaab7
+Revises: ae0671961021
+Create Date: 2026-10-18 10:38:02.918347
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "600e5ccbaab7"
+down_revision: Union[str, None] = "ae0671961021"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "urlpair", sa.Column("original_url_hash", sa.BigInteger(), nullable=True)
+    )
+    op.execute(
+        "UPDATE urlpair "
+        "SET original_url_hash = ('x' || substr(md5(original_url), 1, 16))::bit(64)::bigint"
+    )
+    op.create_index(
+        "ix_urlpair_original_url_hash",
+        "urlpair",
+        ["original_url_hash"],
+        unique=False,
+        postgresql_where=sa.text("is_activated"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_urlpair_original_url_hash",
+        table_name="urlpair",
+        postgresql_where=sa.text("is_activated"),
+    )
+    op.drop_column("urlpair", "original_url_hash")
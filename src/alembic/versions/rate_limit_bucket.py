@@ -0,0 +1,41 @@
+"""rate_limit_bucket
+
+Revision ID: ccf2c9108645
+Revises: 65c46cbe1218
+Create Date: 2026-10-18 12:34:08.217593
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "ccf2c9108645"
+down_revision: Union[str, None] = "65c46cbe1218"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "ratelimitbucket",
+        sa.Column("key", sa.String(length=255), nullable=False),
+        sa.Column("tokens", sa.Float(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    op.create_index(
+        op.f("ix_ratelimitbucket_updated_at"),
+        "ratelimitbucket",
+        ["updated_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_ratelimitbucket_updated_at"), table_name="ratelimitbucket")
+    op.drop_table("ratelimitbucket")
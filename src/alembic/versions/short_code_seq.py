@@ -0,0 +1,28 @@
+"""short_code_seq
+
+Revision ID: ae0671961021
+Revises: 3a07827bf1a1
+Create Date: 2026-10-18 10:40:12.514207
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "ae0671961021"
+down_revision: Union[str, None] = "3a07827bf1a1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(sa.schema.CreateSequence(sa.Sequence("short_code_seq")))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(sa.schema.DropSequence(sa.Sequence("short_code_seq")))
@@ -0,0 +1,55 @@
+"""unique_visitors
+
+Revision ID: 860c7a1670f2
+Revises: 97a3ad548863
+Create Date: 2026-10-18 11:20:43.091457
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+from partitions import create_day_partitions
+
+revision: str = "860c7a1670f2"
+down_revision: Union[str, None] = "97a3ad548863"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "urlpairstat",
+        sa.Column("unique_last_hour", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "urlpairstat",
+        sa.Column("unique_last_day", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.create_table(
+        "visitorhour",
+        sa.Column("url_id", sa.Integer(), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("sketch", sa.LargeBinary(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["url_id"], ["urlpair.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("url_id", "bucket_start"),
+        postgresql_partition_by="RANGE (bucket_start)",
+    )
+    op.create_index(
+        op.f("ix_visitorhour_updated_at"), "visitorhour", ["updated_at"], unique=False
+    )
+    op.execute("CREATE TABLE visitorhour_default PARTITION OF visitorhour DEFAULT")
+    # Буфер посетителей может сброситься раньше первого запуска плановой
+    # задачи, поэтому дневные секции создаются сразу.
+    create_day_partitions("visitorhour")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("visitorhour")
+    op.drop_column("urlpairstat", "unique_last_day")
+    op.drop_column("urlpairstat", "unique_last_hour")
@@ -0,0 +1,43 @@
+"""urlpair_created_at
+
+Revision ID: 4f1c2b9e7a53
+Revises: ccf2c9108645
+Create Date: 2026-10-18 16:05:42.118903
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "4f1c2b9e7a53"
+down_revision: Union[str, None] = "ccf2c9108645"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "urlpair",
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        "ix_urlpair_created_at",
+        "urlpair",
+        ["created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_urlpair_created_at", table_name="urlpair")
+    op.drop_column("urlpair", "created_at")
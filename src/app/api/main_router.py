@@ -1,32 +1,59 @@
-from fastapi import APIRouter
+from fastapi import (
+    APIRouter,
+    Depends,
+)
 
 from app.api.v1 import (
     auth_router,
+    health_router,
     redirect_router,
     statistic_router,
     url_router,
 )
+from app.core import settings
+from app.ratelimit import (
+    Limit,
+    api_rate_limit,
+    rate_limit,
+)
+
 
+redirect_limit = Depends(
+    rate_limit(
+        "redirect",
+        Limit(settings.redirect_rate_burst, settings.redirect_rate_per_minute),
+    )
+)
+api_limit = Depends(api_rate_limit)
 
 main_router = APIRouter()
 
 main_router.include_router(
     auth_router,
+    dependencies=[api_limit],
     prefix="/auth/jwt",
     tags=["Auth"],
 )
 main_router.include_router(
     url_router,
+    dependencies=[api_limit],
     prefix="/api/v1",
     tags=["Url aliases"],
 )
 main_router.include_router(
     statistic_router,
+    dependencies=[api_limit],
     prefix="/api/v1",
     tags=["Monitoring"],
 )
+main_router.include_router(
+    health_router,
+    prefix="/health",
+    tags=["Health"],
+)
 main_router.include_router(
     redirect_router,
+    dependencies=[redirect_limit],
     prefix="",
     tags=["Redirect"],
 )
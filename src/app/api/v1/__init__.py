@@ -1,4 +1,5 @@
 from .auth import router as auth_router
+from .health import router as health_router
 from .redirect import router as redirect_router
 from .statistic import router as statistic_router
 from .url import router as url_router
@@ -8,4 +9,5 @@ __all__ = (
     "url_router",
     "statistic_router",
     "redirect_router",
+    "health_router",
 )
@@ -1,6 +1,7 @@
 from fastapi import (
     APIRouter,
     Depends,
+    Request,
 )
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -10,6 +11,7 @@ from app.auth import (
     register_user,
 )
 from app.core import get_async_session
+from app.ratelimit import check_login_rate
 from app.schemas import (
     RegisterRequest,
     TokenResponse,
@@ -59,6 +61,7 @@ async def register(
     ),
 )
 async def login(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     session: AsyncSession = Depends(get_async_session),
 ) -> TokenResponse:
@@ -66,14 +69,23 @@ async def login(
     Авторизует пользователя и выдаёт JWT токен.
 
     Args:
+        request (Request): Входящий запрос; адрес клиента для ограничения частоты.
         form_data (OAuth2PasswordRequestForm): Стандартная схема form-data для OAuth2 (username и password).
         user_repo (UserRepository): Репозиторий доступа к данным пользователей (DI через Depends).
 
     Returns:
         TokenResponse: JWT access-токен, выданный авторизованному пользователю.
 
+    Raises:
+        HTTPException: 429 - Если превышен лимит попыток входа.
+
     """
 
+    await check_login_rate(
+        form_data.username,
+        request.client.host if request.client else None,
+    )
+
     token = await login_user(form_data.username, form_data.password, session)
 
     return TokenResponse(access_token=token, token_type="bearer")
@@ -0,0 +1,83 @@
+import asyncio
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    status,
+)
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.const import READINESS_DB_TIMEOUT
+from app.core import (
+    get_async_session,
+    lifecycle,
+)
+
+
+router = APIRouter()
+
+
+@router.get(
+    "/live",
+    summary="Проверка живости",
+    description="Возвращает 200, пока процесс обслуживает запросы.",
+    name="Живость",
+)
+async def live() -> dict[str, str]:
+    """
+    Сообщает, что процесс жив.
+
+    Returns:
+        dict[str, str]: Статус процесса.
+
+    """
+
+    return {"status": "ok"}
+
+
+@router.get(
+    "/ready",
+    summary="Проверка готовности",
+    description=(
+        "Возвращает 200, если приложение запущено, не останавливается "
+        "и база данных отвечает. С началом остановки возвращает 503, "
+        "чтобы балансировщик перестал направлять трафик на экземпляр."
+    ),
+    name="Готовность",
+)
+async def ready(
+    session: AsyncSession = Depends(get_async_session),
+) -> dict[str, str]:
+    """
+    Сообщает, готов ли экземпляр принимать трафик.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия SQLAlchemy для проверки БД.
+
+    Raises:
+        HTTPException: 503 - Если приложение не запущено, останавливается
+            или база данных недоступна.
+
+    Returns:
+        dict[str, str]: Статус готовности.
+
+    """
+
+    if not lifecycle.ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Приложение не готово",
+        )
+
+    try:
+        await asyncio.wait_for(session.execute(text("SELECT 1")), READINESS_DB_TIMEOUT)
+
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="База данных недоступна",
+        )
+
+    return {"status": "ok"}
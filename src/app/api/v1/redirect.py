@@ -1,12 +1,13 @@
 from fastapi import (
     APIRouter,
     Depends,
+    Request,
     status,
 )
 from fastapi.responses import RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core import get_async_session
+from app.core import get_async_read_session
 from app.services import redirect
 
 router = APIRouter()
@@ -27,13 +28,15 @@ router = APIRouter()
 )
 async def redirect_to_original(
     short_url: str,
-    session: AsyncSession = Depends(get_async_session),
+    request: Request,
+    session: AsyncSession = Depends(get_async_read_session),
 ) -> RedirectResponse:
     """
     Перенаправляет пользователя с короткой ссылки на оригинальный URL.
 
     Args:
         short_url (str): Уникальный код короткой ссылки, например "Y8mMtv".
+        request (Request): Запрос перехода (заголовки и адрес для журнала событий).
         url_repo (URLRepository): Репозиторий URL для получения оригинальной ссылки.
 
     Returns:
@@ -41,9 +44,9 @@ async def redirect_to_original(
 
     """
 
-    url = await redirect(short_url, session)
+    url = await redirect(short_url, session, request)
 
     return RedirectResponse(
-        await url.awaitable_attrs.original_url,
+        url.original_url,
         status_code=status.HTTP_303_SEE_OTHER,
     )
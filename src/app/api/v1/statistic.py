@@ -1,17 +1,36 @@
-from typing import Sequence
+from typing import Literal
 
 from fastapi import (
     APIRouter,
     Depends,
+    HTTPException,
+    Query,
     Request,
+    status,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import get_current_user
-from app.core import get_async_session
+from app.cache import top_links
+from app.const import (
+    MAX_PAGE_SIZE,
+    TOP_LINKS_MAX_K,
+)
+from app.core import get_async_read_session
 from app.dao import URLRepository
 from app.models import User
-from app.schemas import URLResponse
+from app.schemas import (
+    ShortCodeFilterResponse,
+    TopLinkResponse,
+    URLPage,
+    URLResponse,
+)
+from app.services import (
+    cursor_sort,
+    decode_cursor,
+    encode_cursor,
+)
+from app.tasks import short_codes
 
 
 router = APIRouter()
@@ -19,42 +38,58 @@ router = APIRouter()
 
 @router.get(
     "/all_crated_links",
-    response_model=list[URLResponse],
+    response_model=URLPage,
     summary="Получить все созданные ссылки",
     description=(
         "Возвращает список всех URL-пар, которые были созданы сервисом. "
-        "Поддерживается опциональная фильтрация по статусу активности и пагинация."
+        "Поддерживается опциональная фильтрация по статусу активности и пагинация. "
+        "Для перехода к следующей странице передайте `cursor` из поля `next_cursor` "
+        "с той же сортировкой; `offset` вместе с курсором не допускается."
     ),
     name="Получить статистику"
 )
 async def all_crated_links(
     request: Request,
-    limit: int = 10,
-    offset: int = 0,
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    cursor: str | None = None,
     is_activated: bool | None = None,
     sort_by_hour_clicks: bool = False,
     sort_by_day_clicks: bool = False,
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_async_read_session),
     user: User = Depends(get_current_user),
-) -> Sequence[URLResponse]:
+) -> URLPage:
     """
     Возвращает список всех созданных коротких ссылок, привязанных к текущему пользователю.
 
     Args:
         request (Request): Объект запроса для получения базового URL (используется при формировании полного короткого URL).
         limit (int): Количество элементов на странице (по умолчанию 10).
-        offset (int): Смещение от начала списка (по умолчанию 0).
+        offset (int): Смещение от начала списка (по умолчанию 0); не используется вместе с курсором.
+        cursor (str | None): Курсор следующей страницы из предыдущего ответа.
         is_activated (bool | None): Фильтрация по статусу активности. Если None — фильтрация не применяется.
         sort_by_hour_clicks (bool): Сортировать по числу кликов за последний час (по убыванию), если True.
         sort_by_day_clicks (bool): Сортировать по числу кликов за последние сутки (по убыванию), если True.
         session (AsyncSession): Асинхронная сессия SQLAlchemy для доступа к базе данных.
         user (User): Текущий авторизованный пользователь.
 
+    Raises:
+        HTTPException: 400 - Если курсор повреждён, выдан для другой сортировки
+            или передан вместе с offset.
+
     Returns:
-        Sequence[URLResponse]: Список сокращённых ссылок с актуальной статистикой и статусами.
+        URLPage: Страница сокращённых ссылок с актуальной статистикой и статусами.
 
     """
-    
+
+    if cursor and offset:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Параметры cursor и offset несовместимы",
+        )
+
+    sort = cursor_sort(sort_by_hour_clicks, sort_by_day_clicks)
+
     ret = await URLRepository.get_all(
         session=session,
         is_activated=is_activated,
@@ -62,11 +97,98 @@ async def all_crated_links(
         offset=offset,
         sort_by_hour_clicks=sort_by_hour_clicks,
         sort_by_day_clicks=sort_by_day_clicks,
+        cursor=decode_cursor(cursor, sort) if cursor else None,
     )
 
+    next_cursor = None
+
+    if len(ret) == limit:
+        last = ret[-1]
+
+        sort_keys = {
+            "hour": last.last_hour_clicks,
+            "day": last.last_day_clicks,
+            "id": last.id,
+        }
+        next_cursor = encode_cursor(sort, sort_keys[sort], last.id)
+
+    return URLPage(
+        items=[
+            URLResponse.model_validate(item).model_copy(
+                update={"short_url": f"{request.base_url}{item.short_url}"}
+            )
+            for item in ret
+        ],
+        next_cursor=next_cursor,
+    )
+
+
+@router.get(
+    "/top",
+    response_model=list[TopLinkResponse],
+    summary="Самые популярные ссылки",
+    description=(
+        "Возвращает `k` ссылок с наибольшим числом переходов за последний час "
+        "или сутки. Рейтинг считается в памяти процесса приближённо (Space-Saving) "
+        "и не обращается к базе данных: `clicks` — оценка сверху, "
+        "`error` — её максимальная погрешность."
+    ),
+    name="Популярные ссылки",
+)
+async def top(
+    request: Request,
+    window: Literal["hour", "day"] = "hour",
+    k: int = Query(10, ge=1, le=TOP_LINKS_MAX_K),
+    user: User = Depends(get_current_user),
+) -> list[TopLinkResponse]:
+    """
+    Возвращает самые популярные короткие ссылки за окно.
+
+    Args:
+        request (Request): Объект запроса для получения базового URL.
+        window (Literal["hour", "day"]): Окно рейтинга.
+        k (int): Количество ссылок (по умолчанию 10).
+        user (User): Текущий авторизованный пользователь.
+
+    Returns:
+        list[TopLinkResponse]: Ссылки по убыванию числа переходов.
+
+    """
+
     return [
-        URLResponse.model_validate(item).model_copy(
-            update={"short_url": f"{request.base_url}{item.short_url}"}
+        TopLinkResponse(
+            short_url=f"{request.base_url}{short_url}",
+            clicks=clicks,
+            error=error,
         )
-        for item in ret
+        for short_url, clicks, error in top_links[window].top(k)
     ]
+
+
+@router.get(
+    "/short_code_filter",
+    response_model=ShortCodeFilterResponse,
+    summary="Метрики фильтра коротких ссылок",
+    description=(
+        "Возвращает размер фильтра Блума существующих коротких ссылок, оценку "
+        "количества кодов и доли ложных срабатываний, а также счётчики запросов, "
+        "отвеченных 404 без обращения к базе данных. Метрики относятся к "
+        "текущему процессу."
+    ),
+    name="Метрики фильтра коротких ссылок",
+)
+async def short_code_filter(
+    user: User = Depends(get_current_user),
+) -> ShortCodeFilterResponse:
+    """
+    Возвращает метрики отрицательного кэша коротких ссылок.
+
+    Args:
+        user (User): Текущий авторизованный пользователь.
+
+    Returns:
+        ShortCodeFilterResponse: Метрики фильтра и кэша недавних 404.
+
+    """
+
+    return ShortCodeFilterResponse(**short_codes.stats()._asdict())
@@ -1,25 +1,32 @@
 from fastapi import (
     APIRouter,
+    Body,
     Depends,
     Query,
     Request,
     status,
 )
 from fastapi.responses import Response
-from pydantic import HttpUrl
+from pydantic import (
+    HttpUrl,
+    ValidationError,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import get_current_user
+from app.const import MAX_BATCH_URLS
 from app.core import get_async_session
 from app.models import User
 from app.schemas import (
+    URLBatchItem,
+    URLBatchResult,
     URLRequest,
     URLResponse,
 )
 from app.services import (
     add_pair,
+    add_pairs,
     deactivate_url,
-    gen_short_path,
 )
 
 
@@ -55,12 +62,7 @@ async def cut_url(
 
     """
 
-    short_path = await gen_short_path(session)
-
-    if not short_path:
-        raise ValueError("Отсутствует short_url")
-
-    urlpair = await add_pair(url.url, short_path, session)
+    urlpair = await add_pair(url.url, session)
 
     response = URLResponse.model_validate(urlpair).model_copy(
         update={"short_url": f"{request.base_url}{urlpair.short_url}"}
@@ -69,6 +71,56 @@ async def cut_url(
     return response
 
 
+@router.post(
+    "/cut_url/batch",
+    response_model=list[URLBatchResult],
+    name="Cut urls batch",
+    summary="Пакетное создание коротких ссылок",
+    description=(
+        "Генерирует короткие ссылки для списка URL в одной транзакции. "
+        "Результаты возвращаются в порядке запроса; для невалидных URL "
+        "вместо ссылки возвращается описание ошибки."
+    ),
+)
+async def cut_url_batch(
+    request: Request,
+    urls: list[URLBatchItem] = Body(..., max_length=MAX_BATCH_URLS),
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session),
+) -> list[URLBatchResult]:
+    """
+    Создаёт короткие ссылки для пачки URL.
+
+    Args:
+        urls (list[URLBatchItem]): Исходные ссылки.
+        user (User): Текущий авторизованный пользователь (получен из токена).
+
+    Returns:
+        list[URLBatchResult]: Результат для каждой ссылки в порядке запроса.
+
+    """
+
+    results = [URLBatchResult(index=index) for index in range(len(urls))]
+    valid: list[tuple[int, HttpUrl]] = []
+
+    for index, item in enumerate(urls):
+        try:
+            valid.append((index, URLRequest.model_validate({"url": item.url}).url))
+
+        except ValidationError as exc:
+            results[index].error = exc.errors()[0]["msg"]
+
+    if valid:
+        urlpairs = await add_pairs([url for _, url in valid], session)
+
+        for (index, _), urlpair in zip(valid, urlpairs):
+            results[index].result = URLResponse.model_validate(urlpair).model_copy(
+                update={"short_url": f"{request.base_url}{urlpair.short_url}"}
+            )
+
+    return results
+
+
 @router.patch(
     "/deactivate/",
     name="Деактивировать ссылку",
@@ -5,7 +5,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.security import (
     create_access_token,
-    verify_password,
+    hash_password_async,
+    verify_password_async,
 )
 from app.dao import UserRepository
 
@@ -26,6 +27,7 @@ async def login_user(
         HTTPException: 
             - 404, если пользователь с указанным email не найден.
             - 401, если пароль неверен.
+            - 429, если пул проверки паролей перегружен.
 
     Returns:
         str: JWT-токен доступа, содержащий email пользователя в поле "sub".
@@ -49,7 +51,7 @@ async def login_user(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Пользователь не найден")
 
-    if not verify_password(password, user.password):
+    if not await verify_password_async(password, user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Неверный пароль"
@@ -74,6 +76,7 @@ async def register_user(
         user_repo (UserRepository): Репозиторий пользователей для доступа к данным.
 
     Raises:
+        HTTPException: 429 - Пул хэширования паролей перегружен.
         HTTPException: 500 - Внутренняя ошибка при сохранении пользователя.
 
     Returns:
@@ -82,9 +85,11 @@ async def register_user(
     """
 
     logger.info("Начинаем регистрацию пользователя")
+
+    hashed_password = await hash_password_async(password)
     
     try:
-        new_user = await UserRepository.add_new_user(email, password, session)
+        new_user = await UserRepository.add_new_user(email, hashed_password, session)
 
     except Exception:
         logger.critical("Ошибка регистрации")
@@ -4,16 +4,12 @@ from fastapi import (
 )
 from fastapi.exceptions import HTTPException
 from fastapi.security import OAuth2PasswordBearer
-from jose import (
-    JWTError,
-    jwt,
-)
+from jose import JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core import (
-    get_async_session,
-    settings,
-)
+from app.auth.security import decode_token_subject
+from app.cache import user_cache
+from app.core import get_async_session
 from app.dao import UserRepository
 from app.models import User
 
@@ -28,6 +24,12 @@ async def get_current_user(
     """
     Извлекает текущего аутентифицированного пользователя из JWT-токена.
 
+    Проверенные токены кэшируются по SHA-256 не дольше их `exp`, а
+    пользователи — на `user_cache_ttl` секунд, поэтому повторный запрос
+    с тем же токеном не проверяет подпись и не обращается к БД. Записи
+    пользователей не инвалидируются: изменения пользователя в БД видны
+    после истечения TTL.
+
     Args:
         token (str): JWT-токен, полученный из заголовка Authorization.
         user_repo (UserRepository): Репозиторий пользователей для поиска пользователя.
@@ -42,14 +44,7 @@ async def get_current_user(
     """
 
     try:
-        payload = jwt.decode(token, settings.hash_secret_key, algorithms=[settings.algorithm])
-        email = payload.get("sub")
-
-        if email is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Невалидный токен",
-            )
+        email = decode_token_subject(token)
 
     except JWTError:
         raise HTTPException(
@@ -57,12 +52,26 @@ async def get_current_user(
             detail="Ошибка декодирования токена",
         )
 
-    user = await UserRepository.get_by_email(email, session)
-
-    if user is None:
+    if email is None:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Пользователь не найден",
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Невалидный токен",
         )
 
+    user = user_cache.get(email)
+
+    if user is None:
+        user = await UserRepository.get_by_email(email, session)
+
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Пользователь не найден",
+            )
+
+        # Отвязываем объект от сессии: он переживёт её закрытие и не
+        # протухнет при commit в обработчике запроса.
+        session.expunge(user)
+        user_cache.set(email, user)
+
     return user
@@ -1,8 +1,20 @@
-from .password import create_access_token, hash_password, verify_password
+from .password import (
+    create_access_token,
+    hash_password,
+    hash_password_async,
+    shutdown_password_executor,
+    verify_password,
+    verify_password_async,
+)
+from .token import decode_token_subject
 
 
 __all__ = (
     "create_access_token",
     "hash_password",
+    "hash_password_async",
     "verify_password",
+    "verify_password_async",
+    "shutdown_password_executor",
+    "decode_token_subject",
 )
@@ -1,12 +1,38 @@
+import asyncio
 import datetime as dt
-
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Callable,
+    TypeVar,
+)
+
+from fastapi import (
+    HTTPException,
+    status,
+)
 from jose import jwt
 from passlib.context import CryptContext
 
 from app.core import settings
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+T = TypeVar("T")
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.bcrypt_rounds,
+)
+
+# bcrypt отпускает GIL на время вычисления хэша, поэтому потоков достаточно,
+# чтобы event loop не блокировался на 100-300 мс на каждый пароль.
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.password_hash_workers,
+    thread_name_prefix="password",
+)
+_pending = 0
+_pending_lock = threading.Lock()
 
 
 def hash_password(password: str) -> str:
@@ -41,6 +67,99 @@ def verify_password(
 
     return pwd_context.verify(plain_password, hashed_password)
 
+
+def _release(*_: object) -> None:
+    global _pending
+
+    with _pending_lock:
+        _pending -= 1
+
+
+async def _run_in_pool(func: Callable[..., T], *args: str) -> T:
+    """
+    Выполняет функцию в пуле хэширования паролей с ограничением очереди.
+
+    Args:
+        func (Callable): Синхронная функция хэширования или проверки.
+        *args (str): Аргументы функции.
+
+    Raises:
+        HTTPException: 429 - Если пул и его очередь заполнены.
+
+    Returns:
+        T: Результат функции.
+
+    """
+
+    global _pending
+
+    with _pending_lock:
+        if _pending >= settings.password_hash_queue_size:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Слишком много запросов, повторите позже",
+                headers={"Retry-After": "1"},
+            )
+
+        _pending += 1
+
+    try:
+        future = password_executor.submit(func, *args)
+
+    except RuntimeError:
+        _release()
+        raise
+
+    # Место в очереди освобождается, когда задача действительно завершилась
+    # в пуле: отмена ожидающего запроса не останавливает уже начатый хэш.
+    future.add_done_callback(_release)
+
+    return await asyncio.wrap_future(future)
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Хэширует пароль в пуле потоков, не блокируя event loop.
+
+    Args:
+        password (str): Пароль в открытом виде.
+
+    Raises:
+        HTTPException: 429 - Если пул хэширования перегружен.
+
+    Returns:
+        str: Захэшированная версия пароля.
+
+    """
+
+    return await _run_in_pool(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Проверяет пароль в пуле потоков, не блокируя event loop.
+
+    Args:
+        plain_password (str): Пароль в открытом виде, введённый пользователем.
+        hashed_password (str): Захэшированный пароль из базы данных.
+
+    Raises:
+        HTTPException: 429 - Если пул хэширования перегружен.
+
+    Returns:
+        bool: True, если пароли совпадают, иначе False.
+
+    """
+
+    return await _run_in_pool(verify_password, plain_password, hashed_password)
+
+
+async def shutdown_password_executor() -> None:
+    """Останавливает пул хэширования, дождавшись начатых операций."""
+
+    await asyncio.to_thread(password_executor.shutdown, wait=True, cancel_futures=True)
+
+
 def create_access_token(
     data: dict,
     expires_delta: dt.timedelta | None = None
@@ -0,0 +1,40 @@
+from jose import jwt
+
+from app.cache import (
+    cache_token,
+    token_cache,
+    token_key,
+)
+from app.core import settings
+
+
+def decode_token_subject(token: str) -> str | None:
+    """
+    Возвращает email из JWT-токена доступа.
+
+    Проверенные токены кэшируются по SHA-256 не дольше их `exp`, поэтому
+    повторный запрос с тем же токеном не проверяет подпись.
+
+    Args:
+        token (str): JWT-токен.
+
+    Raises:
+        JWTError: Если подпись или срок действия токена недействительны.
+
+    Returns:
+        str | None: Email из поля "sub"; None, если поля нет.
+
+    """
+
+    email = token_cache.get(token_key(token))
+
+    if email is not None:
+        return email
+
+    payload = jwt.decode(token, settings.hash_secret_key, algorithms=[settings.algorithm])
+    email = payload.get("sub")
+
+    if email is not None and "exp" in payload:
+        cache_token(token, email, payload["exp"])
+
+    return email
@@ -0,0 +1,43 @@
+from .auth import (
+    cache_token,
+    token_cache,
+    token_key,
+    user_cache,
+)
+from .bloom import BloomFilter
+from .hll import (
+    HyperLogLog,
+    fingerprint_hash,
+)
+from .lru import TTLCache
+from .redirect import (
+    RedirectEntry,
+    cache_redirect,
+    invalidate_redirect,
+    redirect_cache,
+)
+from .topk import (
+    SlidingTopK,
+    SpaceSaving,
+    record_hit,
+    top_links,
+)
+
+__all__ = (
+    "TTLCache",
+    "RedirectEntry",
+    "redirect_cache",
+    "cache_redirect",
+    "invalidate_redirect",
+    "SpaceSaving",
+    "SlidingTopK",
+    "top_links",
+    "record_hit",
+    "HyperLogLog",
+    "fingerprint_hash",
+    "token_cache",
+    "user_cache",
+    "token_key",
+    "cache_token",
+    "BloomFilter",
+)
@@ -0,0 +1,49 @@
+import hashlib
+import time
+
+from app.cache.lru import TTLCache
+from app.core import settings
+from app.models import User
+
+
+token_cache: TTLCache[bytes, str] = TTLCache(
+    maxsize=settings.token_cache_size,
+    ttl=settings.token_cache_ttl,
+)
+
+# Пользователи не изменяются и не удаляются через API, поэтому записи
+# не инвалидируются и устаревают только по TTL; кэш у каждого процесса свой.
+user_cache: TTLCache[str, User] = TTLCache(
+    maxsize=settings.user_cache_size,
+    ttl=settings.user_cache_ttl,
+)
+
+
+def token_key(token: str) -> bytes:
+    """
+    Возвращает ключ кэша для токена, чтобы не хранить сами токены в памяти.
+
+    Args:
+        token (str): JWT-токен.
+
+    Returns:
+        bytes: SHA-256 токена.
+
+    """
+
+    return hashlib.sha256(token.encode()).digest()
+
+
+def cache_token(token: str, subject: str, exp: float) -> None:
+    """
+    Кладёт проверенный токен в кэш не дольше срока его действия.
+
+    Args:
+        token (str): Проверенный JWT-токен.
+        subject (str): Email пользователя из поля "sub".
+        exp (float): Момент истечения токена (UNIX-время).
+
+    """
+
+    token_cache.set(token_key(token), subject, ttl=exp - time.time())
+
@@ -0,0 +1,94 @@
+import hashlib
+import math
+
+
+class BloomFilter:
+    """
+    Фильтр Блума: проверка принадлежности множеству без ложных отрицаний.
+
+    Размер битового массива и количество хэш-функций подбираются по
+    ожидаемому количеству элементов и допустимой доле ложных
+    срабатываний. Позиции битов получаются двойным хэшированием из
+    одного дайджеста blake2b, поэтому проверка стоит один хэш и `k`
+    обращений к массиву.
+
+    Attributes:
+        capacity (int): Ожидаемое количество элементов.
+        error_rate (float): Доля ложных срабатываний при `capacity` элементах.
+        size (int): Размер битового массива в битах.
+        hash_count (int): Количество хэш-функций.
+        bits_set (int): Количество установленных битов.
+
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+        self.size = max(
+            math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2),
+            8,
+        )
+        self.hash_count = max(round(self.size / self.capacity * math.log(2)), 1)
+        self.bits_set = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> list[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item: str) -> None:
+        """
+        Добавляет элемент в фильтр.
+
+        Args:
+            item (str): Элемент.
+
+        """
+
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+
+            if not self._bits[position >> 3] & mask:
+                self._bits[position >> 3] |= mask
+                self.bits_set += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    def estimated_count(self) -> int:
+        """
+        Оценивает количество различных добавленных элементов.
+
+        Returns:
+            int: Оценка по доле установленных битов.
+
+        """
+
+        if self.bits_set >= self.size:
+            return self.capacity
+
+        return round(-self.size / self.hash_count * math.log(1 - self.bits_set / self.size))
+
+    def false_positive_rate(self) -> float:
+        """
+        Оценивает текущую долю ложных срабатываний.
+
+        Returns:
+            float: Вероятность того, что отсутствующий элемент будет
+                принят за присутствующий.
+
+        """
+
+        return (self.bits_set / self.size) ** self.hash_count
+
+    @property
+    def size_bytes(self) -> int:
+        """Память под битовый массив в байтах."""
+
+        return len(self._bits)
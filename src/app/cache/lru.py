@@ -0,0 +1,108 @@
+import time
+from collections import OrderedDict
+from typing import (
+    Generic,
+    Hashable,
+    TypeVar,
+)
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Ограниченный по размеру in-process кэш с LRU-вытеснением и TTL.
+
+    Кэш не потокобезопасен и рассчитан на использование внутри одного
+    event loop'а, где все операции выполняются без переключения контекста.
+
+    Attributes:
+        maxsize (int): Максимальное количество записей в кэше.
+        ttl (float): Время жизни записи по умолчанию в секундах.
+
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[K, tuple[V, float]] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        """
+        Возвращает значение по ключу и помечает запись как недавно использованную.
+
+        Args:
+            key (K): Ключ записи.
+
+        Returns:
+            V | None: Значение или None, если записи нет или её TTL истёк.
+
+        """
+
+        item = self._data.get(key)
+
+        if item is None:
+            return None
+
+        value, expires = item
+
+        if expires <= time.monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+
+        return value
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        """
+        Сохраняет значение в кэше, вытесняя самые давние записи при переполнении.
+
+        Args:
+            key (K): Ключ записи.
+            value (V): Сохраняемое значение.
+            ttl (float | None): Время жизни записи в секундах. Если None,
+                используется TTL кэша. Неположительный TTL запись не сохраняет.
+
+        """
+
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+
+        if ttl <= 0 or self.maxsize <= 0:
+            self._data.pop(key, None)
+            return
+
+        self._data[key] = (value, time.monotonic() + ttl)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K) -> V | None:
+        """
+        Удаляет запись из кэша.
+
+        Args:
+            key (K): Ключ записи.
+
+        Returns:
+            V | None: Удалённое значение или None, если записи не было.
+
+        """
+
+        item = self._data.pop(key, None)
+
+        return None if item is None else item[0]
+
+    def clear(self) -> None:
+        """Полностью очищает кэш."""
+
+        self._data.clear()
+
+    def __contains__(self, key: object) -> bool:
+        return self.get(key) is not None  # type: ignore[arg-type]
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,59 @@
+import datetime as dt
+from typing import NamedTuple
+
+from app.cache.lru import TTLCache
+from app.core import settings
+
+
+class RedirectEntry(NamedTuple):
+    """
+    Данные короткой ссылки, достаточные для выполнения редиректа.
+
+    Attributes:
+        id (int): Идентификатор пары URLPair.
+        original_url (str): Оригинальный URL.
+        is_activated (bool): Флаг активности ссылки.
+        is_old (bool): Флаг устаревшей ссылки.
+        expires_at (datetime): Момент истечения срока действия ссылки.
+
+    """
+
+    id: int
+    original_url: str
+    is_activated: bool
+    is_old: bool
+    expires_at: dt.datetime
+
+
+redirect_cache: TTLCache[str, RedirectEntry] = TTLCache(
+    maxsize=settings.redirect_cache_size,
+    ttl=settings.redirect_cache_ttl,
+)
+
+
+def cache_redirect(short_url: str, entry: RedirectEntry) -> None:
+    """
+    Кладёт ссылку в кэш редиректов, ограничивая TTL сроком действия ссылки.
+
+    Args:
+        short_url (str): Короткий код ссылки.
+        entry (RedirectEntry): Данные для редиректа.
+
+    """
+
+    ttl = (entry.expires_at - dt.datetime.now(dt.timezone.utc)).total_seconds()
+
+    redirect_cache.set(short_url, entry, ttl=ttl)
+
+
+def invalidate_redirect(*short_urls: str) -> None:
+    """
+    Удаляет ссылки из кэша редиректов.
+
+    Args:
+        *short_urls (str): Короткие коды ссылок.
+
+    """
+
+    for short_url in short_urls:
+        redirect_cache.pop(short_url)
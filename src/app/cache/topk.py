@@ -0,0 +1,219 @@
+import time
+from collections import Counter
+from typing import (
+    Generic,
+    Hashable,
+    TypeVar,
+)
+
+from app.const import (
+    TOP_LINKS_DAY_SLOTS,
+    TOP_LINKS_HOUR_SLOTS,
+    TOP_LINKS_QUERY_TTL,
+)
+from app.core import settings
+
+
+K = TypeVar("K", bound=Hashable)
+
+
+class SpaceSaving(Generic[K]):
+    """
+    Алгоритм Space-Saving: приближённые частоты самых частых ключей.
+
+    Хранит не больше `capacity` счётчиков. Новый ключ при заполнении
+    вытесняет ключ с минимальным счётчиком и наследует его значение как
+    ошибку. Счётчики сгруппированы по значению, поэтому и учёт, и
+    вытеснение выполняются за O(1).
+
+    Attributes:
+        capacity (int): Максимальное количество отслеживаемых ключей.
+
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self._counts: dict[K, int] = {}
+        self._errors: dict[K, int] = {}
+        self._buckets: dict[int, dict[K, None]] = {}
+        self._min = 0
+
+    def _move(self, key: K, old: int, new: int) -> None:
+        bucket = self._buckets[old]
+        del bucket[key]
+
+        if not bucket:
+            del self._buckets[old]
+
+            if self._min == old:
+                self._min = new
+
+        self._buckets.setdefault(new, {})[key] = None
+        self._counts[key] = new
+
+    def add(self, key: K) -> None:
+        """
+        Учитывает одно появление ключа.
+
+        Args:
+            key (K): Ключ.
+
+        """
+
+        count = self._counts.get(key)
+
+        if count is not None:
+            self._move(key, count, count + 1)
+            return
+
+        if self.capacity <= 0:
+            return
+
+        if len(self._counts) < self.capacity:
+            self._counts[key] = 1
+            self._errors[key] = 0
+            self._buckets.setdefault(1, {})[key] = None
+            self._min = 1
+            return
+
+        victim = next(iter(self._buckets[self._min]))
+        count = self._counts.pop(victim)
+        del self._errors[victim]
+
+        self._counts[key] = count
+        self._errors[key] = count
+        self._buckets[count][key] = None
+        del self._buckets[count][victim]
+        self._move(key, count, count + 1)
+
+    def items(self) -> list[tuple[K, int, int]]:
+        """
+        Возвращает отслеживаемые ключи.
+
+        Returns:
+            list[tuple[K, int, int]]: Ключ, оценка частоты сверху и её
+                максимальная ошибка.
+
+        """
+
+        return [(key, count, self._errors[key]) for key, count in self._counts.items()]
+
+    def clear(self) -> None:
+        """Сбрасывает все счётчики."""
+
+        self._counts.clear()
+        self._errors.clear()
+        self._buckets.clear()
+        self._min = 0
+
+
+class SlidingTopK(Generic[K]):
+    """
+    Самые частые ключи за скользящее окно.
+
+    Окно разбито на кольцо подокон, в каждом свой Space-Saving, поэтому
+    память фиксирована: `slots * capacity` счётчиков независимо от
+    количества ключей. Устаревшее подокно очищается при переходе кольца.
+    Слитый по подокнам рейтинг кэшируется на `query_ttl` секунд.
+
+    Attributes:
+        window (float): Длина окна в секундах.
+        slots (int): Количество подокон.
+        capacity (int): Ёмкость Space-Saving одного подокна.
+
+    """
+
+    def __init__(
+        self,
+        window: float,
+        slots: int,
+        capacity: int,
+        query_ttl: float = TOP_LINKS_QUERY_TTL,
+    ) -> None:
+        self.window = window
+        self.slots = slots
+        self.capacity = capacity
+        self.query_ttl = query_ttl
+        self._slot_len = window / slots
+        self._ring: list[SpaceSaving[K]] = [SpaceSaving(capacity) for _ in range(slots)]
+        self._epoch = self._current_epoch()
+        self._ranking: list[tuple[K, int, int]] = []
+        self._ranked_at = float("-inf")
+
+    def _current_epoch(self) -> int:
+        return int(time.monotonic() // self._slot_len)
+
+    def _rotate(self) -> None:
+        epoch = self._current_epoch()
+
+        for stale in range(self._epoch + 1, min(epoch, self._epoch + self.slots) + 1):
+            self._ring[stale % self.slots].clear()
+
+        self._epoch = epoch
+
+    def add(self, key: K) -> None:
+        """
+        Учитывает одно появление ключа в текущем подокне.
+
+        Args:
+            key (K): Ключ.
+
+        """
+
+        if self._current_epoch() != self._epoch:
+            self._rotate()
+
+        self._ring[self._epoch % self.slots].add(key)
+
+    def top(self, k: int) -> list[tuple[K, int, int]]:
+        """
+        Возвращает `k` самых частых ключей за окно.
+
+        Args:
+            k (int): Количество ключей.
+
+        Returns:
+            list[tuple[K, int, int]]: Ключ, оценка частоты сверху и её
+                максимальная ошибка, по убыванию оценки.
+
+        """
+
+        now = time.monotonic()
+
+        if now - self._ranked_at >= self.query_ttl:
+            self._rotate()
+
+            counts: Counter[K] = Counter()
+            errors: Counter[K] = Counter()
+
+            for summary in self._ring:
+                for key, count, error in summary.items():
+                    counts[key] += count
+                    errors[key] += error
+
+            self._ranking = [
+                (key, count, errors[key])
+                for key, count in counts.most_common(self.capacity)
+            ]
+            self._ranked_at = now
+
+        return self._ranking[:k]
+
+
+top_links: dict[str, SlidingTopK[str]] = {
+    "hour": SlidingTopK(3600, TOP_LINKS_HOUR_SLOTS, settings.top_links_capacity),
+    "day": SlidingTopK(86400, TOP_LINKS_DAY_SLOTS, settings.top_links_capacity),
+}
+
+
+def record_hit(short_url: str) -> None:
+    """
+    Учитывает переход по ссылке во всех окнах рейтинга.
+
+    Args:
+        short_url (str): Короткий код ссылки.
+
+    """
+
+    for tracker in top_links.values():
+        tracker.add(short_url)
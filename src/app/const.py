@@ -1,16 +1,105 @@
 import re
+import string
 from typing import Pattern
 
 
 EXIT_CODE_FOR_SETTINGS: int = 1
 
 SHORT_LINK_LEN: int = 6
+SHORT_LINK_ALPHABET: str = string.ascii_letters + string.digits
+SHORT_CODE_BLOCK_SIZE: int = 1000
+SHORT_CODE_FEISTEL_ROUNDS: int = 4
 MIN_PASSWORD_LENGTH: int = 8
 MAX_TRY_TO_GEN_SHORT_URL: int = 1000
+MAX_BATCH_URLS: int = 50_000
+MAX_PAGE_SIZE: int = 1000
+URL_INSERT_CHUNK_SIZE: int = 5_000
 
 EMAIL_REGEX: Pattern[str] = re.compile(
     r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$"
 )
 
 DAILY_JOB: int = 24
-HOURLY_JOB: int = 1
\ No newline at end of file
+EXPIRE_CHUNK_SIZE: int = 5_000
+HOURLY_JOB: int = 1
+JOB_LEASE_FACTOR: float = 1.5
+JOB_LEASE_MAX_MINUTES: int = 10
+JOB_POLL_SECONDS: int = 60
+CLICK_STATS_REFRESH_MINUTES: int = 1
+
+REDIRECT_CACHE_SIZE: int = 10_000
+REDIRECT_CACHE_TTL: int = 300
+REDIRECT_CACHE_PREWARM_MINUTES: int = 5
+REDIRECT_CACHE_PREWARM_SIZE: int = 500
+REDIRECT_INVALIDATE_CHANNEL: str = "redirect_invalidate"
+REDIRECT_INVALIDATE_RETRY: float = 5.0
+TOKEN_CACHE_SIZE: int = 10_000
+TOKEN_CACHE_TTL: int = 300
+USER_CACHE_SIZE: int = 10_000
+USER_CACHE_TTL: int = 60
+
+TOP_LINKS_CAPACITY: int = 1_000
+TOP_LINKS_HOUR_SLOTS: int = 12
+TOP_LINKS_DAY_SLOTS: int = 24
+TOP_LINKS_QUERY_TTL: float = 1.0
+TOP_LINKS_MAX_K: int = 100
+
+CLICK_FLUSH_INTERVAL: float = 5.0
+CLICK_BUFFER_MAX_SIZE: int = 10_000
+CLICK_FLUSH_CHUNK_SIZE: int = 5_000
+CLICK_STATS_ACTIVE_HOURS: int = 48
+CLICK_PARTITIONS_AHEAD_DAYS: int = 2
+CLICK_MINUTE_RETENTION_DAYS: int = 1
+CLICK_HOUR_RETENTION_DAYS: int = 3
+CLICK_EVENTS_QUEUE_SIZE: int = 100_000
+CLICK_EVENTS_BATCH_SIZE: int = 10_000
+CLICK_EVENTS_FLUSH_INTERVAL: float = 1.0
+CLICK_EVENTS_RETENTION_DAYS: int = 30
+CLICK_EVENTS_IPV4_PREFIX: int = 24
+CLICK_EVENTS_IPV6_PREFIX: int = 48
+CLICK_EVENTS_REFERRER_MAX_LEN: int = 2048
+
+HLL_PRECISION: int = 10
+UNIQUE_STATS_REFRESH_MINUTES: int = 5
+UNIQUE_STATS_CHUNK_SIZE: int = 1_000
+VISITOR_SKETCH_RETENTION_DAYS: int = 2
+VISITOR_BUFFER_MAX_SIZE: int = 10_000
+
+SHUTDOWN_TIMEOUT: float = 30.0
+SHUTDOWN_DRAIN_DELAY: float = 0.0
+SHUTDOWN_HOOK_MIN_TIMEOUT: float = 1.0
+READINESS_DB_TIMEOUT: float = 2.0
+
+DB_POOL_SIZE: int = 10
+DB_MAX_OVERFLOW: int = 10
+DB_POOL_TIMEOUT: float = 30.0
+DB_POOL_RECYCLE: int = 3600
+DB_STATEMENT_CACHE_SIZE: int = 100
+
+BCRYPT_ROUNDS: int = 12
+PASSWORD_HASH_WORKERS: int = 2
+PASSWORD_HASH_QUEUE_SIZE: int = 32
+
+RATE_LIMIT_TABLE_SIZE: int = 100_000
+RATE_LIMIT_KEY_MAX_LEN: int = 255
+RATE_LIMIT_IDLE_HOURS: int = 1
+LOGIN_EMAIL_BURST: int = 5
+LOGIN_EMAIL_PER_MINUTE: float = 5.0
+LOGIN_IP_BURST: int = 20
+LOGIN_IP_PER_MINUTE: float = 30.0
+API_RATE_BURST: int = 20
+API_RATE_PER_MINUTE: float = 60.0
+API_USER_RATE_BURST: int = 50
+API_USER_RATE_PER_MINUTE: float = 300.0
+CUT_URL_BATCH_RATE_COST: float = 10.0
+REDIRECT_RATE_BURST: int = 100
+REDIRECT_RATE_PER_MINUTE: float = 600.0
+
+SHORT_CODE_FILTER_CAPACITY: int = 1_000_000
+SHORT_CODE_FILTER_ERROR_RATE: float = 0.01
+SHORT_CODE_FILTER_GROWTH: int = 2
+SHORT_CODE_LOAD_CHUNK_SIZE: int = 50_000
+SHORT_CODE_SYNC_INTERVAL: float = 1.0
+SHORT_CODE_SYNC_OVERLAP: float = 60.0
+MISSING_CACHE_SIZE: int = 10_000
+MISSING_CACHE_TTL: int = 60
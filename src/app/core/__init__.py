@@ -1,10 +1,24 @@
-from .db import AsyncSessionLocal, Base, get_async_session
+from .db import (
+    AsyncReadSessionLocal,
+    AsyncSessionLocal,
+    Base,
+    engine,
+    get_async_read_session,
+    get_async_session,
+    read_engine,
+)
+from .lifecycle import lifecycle
 from .settings import settings
 
 
 __all__ = (
     "Base",
     "get_async_session",
+    "get_async_read_session",
     "settings",
     "AsyncSessionLocal",
+    "AsyncReadSessionLocal",
+    "engine",
+    "read_engine",
+    "lifecycle",
 )
@@ -1,6 +1,7 @@
-from typing import AsyncGenerator
+from typing import AsyncGenerator, ClassVar
 
-from sqlalchemy.ext.asyncio import (AsyncAttrs, AsyncSession,
+from sqlalchemy import MetaData
+from sqlalchemy.ext.asyncio import (AsyncAttrs, AsyncEngine, AsyncSession,
                                     async_sessionmaker, create_async_engine)
 from sqlalchemy.orm import as_declarative, declared_attr
 
@@ -14,6 +15,11 @@ class Base(AsyncAttrs):
 
     Этот класс используется как основа для определения моделей в SQLAlchemy.
 
+    Attributes
+    ----------
+    metadata : MetaData
+        Метаданные всех моделей; задаются декоратором `as_declarative`.
+
     Methods
     -------
     __tablename__() -> str
@@ -21,6 +27,8 @@ class Base(AsyncAttrs):
 
     """
 
+    metadata: ClassVar[MetaData]
+
     @declared_attr.directive
     @classmethod
     def __tablename__(cls) -> str:
@@ -37,20 +45,52 @@ class Base(AsyncAttrs):
         return cls.__name__.lower()
 
 
-engine = create_async_engine(
-    settings.database_url,
-    pool_recycle=3600,
-    pool_size=10,
-    pool_pre_ping=True,
+def build_engine(url: str) -> AsyncEngine:
+	"""
+	Создаёт асинхронный движок с параметрами пула из настроек.
+
+	Parameters
+	----------
+	url : str
+	    Строка подключения к БД.
+
+	Returns
+	-------
+	AsyncEngine
+	    Движок SQLAlchemy.
+
+	"""
+
+	return create_async_engine(
+		url,
+		pool_size=settings.db_pool_size,
+		max_overflow=settings.db_max_overflow,
+		pool_timeout=settings.db_pool_timeout,
+		pool_recycle=settings.db_pool_recycle,
+		pool_pre_ping=settings.db_pool_pre_ping,
+		connect_args={"prepared_statement_cache_size": settings.db_statement_cache_size},
+	)
+
+
+engine = build_engine(settings.database_url)
+read_engine = (
+	build_engine(settings.database_replica_url)
+	if settings.database_replica_url
+	else engine
 )
 
 AsyncSessionLocal = async_sessionmaker(bind=engine)
+AsyncReadSessionLocal = async_sessionmaker(bind=read_engine)
 
 
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
 	"""
 	Генератор асинхронных сессий для работы с базой данных.
 
+	Сессия не занимает соединение при создании: оно берётся из пула при
+	первом запросе. Поэтому запрос, обслуженный из кэша или отклонённый
+	до обращения к БД, соединение из пула не получает.
+
 	Yields
 	------
 	AsyncSession
@@ -60,3 +100,21 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
 
 	async with AsyncSessionLocal() as async_session:
 		yield async_session
+
+
+async def get_async_read_session() -> AsyncGenerator[AsyncSession, None]:
+	"""
+	Генератор асинхронных сессий только для чтения.
+
+	Сессии подключаются к реплике, если она задана в настройках, иначе
+	к основной БД. Записывать через такую сессию нельзя.
+
+	Yields
+	------
+	AsyncSession
+	    Экземпляр асинхронной сессии для чтения.
+
+	"""
+
+	async with AsyncReadSessionLocal() as async_session:
+		yield async_session
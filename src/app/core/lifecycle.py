@@ -0,0 +1,199 @@
+import asyncio
+import inspect
+import signal
+from types import FrameType
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    NamedTuple,
+)
+
+from loguru import logger
+
+from app.const import SHUTDOWN_HOOK_MIN_TIMEOUT
+
+
+Hook = Callable[[], Awaitable[Any] | Any]
+
+
+class Component(NamedTuple):
+    """
+    Компонент приложения с хуками запуска и остановки.
+
+    Attributes
+    ----------
+    name : str
+        Имя компонента для логов.
+    startup : Hook | None
+        Хук запуска.
+    shutdown : Hook | None
+        Хук остановки.
+
+    """
+
+    name: str
+    startup: Hook | None
+    shutdown: Hook | None
+
+
+async def _call(hook: Hook) -> None:
+    result = hook()
+
+    if inspect.isawaitable(result):
+        await result
+
+
+class Lifecycle:
+    """
+    Управляет запуском и остановкой компонентов приложения.
+
+    Компоненты запускаются в порядке регистрации и останавливаются в
+    обратном порядке, поэтому пул соединений, зарегистрированный первым,
+    закрывается последним, после сброса всех буферов. Остановка
+    ограничена общим дедлайном: хук, не уложившийся в остаток времени
+    (но не меньше `SHUTDOWN_HOOK_MIN_TIMEOUT`), прерывается, и остановка
+    продолжается со следующего.
+
+    Uvicorn вызывает остановку lifespan только после того, как закрыл
+    сокеты и дождался открытых соединений, поэтому снять готовность
+    там уже поздно. Для этого `install_signal_handlers` перехватывает
+    SIGTERM/SIGINT: готовность снимается сразу, а обработчик сервера
+    вызывается через `drain_delay` секунд, пока экземпляр продолжает
+    обслуживать запросы.
+
+    Attributes
+    ----------
+    started : bool
+        Все компоненты успешно запущены.
+    stopping : bool
+        Началась остановка; приложение больше не готово принимать трафик.
+
+    """
+
+    def __init__(self) -> None:
+        self.started = False
+        self.stopping = False
+        self._components: list[Component] = []
+
+    @property
+    def ready(self) -> bool:
+        """Приложение запущено и не останавливается."""
+
+        return self.started and not self.stopping
+
+    def register(
+        self,
+        name: str,
+        startup: Hook | None = None,
+        shutdown: Hook | None = None,
+    ) -> None:
+        """
+        Регистрирует компонент.
+
+        Parameters
+        ----------
+        name : str
+            Имя компонента для логов.
+        startup : Hook | None
+            Синхронная или асинхронная функция запуска.
+        shutdown : Hook | None
+            Синхронная или асинхронная функция остановки.
+
+        """
+
+        self._components.append(Component(name, startup, shutdown))
+
+    async def startup(self) -> None:
+        """Запускает компоненты в порядке регистрации."""
+
+        for component in self._components:
+            if component.startup is not None:
+                await _call(component.startup)
+                logger.info(f"Запущен компонент: {component.name}")
+
+        self.started = True
+        logger.success("Приложение запущено")
+
+    def install_signal_handlers(self, drain_delay: float) -> None:
+        """
+        Снимает готовность по сигналу остановки до передачи его серверу.
+
+        Оборачивает уже установленные (сервером) обработчики SIGTERM и
+        SIGINT. Первый сигнал переводит приложение в состояние остановки,
+        и `/health/ready` начинает отвечать 503; исходный обработчик
+        вызывается через `drain_delay` секунд, за которые балансировщик
+        перестаёт направлять трафик на экземпляр. Повторный сигнал
+        передаётся серверу сразу.
+
+        Parameters
+        ----------
+        drain_delay : float
+            Пауза между снятием готовности и остановкой сервера.
+
+        """
+
+        loop = asyncio.get_running_loop()
+
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            previous = signal.getsignal(sig)
+
+            if not callable(previous):
+                continue
+
+            def handler(
+                signum: int,
+                frame: FrameType | None,
+                previous: Callable[[int, FrameType | None], Any] = previous,
+            ) -> None:
+                if self.stopping or drain_delay <= 0:
+                    self.stopping = True
+                    previous(signum, frame)
+                    return
+
+                self.stopping = True
+                logger.info(f"Получен сигнал остановки, снимаем готовность на {drain_delay} с")
+                loop.call_soon_threadsafe(loop.call_later, drain_delay, previous, signum, frame)
+
+            signal.signal(sig, handler)
+
+    async def shutdown(self, timeout: float) -> None:
+        """
+        Останавливает компоненты в обратном порядке с общим дедлайном.
+
+        Parameters
+        ----------
+        timeout : float
+            Общее время на остановку в секундах.
+
+        """
+
+        self.stopping = True
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
+        logger.info("Остановка приложения")
+
+        for component in reversed(self._components):
+            if component.shutdown is None:
+                continue
+
+            remaining = deadline - loop.time()
+
+            try:
+                await asyncio.wait_for(
+                    _call(component.shutdown),
+                    max(remaining, SHUTDOWN_HOOK_MIN_TIMEOUT),
+                )
+                logger.info(f"Остановлен компонент: {component.name}")
+
+            except asyncio.TimeoutError:
+                logger.error(f"Компонент {component.name} не остановился до дедлайна")
+
+            except Exception:
+                logger.exception(f"Ошибка остановки компонента {component.name}")
+
+        logger.success("Приложение остановлено")
+
+
+lifecycle = Lifecycle()
@@ -1,16 +1,67 @@
 from sys import exit
+from typing import Literal
 
 from loguru import logger
 from pydantic import (
+    BaseModel,
+    Field,
     PostgresDsn,
     ValidationError,
+    field_validator,
+    model_validator,
 )
 from pydantic_settings import (
     BaseSettings,
     SettingsConfigDict,
 )
 
-from app.const import EXIT_CODE_FOR_SETTINGS
+from app.const import (
+    API_RATE_BURST,
+    API_RATE_PER_MINUTE,
+    API_USER_RATE_BURST,
+    API_USER_RATE_PER_MINUTE,
+    BCRYPT_ROUNDS,
+    CLICK_BUFFER_MAX_SIZE,
+    CLICK_EVENTS_BATCH_SIZE,
+    CLICK_EVENTS_FLUSH_INTERVAL,
+    CLICK_EVENTS_QUEUE_SIZE,
+    CLICK_EVENTS_RETENTION_DAYS,
+    CLICK_FLUSH_INTERVAL,
+    CUT_URL_BATCH_RATE_COST,
+    DB_MAX_OVERFLOW,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_STATEMENT_CACHE_SIZE,
+    EXIT_CODE_FOR_SETTINGS,
+    LOGIN_EMAIL_BURST,
+    LOGIN_EMAIL_PER_MINUTE,
+    LOGIN_IP_BURST,
+    LOGIN_IP_PER_MINUTE,
+    MISSING_CACHE_SIZE,
+    MISSING_CACHE_TTL,
+    PASSWORD_HASH_QUEUE_SIZE,
+    PASSWORD_HASH_WORKERS,
+    RATE_LIMIT_TABLE_SIZE,
+    REDIRECT_CACHE_PREWARM_SIZE,
+    REDIRECT_CACHE_SIZE,
+    REDIRECT_CACHE_TTL,
+    REDIRECT_RATE_BURST,
+    REDIRECT_RATE_PER_MINUTE,
+    SHORT_CODE_BLOCK_SIZE,
+    SHORT_CODE_FILTER_CAPACITY,
+    SHORT_CODE_FILTER_ERROR_RATE,
+    SHORT_CODE_SYNC_INTERVAL,
+    SHORT_CODE_SYNC_OVERLAP,
+    SHUTDOWN_DRAIN_DELAY,
+    SHUTDOWN_TIMEOUT,
+    TOKEN_CACHE_SIZE,
+    TOKEN_CACHE_TTL,
+    TOP_LINKS_CAPACITY,
+    USER_CACHE_SIZE,
+    USER_CACHE_TTL,
+    VISITOR_BUFFER_MAX_SIZE,
+)
 
 
 class FastAPISettings(BaseSettings):
@@ -50,11 +101,17 @@ class PostgreSQLSettings(BaseSettings):
         Порт сервера БД.
     postgres_db : str
         Название базы данных.
+    postgres_replica_host : str | None
+        Хост реплики для чтения; если не задан, чтение идёт с основной БД.
+    postgres_replica_port : int | None
+        Порт реплики; по умолчанию совпадает с портом основной БД.
 
     Methods
     -------
     database_url()
         Составляет полный url для подключения к БД.
+    database_replica_url()
+        Составляет url для подключения к реплике, если она задана.
 
     """
 
@@ -63,6 +120,8 @@ class PostgreSQLSettings(BaseSettings):
     postgres_host: str
     postgres_port: int
     postgres_db: str
+    postgres_replica_host: str | None = None
+    postgres_replica_port: int | None = None
 
     @property
     def database_url(self) -> str:
@@ -87,6 +146,61 @@ class PostgreSQLSettings(BaseSettings):
             path=self.postgres_db
         ).unicode_string()
 
+    @property
+    def database_replica_url(self) -> str | None:
+        """
+        Формирует строку подключения к реплике PostgreSQL для чтения.
+
+        Returns
+        -------
+        str | None
+            Строка подключения к реплике или None, если реплика не задана.
+
+        """
+
+        if not self.postgres_replica_host:
+            return None
+
+        return PostgresDsn.build(
+            scheme="postgresql+asyncpg",
+            username=self.postgres_user,
+            password=self.postgres_password,
+            host=self.postgres_replica_host,
+            port=self.postgres_replica_port or self.postgres_port,
+            path=self.postgres_db
+        ).unicode_string()
+
+
+class DatabasePoolSettings(BaseSettings):
+    """
+    Настройки пула соединений с БД (для основной БД и реплики).
+
+    Attributes
+    ----------
+        db_pool_size: int
+            Количество постоянных соединений в пуле.
+        db_max_overflow: int
+            Количество дополнительных соединений сверх `db_pool_size`.
+        db_pool_timeout: float
+            Время ожидания свободного соединения в секундах.
+        db_pool_recycle: int
+            Время жизни соединения в секундах, после которого оно
+            пересоздаётся.
+        db_pool_pre_ping: bool
+            Проверять соединение запросом перед каждой выдачей из пула
+            (лишний round trip на каждый запрос).
+        db_statement_cache_size: int
+            Размер кэша подготовленных выражений asyncpg на соединение;
+            0 отключает кэш (нужно за pgbouncer в transaction-режиме).
+
+    """
+
+    db_pool_size: int = DB_POOL_SIZE
+    db_max_overflow: int = DB_MAX_OVERFLOW
+    db_pool_timeout: float = DB_POOL_TIMEOUT
+    db_pool_recycle: int = DB_POOL_RECYCLE
+    db_pool_pre_ping: bool = True
+    db_statement_cache_size: int = DB_STATEMENT_CACHE_SIZE
 
 
 class JWTSettings(BaseSettings):
@@ -108,10 +222,344 @@ class JWTSettings(BaseSettings):
     algorithm: str
     access_token_expire_minutes: int
 
+
+class PasswordSettings(BaseSettings):
+    """
+    Настройки хэширования паролей.
+
+    Attributes
+    ----------
+        bcrypt_rounds: int
+            Стоимость bcrypt (log2 числа раундов).
+        password_hash_workers: int
+            Количество потоков для хэширования и проверки паролей.
+        password_hash_queue_size: int
+            Максимальное количество операций в пуле (выполняющихся и
+            ожидающих), после которого запросы отклоняются с 429.
+
+    """
+
+    bcrypt_rounds: int = BCRYPT_ROUNDS
+    password_hash_workers: int = PASSWORD_HASH_WORKERS
+    password_hash_queue_size: int = PASSWORD_HASH_QUEUE_SIZE
+
+
+class CacheSettings(BaseSettings):
+    """
+    Настройки in-process кэшей.
+
+    Attributes
+    ----------
+        redirect_cache_size: int
+            Максимальное количество коротких ссылок в кэше редиректов.
+        redirect_cache_ttl: int
+            Время жизни записи кэша редиректов в секундах.
+        redirect_cache_prewarm_size: int
+            Количество самых популярных ссылок, загружаемых в кэш
+            редиректов заранее; 0 отключает прогрев.
+        top_links_capacity: int
+            Количество счётчиков в каждом подокне рейтинга популярных ссылок.
+        token_cache_size: int
+            Максимальное количество проверенных JWT в кэше.
+        token_cache_ttl: int
+            Время жизни проверенного JWT в кэше (не дольше его `exp`).
+        user_cache_size: int
+            Максимальное количество пользователей в кэше.
+        user_cache_ttl: int
+            Время жизни пользователя в кэше в секундах; записи не
+            инвалидируются, поэтому это и задержка, с которой видны
+            изменения пользователя в БД.
+        short_code_filter_enabled: bool
+            Отвечать 404 на несуществующие коды по фильтру Блума без БД.
+        short_code_filter_capacity: int
+            Минимальная ёмкость фильтра (количество кодов).
+        short_code_filter_error_rate: float
+            Допустимая доля ложных срабатываний фильтра.
+        short_code_sync_interval: float
+            Минимальный период догрузки кодов, созданных другими
+            экземплярами, в секундах.
+        short_code_sync_overlap: float
+            Сколько секунд до самой новой догруженной ссылки перечитывается
+            при догрузке. Ссылки из транзакций длиннее этого окна могут
+            не попасть в фильтр до его перестроения.
+        missing_cache_size: int
+            Максимальное количество кодов в кэше недавних 404.
+        missing_cache_ttl: int
+            Время жизни кода в кэше недавних 404 в секундах.
+
+    """
+
+    redirect_cache_size: int = REDIRECT_CACHE_SIZE
+    redirect_cache_ttl: int = REDIRECT_CACHE_TTL
+    redirect_cache_prewarm_size: int = REDIRECT_CACHE_PREWARM_SIZE
+    top_links_capacity: int = TOP_LINKS_CAPACITY
+    token_cache_size: int = TOKEN_CACHE_SIZE
+    token_cache_ttl: int = TOKEN_CACHE_TTL
+    user_cache_size: int = USER_CACHE_SIZE
+    user_cache_ttl: int = USER_CACHE_TTL
+    short_code_filter_enabled: bool = True
+    short_code_filter_capacity: int = SHORT_CODE_FILTER_CAPACITY
+    short_code_filter_error_rate: float = SHORT_CODE_FILTER_ERROR_RATE
+    short_code_sync_interval: float = SHORT_CODE_SYNC_INTERVAL
+    short_code_sync_overlap: float = SHORT_CODE_SYNC_OVERLAP
+    missing_cache_size: int = MISSING_CACHE_SIZE
+    missing_cache_ttl: int = MISSING_CACHE_TTL
+
+
+class ClickSettings(BaseSettings):
+    """
+    Настройки учёта переходов по ссылкам.
+
+    Attributes
+    ----------
+        click_buffer_enabled: bool
+            Копить клики в памяти и записывать их в БД пачками.
+        click_flush_interval: float
+            Период сброса буфера кликов в БД в секундах.
+        click_buffer_max_size: int
+            Количество различных ссылок в буфере, при котором он
+            сбрасывается досрочно.
+        click_events_enabled: bool
+            Писать журнал сырых событий перехода.
+        click_events_queue_size: int
+            Ёмкость очереди событий; при переполнении события отбрасываются.
+        click_events_batch_size: int
+            Максимальное количество событий в одной записи COPY.
+        click_events_flush_interval: float
+            Максимальное время накопления пачки событий в секундах.
+        click_events_retention_days: int
+            Срок хранения дневных секций журнала событий.
+        unique_visitors_enabled: bool
+            Считать уникальных посетителей ссылок (HyperLogLog).
+        visitor_buffer_max_size: int
+            Количество скетчей посетителей в буфере, при котором он
+            сбрасывается досрочно (1 КБ на скетч).
+
+    """
+
+    click_buffer_enabled: bool = True
+    click_flush_interval: float = CLICK_FLUSH_INTERVAL
+    click_buffer_max_size: int = CLICK_BUFFER_MAX_SIZE
+    click_events_enabled: bool = False
+    click_events_queue_size: int = CLICK_EVENTS_QUEUE_SIZE
+    click_events_batch_size: int = CLICK_EVENTS_BATCH_SIZE
+    click_events_flush_interval: float = CLICK_EVENTS_FLUSH_INTERVAL
+    click_events_retention_days: int = CLICK_EVENTS_RETENTION_DAYS
+    unique_visitors_enabled: bool = True
+    visitor_buffer_max_size: int = VISITOR_BUFFER_MAX_SIZE
+
+
+class LifecycleSettings(BaseSettings):
+    """
+    Настройки запуска и остановки приложения.
+
+    Attributes
+    ----------
+        shutdown_timeout: float
+            Общее время на остановку компонентов в секундах (после того
+            как сервер перестал принимать запросы). Время на завершение
+            открытых запросов задаётся отдельно ключом uvicorn
+            `--timeout-graceful-shutdown`.
+        shutdown_drain_delay: float
+            Пауза между получением SIGTERM (снятием готовности) и
+            передачей сигнала серверу, за которую балансировщик
+            перестаёт направлять трафик. Должна быть меньше
+            `terminationGracePeriodSeconds` оркестратора.
+
+    """
+
+    shutdown_timeout: float = SHUTDOWN_TIMEOUT
+    shutdown_drain_delay: float = SHUTDOWN_DRAIN_DELAY
+
+
+class ShortCodeSettings(BaseSettings):
+    """
+    Настройки генерации коротких кодов.
+
+    Attributes
+    ----------
+        short_code_mode: Literal["random", "sequence"]
+            Способ выделения кодов: случайные коды с проверкой в БД или
+            коды из последовательности БД, которые не могут совпасть.
+        short_code_block_size: int
+            Количество номеров, резервируемых воркером за одно обращение
+            к последовательности.
+        short_code_key: str
+            Ключ перестановки номеров в режиме `sequence`. Обязателен в
+            этом режиме: без ключа перестановка известна всем и коды
+            можно перебрать по порядку. Не должен меняться после начала
+            выдачи кодов.
+        url_dedup_enabled: bool
+            Возвращать существующую действующую короткую ссылку вместо
+            создания новой для того же оригинального URL.
+
+    Methods
+    -------
+    check_short_code_key()
+        Запрещает режим `sequence` без ключа перестановки.
+
+    """
+
+    short_code_mode: Literal["random", "sequence"] = "random"
+    short_code_block_size: int = SHORT_CODE_BLOCK_SIZE
+    short_code_key: str = ""
+    url_dedup_enabled: bool = False
+
+    @model_validator(mode="after")
+    def check_short_code_key(self) -> "ShortCodeSettings":
+        """
+        Запрещает режим `sequence` без ключа перестановки.
+
+        Returns
+        -------
+        ShortCodeSettings
+            Проверенные настройки.
+
+        Raises
+        ------
+        ValueError
+            Если выбран режим `sequence`, а `short_code_key` не задан.
+
+        """
+
+        if self.short_code_mode == "sequence" and not self.short_code_key:
+            raise ValueError("В режиме SHORT_CODE_MODE=sequence нужен SHORT_CODE_KEY")
+
+        return self
+
+
+class RouteRateLimit(BaseModel):
+    """
+    Лимиты одного маршрута API.
+
+    Незаданные поля берутся из общих лимитов API.
+
+    Attributes
+    ----------
+        enabled: bool
+            Ограничивать ли маршрут лимитом API.
+        burst: int | None
+            Допустимая серия запросов с одного адреса без токена.
+        per_minute: float | None
+            Скорость восстановления лимита адреса в минуту.
+        user_burst: int | None
+            Допустимая серия запросов одного пользователя.
+        user_per_minute: float | None
+            Скорость восстановления лимита пользователя в минуту.
+        cost: float
+            Сколько запросов лимита расходует один запрос; не больше серии.
+
+    """
+
+    enabled: bool = True
+    burst: int | None = None
+    per_minute: float | None = None
+    user_burst: int | None = None
+    user_per_minute: float | None = None
+    cost: float = 1
+
+
+API_ROUTE_LIMIT_DEFAULTS: dict[str, RouteRateLimit] = {
+    "cut_url_batch": RouteRateLimit(cost=CUT_URL_BATCH_RATE_COST),
+    # У входа свои лимиты по email и адресу, см. `check_login_rate`.
+    "login": RouteRateLimit(enabled=False),
+}
+
+
+class RateLimitSettings(BaseSettings):
+    """
+    Настройки ограничения частоты запросов.
+
+    Attributes
+    ----------
+        rate_limit_enabled: bool
+            Ограничивать частоту запросов к роутерам API и редиректа.
+        rate_limit_backend: Literal["memory", "postgres"]
+            Хранилище лимитов: память процесса (лимит на экземпляр) или
+            общая таблица в БД (лимит на весь кластер, ценой запроса к БД
+            на каждую проверку).
+        rate_limit_table_size: int
+            Максимальное количество ключей в памяти процесса.
+        redirect_rate_burst: int
+            Допустимая серия редиректов с одного адреса.
+        redirect_rate_per_minute: float
+            Скорость восстановления лимита редиректов в минуту.
+        api_rate_burst: int
+            Допустимая серия запросов к маршруту API с одного адреса без токена.
+        api_rate_per_minute: float
+            Скорость восстановления лимита маршрута API для адреса в минуту.
+        api_user_rate_burst: int
+            Допустимая серия запросов к маршруту API одного пользователя.
+        api_user_rate_per_minute: float
+            Скорость восстановления лимита маршрута API пользователя в минуту.
+        api_route_limits: dict[str, RouteRateLimit]
+            Лимиты отдельных маршрутов API по имени функции эндпоинта
+            (`cut_url_batch`, `top`, ...). Заданные поля
+            дополняют значения по умолчанию из `API_ROUTE_LIMIT_DEFAULTS`.
+        login_email_burst: int
+            Допустимая серия попыток входа для одного email.
+        login_email_per_minute: float
+            Скорость восстановления попыток входа для email в минуту.
+        login_ip_burst: int
+            Допустимая серия попыток входа с одного адреса.
+        login_ip_per_minute: float
+            Скорость восстановления попыток входа с адреса в минуту.
+
+    Methods
+    -------
+    merge_route_limits()
+        Дополняет лимиты маршрутов значениями по умолчанию.
+
+    """
+
+    rate_limit_enabled: bool = True
+    rate_limit_backend: Literal["memory", "postgres"] = "memory"
+    rate_limit_table_size: int = RATE_LIMIT_TABLE_SIZE
+    redirect_rate_burst: int = REDIRECT_RATE_BURST
+    redirect_rate_per_minute: float = REDIRECT_RATE_PER_MINUTE
+    api_rate_burst: int = API_RATE_BURST
+    api_rate_per_minute: float = API_RATE_PER_MINUTE
+    api_user_rate_burst: int = API_USER_RATE_BURST
+    api_user_rate_per_minute: float = API_USER_RATE_PER_MINUTE
+    api_route_limits: dict[str, RouteRateLimit] = Field(default={}, validate_default=True)
+    login_email_burst: int = LOGIN_EMAIL_BURST
+    login_email_per_minute: float = LOGIN_EMAIL_PER_MINUTE
+    login_ip_burst: int = LOGIN_IP_BURST
+    login_ip_per_minute: float = LOGIN_IP_PER_MINUTE
+
+    @field_validator("api_route_limits", mode="after")
+    @classmethod
+    def merge_route_limits(cls, value: dict[str, RouteRateLimit]) -> dict[str, RouteRateLimit]:
+        """
+        Дополняет лимиты маршрутов значениями по умолчанию.
+
+        Returns
+        -------
+        dict[str, RouteRateLimit]
+            Лимиты маршрутов по умолчанию с заданными поверх полями.
+
+        """
+
+        limits = dict(API_ROUTE_LIMIT_DEFAULTS)
+
+        for route, limit in value.items():
+            default = limits.get(route, RouteRateLimit())
+            limits[route] = default.model_copy(update=limit.model_dump(exclude_unset=True))
+
+        return limits
+
+
 class Settings(
     FastAPISettings,
     PostgreSQLSettings,
+    DatabasePoolSettings,
     JWTSettings,
+    PasswordSettings,
+    CacheSettings,
+    ClickSettings,
+    ShortCodeSettings,
+    LifecycleSettings,
+    RateLimitSettings,
 ):
     """
     Основные настройки проекта, загружаемые из .env файла.
@@ -131,6 +579,11 @@ class Settings(
 try:
     settings = Settings() # type: ignore
     logger.success("Загрузка настроек прошла успешно...")
-except ValidationError:
-    logger.error("Ошибка в загрузке настроек, проверьте .env")
+except ValidationError as exc:
+    # Входные значения не выводятся: среди них пароли и ключи.
+    errors = "; ".join(
+        f"{'.'.join(map(str, error['loc'])) or 'settings'}: {error['msg']}"
+        for error in exc.errors(include_input=False)
+    )
+    logger.error(f"Ошибка в загрузке настроек, проверьте .env: {errors}")
     exit(EXIT_CODE_FOR_SETTINGS)
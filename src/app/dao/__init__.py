@@ -1,7 +1,17 @@
-from .url import URLRepository
+from .click import ClickRepository
+from .job import JobRepository
+from .ratelimit import RateLimitRepository
+from .url import (
+    URLRepository,
+    URLStatsRow,
+)
 from .user import UserRepository
 
 __all__ = (
     "UserRepository",
     "URLRepository",
+    "ClickRepository",
+    "JobRepository",
+    "RateLimitRepository",
+    "URLStatsRow",
 )
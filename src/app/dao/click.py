@@ -0,0 +1,536 @@
+import datetime as dt
+from collections import Counter
+from itertools import islice
+from typing import (
+    Any,
+    Mapping,
+    Sequence,
+)
+
+from sqlalchemy import (
+    bindparam,
+    func,
+    or_,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Executable
+
+from app.cache import HyperLogLog
+from app.const import (
+    CLICK_FLUSH_CHUNK_SIZE,
+    CLICK_STATS_ACTIVE_HOURS,
+    UNIQUE_STATS_CHUNK_SIZE,
+)
+from app.models import (
+    ClickEvent,
+    ClickHour,
+    ClickMinute,
+    URLPairStat,
+    VisitorHour,
+)
+
+
+CLICK_EVENT_COLUMNS = (
+    ClickEvent.ts.key,
+    ClickEvent.url_id.key,
+    ClickEvent.referrer.key,
+    ClickEvent.user_agent_hash.key,
+    ClickEvent.ip_prefix.key,
+)
+
+
+class ClickRepository:
+    """
+    Репозиторий для работы с бакетами кликов.
+
+    Клики пишутся в поминутные и почасовые бакеты, из которых скользящими
+    окнами пересчитываются счётчики URLPairStat. Бакеты хранятся в таблицах,
+    секционированных по дням, и устаревают удалением секций целиком.
+
+    """
+
+    @classmethod
+    async def add_clicks(
+        cls,
+        deltas: Mapping[int, int],
+        session: AsyncSession,
+        now: dt.datetime | None = None,
+    ) -> None:
+        """
+        Добавляет клики в текущие поминутный и почасовой бакеты.
+
+        Args:
+            deltas (Mapping[int, int]): Прирост кликов по ID ссылки (URLPair).
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+            now (datetime | None): Момент кликов; по умолчанию текущее время UTC.
+
+        """
+
+        minute = (now or dt.datetime.now(dt.timezone.utc)).replace(second=0, microsecond=0)
+
+        await cls.add_minute_clicks(
+            {(url_id, minute): clicks for url_id, clicks in deltas.items()},
+            session,
+        )
+
+    @classmethod
+    async def add_minute_clicks(
+        cls,
+        deltas: Mapping[tuple[int, dt.datetime], int],
+        session: AsyncSession,
+    ) -> None:
+        """
+        Добавляет клики в поминутные и почасовые бакеты их минут.
+
+        Приросты разных минут одного часа суммируются до записи, поэтому
+        каждая пачка записывается одним `INSERT ... ON CONFLICT DO UPDATE`
+        на таблицу бакетов, а все пачки - одной транзакцией.
+
+        Args:
+            deltas (Mapping[tuple[int, datetime], int]): Прирост кликов по
+                ID ссылки (URLPair) и началу минуты, в которую они сделаны.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+
+        """
+
+        hours: Counter[tuple[int, dt.datetime]] = Counter()
+
+        for (url_id, minute), clicks in deltas.items():
+            hours[(url_id, minute.replace(minute=0))] += clicks
+
+        for model, buckets in (
+            (ClickMinute, deltas),
+            (ClickHour, hours),
+        ):
+            items = iter(buckets.items())
+
+            while chunk := list(islice(items, CLICK_FLUSH_CHUNK_SIZE)):
+                stmt = pg_insert(model).values(
+                    [
+                        {"url_id": url_id, "bucket_start": bucket_start, "clicks": clicks}
+                        for (url_id, bucket_start), clicks in chunk
+                    ]
+                )
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[model.url_id, model.bucket_start],
+                    set_={"clicks": model.clicks + stmt.excluded.clicks},
+                )
+
+                await session.execute(stmt)
+
+        await session.commit()
+
+    @classmethod
+    async def copy_events(
+        cls,
+        records: Sequence[tuple[Any, ...]],
+        session: AsyncSession,
+    ) -> None:
+        """
+        Записывает пачку событий перехода в журнал через COPY.
+
+        COPY выполняется напрямую драйвером asyncpg, минуя построение
+        INSERT'а, поэтому пачка в десятки тысяч строк пишется одним
+        обращением к БД.
+
+        Args:
+            records (Sequence[tuple]): Кортежи в порядке столбцов
+                `CLICK_EVENT_COLUMNS`.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+
+        """
+
+        conn = await session.connection()
+        raw = await conn.get_raw_connection()
+
+        await raw.driver_connection.copy_records_to_table(  # type: ignore[union-attr]
+            ClickEvent.__tablename__,
+            records=records,
+            columns=CLICK_EVENT_COLUMNS,
+        )
+
+        await session.commit()
+
+    @classmethod
+    async def refresh_windows(
+        cls,
+        session: AsyncSession,
+        now: dt.datetime | None = None,
+    ) -> int:
+        """
+        Пересчитывает счётчики кликов за последний час и сутки из бакетов.
+
+        Час считается скользящим окном по минутам, сутки — по часам.
+        Обновляются только ссылки, по которым были клики за последние
+        `CLICK_STATS_ACTIVE_HOURS` часов, и только если значение изменилось,
+        поэтому запрос не переписывает всю таблицу статистики.
+
+        Args:
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+            now (datetime | None): Момент расчёта; по умолчанию текущее время UTC.
+
+        Returns:
+            int: Количество обновлённых строк статистики.
+
+        """
+
+        now = now or dt.datetime.now(dt.timezone.utc)
+
+        active = (
+            select(ClickHour.url_id)
+            .where(ClickHour.bucket_start > now - dt.timedelta(hours=CLICK_STATS_ACTIVE_HOURS))
+            .distinct()
+            .subquery("active")
+        )
+        last_hour = (
+            select(ClickMinute.url_id, func.sum(ClickMinute.clicks).label("clicks"))
+            .where(ClickMinute.bucket_start > now - dt.timedelta(hours=1))
+            .group_by(ClickMinute.url_id)
+            .subquery("last_hour")
+        )
+        last_day = (
+            select(ClickHour.url_id, func.sum(ClickHour.clicks).label("clicks"))
+            .where(ClickHour.bucket_start > now - dt.timedelta(days=1))
+            .group_by(ClickHour.url_id)
+            .subquery("last_day")
+        )
+        windows = (
+            select(
+                active.c.url_id,
+                func.coalesce(last_hour.c.clicks, 0).label("hour_clicks"),
+                func.coalesce(last_day.c.clicks, 0).label("day_clicks"),
+            )
+            .select_from(active)
+            .outerjoin(last_hour, last_hour.c.url_id == active.c.url_id)
+            .outerjoin(last_day, last_day.c.url_id == active.c.url_id)
+            .subquery("windows")
+        )
+
+        stmt = (
+            update(URLPairStat)
+            .where(
+                URLPairStat.url_id == windows.c.url_id,
+                or_(
+                    URLPairStat.last_hour_clicks != windows.c.hour_clicks,
+                    URLPairStat.last_day_clicks != windows.c.day_clicks,
+                ),
+            )
+            .values(
+                last_hour_clicks=windows.c.hour_clicks,
+                last_day_clicks=windows.c.day_clicks,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        result = await session.execute(stmt)
+        await session.commit()
+
+        return result.rowcount  # type: ignore[attr-defined, no-any-return]
+
+    @classmethod
+    async def merge_visitor_sketches(
+        cls,
+        sketches: Mapping[tuple[int, dt.datetime], HyperLogLog],
+        session: AsyncSession,
+    ) -> None:
+        """
+        Объединяет накопленные скетчи посетителей с сохранёнными в БД.
+
+        Недостающие строки создаются пустыми, затем строки блокируются
+        `SELECT ... FOR UPDATE` в порядке ключа (без взаимоблокировок между
+        воркерами), объединяются с новыми скетчами и записываются обратно.
+
+        Args:
+            sketches (Mapping[tuple[int, datetime], HyperLogLog]): Скетчи
+                по ID ссылки и началу часа.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+
+        """
+
+        now = dt.datetime.now(dt.timezone.utc)
+        items = iter(sorted(sketches.items()))
+
+        while chunk := dict(islice(items, UNIQUE_STATS_CHUNK_SIZE)):
+            await session.execute(
+                pg_insert(VisitorHour)
+                .values(
+                    [
+                        {"url_id": url_id, "bucket_start": bucket_start, "sketch": b"", "updated_at": now}
+                        for url_id, bucket_start in chunk
+                    ]
+                )
+                .on_conflict_do_nothing()
+            )
+
+            ret = await session.execute(
+                select(VisitorHour.url_id, VisitorHour.bucket_start, VisitorHour.sketch)
+                .where(tuple_(VisitorHour.url_id, VisitorHour.bucket_start).in_(list(chunk)))
+                .order_by(VisitorHour.url_id, VisitorHour.bucket_start)
+                .with_for_update()
+            )
+
+            params = []
+
+            for url_id, bucket_start, stored in ret.all():
+                sketch = chunk[(url_id, bucket_start)]
+
+                if stored:
+                    sketch.merge(HyperLogLog(sketch.precision, stored))
+
+                params.append(
+                    {
+                        "url_id": url_id,
+                        "bucket_start": bucket_start,
+                        "sketch": sketch.to_bytes(),
+                        "updated_at": now,
+                    }
+                )
+
+            await session.execute(update(VisitorHour), params)
+
+        await session.commit()
+
+    @classmethod
+    async def refresh_uniques(
+        cls,
+        session: AsyncSession,
+        since: dt.datetime | None = None,
+        now: dt.datetime | None = None,
+    ) -> int:
+        """
+        Пересчитывает оценки уникальных посетителей за час и сутки.
+
+        Суточная оценка — объединение почасовых скетчей за последние сутки,
+        часовая — скетч текущего часа. Если передан `since`, пересчитываются
+        только ссылки со скетчами, обновлёнными после этого момента; иначе
+        все ссылки со скетчами за сутки или с ненулевыми оценками.
+
+        Args:
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+            since (datetime | None): Нижняя граница обновления скетчей.
+            now (datetime | None): Момент расчёта; по умолчанию текущее время UTC.
+
+        Returns:
+            int: Количество пересчитанных ссылок.
+
+        """
+
+        now = now or dt.datetime.now(dt.timezone.utc)
+        hour_start = now.replace(minute=0, second=0, microsecond=0)
+        day_ago = now - dt.timedelta(days=1)
+
+        active: Executable
+
+        if since is not None:
+            active = select(VisitorHour.url_id).where(VisitorHour.updated_at >= since)
+        else:
+            active = (
+                select(VisitorHour.url_id)
+                .where(VisitorHour.bucket_start > day_ago)
+                .union(
+                    select(URLPairStat.url_id).where(
+                        or_(URLPairStat.unique_last_hour > 0, URLPairStat.unique_last_day > 0)
+                    )
+                )
+            )
+
+        url_ids = iter(sorted(set((await session.execute(active)).scalars())))
+        refreshed = 0
+
+        while chunk := list(islice(url_ids, UNIQUE_STATS_CHUNK_SIZE)):
+            ret = await session.execute(
+                select(VisitorHour.url_id, VisitorHour.bucket_start, VisitorHour.sketch)
+                .where(
+                    VisitorHour.url_id.in_(chunk),
+                    VisitorHour.bucket_start > day_ago,
+                )
+            )
+
+            hour: dict[int, int] = {}
+            day: dict[int, HyperLogLog] = {}
+
+            for url_id, bucket_start, stored in ret.all():
+                if not stored:
+                    continue
+
+                sketch = HyperLogLog(registers=stored)
+
+                if bucket_start >= hour_start:
+                    hour[url_id] = sketch.count()
+
+                if url_id in day:
+                    day[url_id].merge(sketch)
+                else:
+                    day[url_id] = sketch
+
+            await session.execute(
+                update(URLPairStat)
+                .where(URLPairStat.url_id == bindparam("b_url_id"))
+                .values(
+                    unique_last_hour=bindparam("b_hour"),
+                    unique_last_day=bindparam("b_day"),
+                )
+                .execution_options(synchronize_session=False),
+                [
+                    {
+                        "b_url_id": url_id,
+                        "b_hour": hour.get(url_id, 0),
+                        "b_day": day[url_id].count() if url_id in day else 0,
+                    }
+                    for url_id in chunk
+                ],
+            )
+            refreshed += len(chunk)
+
+        await session.commit()
+
+        return refreshed
+
+    @classmethod
+    async def get_partition_key(cls, table: str, session: AsyncSession) -> str:
+        """
+        Возвращает столбец, по которому секционирована таблица.
+
+        Args:
+            table (str): Имя секционированной таблицы.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+
+        Returns:
+            str: Имя столбца ключа секционирования.
+
+        """
+
+        ret = await session.execute(
+            text("SELECT pg_get_partkeydef(CAST(:table AS regclass))"),
+            {"table": table},
+        )
+
+        # pg_get_partkeydef возвращает определение вида "RANGE (bucket_start)".
+        return str(ret.scalar_one()).partition("(")[2].rstrip(")")
+
+    @classmethod
+    async def create_partitions(
+        cls,
+        table: str,
+        days: list[dt.date],
+        session: AsyncSession,
+    ) -> list[str]:
+        """
+        Создаёт дневные секции секционированной таблицы, если их ещё нет.
+
+        Строки, попавшие за этот день в секцию DEFAULT (например, пока
+        задача не запускалась), переносятся в новую секцию: иначе
+        PostgreSQL отказывается создавать секцию, диапазон которой уже
+        занят строками DEFAULT. Перенос и подключение секции выполняются
+        в одной транзакции под блокировкой DEFAULT.
+
+        Args:
+            table (str): Имя секционированной таблицы.
+            days (list[date]): Дни (UTC), для которых нужны секции.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+
+        Returns:
+            list[str]: Имена созданных секций.
+
+        """
+
+        column = await cls.get_partition_key(table, session)
+        default = f"{table}_default"
+        created = []
+
+        for day in days:
+            name = f"{table}_p{day:%Y%m%d}"
+            ret = await session.execute(
+                text("SELECT to_regclass(:name) IS NOT NULL"),
+                {"name": name},
+            )
+
+            if ret.scalar_one():
+                continue
+
+            start = dt.datetime.combine(day, dt.time(), dt.timezone.utc)
+            end = start + dt.timedelta(days=1)
+            bounds = {"start": start, "end": end}
+
+            await session.execute(text(f"LOCK TABLE {default} IN ACCESS EXCLUSIVE MODE"))
+            await session.execute(text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS)"))
+            await session.execute(
+                text(
+                    f"WITH moved AS ("
+                    f"DELETE FROM {default} "
+                    f"WHERE {column} >= :start AND {column} < :end RETURNING *"
+                    f") INSERT INTO {name} SELECT * FROM moved"
+                ),
+                bounds,
+            )
+            await session.execute(
+                text(
+                    f"ALTER TABLE {table} ATTACH PARTITION {name} "
+                    f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+                )
+            )
+            await session.commit()
+
+            created.append(name)
+
+        return created
+
+    @classmethod
+    async def drop_partitions_before(
+        cls,
+        table: str,
+        day: dt.date,
+        session: AsyncSession,
+    ) -> list[str]:
+        """
+        Удаляет дневные секции таблицы, целиком лежащие раньше указанного дня.
+
+        Строки старше этого дня удаляются и из секции DEFAULT, чтобы она
+        не росла, если дневная секция когда-то не была создана вовремя.
+
+        Args:
+            table (str): Имя секционированной таблицы.
+            day (date): Первый день (UTC), секции которого нужно сохранить.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+
+        Returns:
+            list[str]: Имена удалённых секций.
+
+        """
+
+        ret = await session.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE parent.relname = :table"
+            ),
+            {"table": table},
+        )
+
+        prefix = f"{table}_p"
+        dropped = [
+            name
+            for name in ret.scalars()
+            if name.startswith(prefix)
+            and name[len(prefix):].isdigit()
+            and name[len(prefix):] < f"{day:%Y%m%d}"
+        ]
+
+        for name in dropped:
+            await session.execute(text(f"DROP TABLE IF EXISTS {name}"))
+
+        column = await cls.get_partition_key(table, session)
+        await session.execute(
+            text(f"DELETE FROM {table}_default WHERE {column} < :day"),
+            {"day": dt.datetime.combine(day, dt.time(), dt.timezone.utc)},
+        )
+
+        await session.commit()
+
+        return dropped
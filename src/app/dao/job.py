@@ -0,0 +1,124 @@
+import datetime as dt
+
+from sqlalchemy import (
+    and_,
+    func,
+    or_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import JobLease
+
+
+class JobRepository:
+    """
+    Репозиторий аренд плановых задач.
+
+    Аренда выдаётся атомарным `INSERT ... ON CONFLICT DO UPDATE ... WHERE`,
+    поэтому из нескольких экземпляров, одновременно запустивших задачу,
+    её получает ровно один. Время сравнивается по часам БД.
+
+    Аренда защищает только от параллельных запусков, а очередной запуск
+    выдаётся по времени предыдущего (`last_started_at`), поэтому после
+    падения владельца задачу выполняет тот экземпляр, который первым
+    проверит её после наступления срока.
+
+    """
+
+    @classmethod
+    async def acquire(
+        cls,
+        job_id: str,
+        owner: str,
+        ttl: dt.timedelta,
+        period: dt.timedelta,
+        session: AsyncSession,
+    ) -> bool:
+        """
+        Получает или продлевает аренду задачи, если пора её выполнить.
+
+        Аренда выдаётся, если её ещё нет, она истекла или уже принадлежит
+        этому экземпляру, и с начала предыдущего запуска прошло не меньше
+        `period`.
+
+        Args:
+            job_id (str): Идентификатор задачи.
+            owner (str): Идентификатор экземпляра приложения.
+            ttl (timedelta): Срок аренды.
+            period (timedelta): Минимальный промежуток между запусками.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+
+        Returns:
+            bool: True, если аренда получена и задачу нужно выполнить.
+
+        """
+
+        now = func.now()
+        stmt = pg_insert(JobLease).values(
+            job_id=job_id,
+            owner=owner,
+            lease_until=now + ttl,
+            last_started_at=now,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[JobLease.job_id],
+            set_={
+                "owner": stmt.excluded.owner,
+                "lease_until": stmt.excluded.lease_until,
+                "last_started_at": stmt.excluded.last_started_at,
+            },
+            where=and_(
+                or_(JobLease.lease_until <= now, JobLease.owner == owner),
+                or_(
+                    JobLease.last_started_at.is_(None),
+                    JobLease.last_started_at <= now - period,
+                ),
+            ),
+        )
+
+        ret = await session.execute(stmt.returning(JobLease.job_id))
+        acquired = ret.scalar_one_or_none() is not None
+        await session.commit()
+
+        return acquired
+
+    @classmethod
+    async def record_run(
+        cls,
+        job_id: str,
+        owner: str,
+        duration: float,
+        rows: int | None,
+        error: str | None,
+        session: AsyncSession,
+    ) -> None:
+        """
+        Сохраняет метрики завершённого запуска задачи.
+
+        Args:
+            job_id (str): Идентификатор задачи.
+            owner (str): Идентификатор экземпляра приложения.
+            duration (float): Длительность запуска в секундах.
+            rows (int | None): Количество обработанных строк.
+            error (str | None): Текст ошибки, если запуск упал.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+
+        """
+
+        values: dict[str, object] = {
+            "last_duration": duration,
+            "last_rows": rows,
+            "last_error": error,
+        }
+
+        if error is None:
+            values["last_success_at"] = func.now()
+
+        await session.execute(
+            update(JobLease)
+            .where(JobLease.job_id == job_id, JobLease.owner == owner)
+            .values(**values)
+        )
+        await session.commit()
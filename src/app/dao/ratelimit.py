@@ -0,0 +1,102 @@
+import datetime as dt
+
+from sqlalchemy import (
+    delete,
+    func,
+    select,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import RateLimitBucket
+
+
+class RateLimitRepository:
+    """
+    Репозиторий корзин жетонов, общих для всех экземпляров приложения.
+
+    Пополнение и списание жетона выполняются одним атомарным
+    `INSERT ... ON CONFLICT DO UPDATE ... WHERE` по часам БД.
+
+    """
+
+    @classmethod
+    async def take(
+        cls,
+        key: str,
+        capacity: float,
+        rate: float,
+        session: AsyncSession,
+        cost: float = 1,
+    ) -> float:
+        """
+        Списывает жетоны из корзины, если их хватает.
+
+        Args:
+            key (str): Ключ корзины.
+            capacity (float): Ёмкость корзины.
+            rate (float): Скорость пополнения в жетонах в секунду.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+            cost (float): Количество списываемых жетонов.
+
+        Returns:
+            float: 0, если жетоны списаны, иначе через сколько секунд их хватит.
+
+        """
+
+        now = func.now()
+        refilled = func.least(
+            capacity,
+            RateLimitBucket.tokens
+            + func.extract("epoch", now - RateLimitBucket.updated_at) * rate,
+        )
+
+        stmt = pg_insert(RateLimitBucket).values(
+            key=key,
+            tokens=capacity - cost,
+            updated_at=now,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[RateLimitBucket.key],
+            set_={"tokens": refilled - cost, "updated_at": now},
+            where=refilled >= cost,
+        )
+
+        ret = await session.execute(stmt.returning(RateLimitBucket.key))
+
+        if ret.scalar_one_or_none() is not None:
+            await session.commit()
+            return 0.0
+
+        ret = await session.execute(
+            select((cost - refilled) / rate).where(RateLimitBucket.key == key)
+        )
+        retry_after = ret.scalar_one_or_none()
+        await session.commit()
+
+        return max(float(retry_after or 0.0), 0.0)
+
+    @classmethod
+    async def delete_idle(
+        cls,
+        before: dt.datetime,
+        session: AsyncSession,
+    ) -> int:
+        """
+        Удаляет корзины, не обновлявшиеся с указанного момента.
+
+        Args:
+            before (datetime): Граница последнего обновления.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+
+        Returns:
+            int: Количество удалённых корзин.
+
+        """
+
+        ret = await session.execute(
+            delete(RateLimitBucket).where(RateLimitBucket.updated_at < before)
+        )
+        await session.commit()
+
+        return ret.rowcount  # type: ignore[attr-defined, no-any-return]
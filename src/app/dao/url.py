@@ -1,21 +1,145 @@
-from typing import Sequence
+import datetime as dt
+from typing import (
+    Any,
+    Sequence,
+    TypeAlias,
+)
 
 from pydantic import HttpUrl
 from sqlalchemy import (
+    Row,
+    Select,
+    and_,
+    bindparam,
     desc,
     exists,
+    func,
+    insert,
+    literal,
+    or_,
     select,
     update,
 )
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 
+from app.const import (
+    REDIRECT_INVALIDATE_CHANNEL,
+    URL_INSERT_CHUNK_SIZE,
+)
 from app.models import (
     URLPair,
     URLPairStat,
+    default_expires_at,
+    original_url_hash,
+    short_code_seq,
+)
+
+
+# Строка ссылки со счётчиками в порядке колонок `select_urls_with_stats`.
+URLStatsRow: TypeAlias = Row[int, str, str, bool, bool, dt.datetime, int, int, int, int]
+
+
+REDIRECT_TARGET_STMT = (
+    select(
+        URLPair.id,
+        URLPair.original_url,
+        URLPair.is_activated,
+        URLPair.is_old,
+        URLPair.expires_at,
+    )
+    .where(URLPair.short_url == bindparam("short_url"))
 )
 
 
+def select_urls_with_stats() -> Select[int, str, str, bool, bool, dt.datetime, int, int, int, int]:
+    """
+    Собирает запрос колонок ссылки вместе с её счётчиками кликов.
+
+    Статистика присоединяется одним INNER JOIN, а результатом являются
+    плоские строки без ORM-объектов, которые напрямую валидируются
+    в `URLResponse`.
+
+    Returns:
+        Select: Запрос по urlpair JOIN urlpairstat.
+
+    """
+
+    return select(
+        URLPair.id,
+        URLPair.short_url,
+        URLPair.original_url,
+        URLPair.is_activated,
+        URLPair.is_old,
+        URLPair.expires_at,
+        URLPairStat.last_hour_clicks,
+        URLPairStat.last_day_clicks,
+        URLPairStat.unique_last_hour,
+        URLPairStat.unique_last_day,
+    ).join(URLPairStat, URLPairStat.url_id == URLPair.id)
+
+
+def insert_url_pairs_stmt(
+    pairs: list[dict[str, Any]],
+) -> Select[int, str, str, bool, bool, dt.datetime, int, int, int, int]:
+    """
+    Собирает запрос, вставляющий пары URLPair вместе с их URLPairStat.
+
+    Пары вставляются через `INSERT ... ON CONFLICT (short_url) DO NOTHING
+    RETURNING`, а статистика создаётся вторым CTE из вставленных строк,
+    поэтому всё выполняется одним запросом. Отклонённые из-за занятого
+    short_url пары в результат не попадают.
+
+    Python-умолчания колонок для INSERT внутри CTE не применяются, поэтому
+    все значения, включая `expires_at`, должны быть переданы явно.
+
+    Args:
+        pairs (list[dict[str, Any]]): Значения колонок URLPair для каждой пары.
+
+    Returns:
+        Select: Запрос, возвращающий вставленные пары с нулевой статистикой.
+
+    """
+
+    inserted = (
+        pg_insert(URLPair)
+        .values(pairs)
+        .on_conflict_do_nothing(index_elements=[URLPair.short_url])
+        .returning(
+            URLPair.id,
+            URLPair.short_url,
+            URLPair.original_url,
+            URLPair.is_activated,
+            URLPair.is_old,
+            URLPair.expires_at,
+        )
+        .cte("inserted")
+    )
+
+    inserted_stats = (
+        insert(URLPairStat)
+        .from_select(
+            [
+                "url_id",
+                "last_hour_clicks",
+                "last_day_clicks",
+                "unique_last_hour",
+                "unique_last_day",
+            ],
+            select(inserted.c.id, literal(0), literal(0), literal(0), literal(0)),
+        )
+        .cte("inserted_stats")
+    )
+
+    return select(
+        inserted,
+        literal(0).label("last_hour_clicks"),
+        literal(0).label("last_day_clicks"),
+        literal(0).label("unique_last_hour"),
+        literal(0).label("unique_last_day"),
+    ).add_cte(inserted_stats)
+
+
 class URLRepository:
     """
     Репозиторий для работы с моделью URL и статистикой ClickStat.
@@ -71,6 +195,244 @@ class URLRepository:
 
         return ret.scalar_one_or_none()
     
+    @classmethod
+    async def get_redirect_target(
+        cls,
+        short_url: str,
+        session: AsyncSession,
+    ) -> Row[int, str, bool, bool, dt.datetime] | None:
+        """
+        Получить данные для редиректа по короткой ссылке.
+
+        Выполняет один запрос только по нужным колонкам, без ORM-объектов и
+        связанной статистики. Запрос собирается один раз на уровне модуля,
+        поэтому его компиляция берётся из кэша SQLAlchemy.
+
+        Args:
+            short_url (str): Короткий URL.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+
+        Returns:
+            Row | None: Кортеж (id, original_url, is_activated, is_old, expires_at)
+                или None, если ссылка не найдена.
+
+        """
+
+        ret = await session.execute(REDIRECT_TARGET_STMT, {"short_url": short_url})
+
+        return ret.one_or_none()
+
+    @classmethod
+    async def get_redirect_targets(
+        cls,
+        short_urls: list[str],
+        session: AsyncSession,
+    ) -> dict[str, tuple[Any, ...]]:
+        """
+        Получить данные для редиректа сразу по нескольким коротким ссылкам.
+
+        Args:
+            short_urls (list[str]): Короткие URL.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+
+        Returns:
+            dict[str, tuple]: Кортежи (id, original_url, is_activated, is_old,
+                expires_at) по короткому URL; отсутствующие ссылки пропускаются.
+
+        """
+
+        if not short_urls:
+            return {}
+
+        ret = await session.execute(
+            select(
+                URLPair.short_url,
+                URLPair.id,
+                URLPair.original_url,
+                URLPair.is_activated,
+                URLPair.is_old,
+                URLPair.expires_at,
+            )
+            .where(URLPair.short_url.in_(short_urls))
+        )
+
+        return {row.short_url: tuple(row[1:]) for row in ret.all()}
+
+    @classmethod
+    async def get_short_urls_after(
+        cls,
+        after_id: int,
+        limit: int,
+        session: AsyncSession,
+    ) -> Sequence[Row[int, str]]:
+        """
+        Получить короткие ссылки с id больше заданного (keyset-пагинация по PK).
+
+        Args:
+            after_id (int): Последний уже прочитанный id.
+            limit (int): Максимальное количество строк.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+
+        Returns:
+            Sequence[Row[int, str]]: Строки (id, short_url) по возрастанию id.
+
+        """
+
+        ret = await session.execute(
+            select(URLPair.id, URLPair.short_url)
+            .where(URLPair.id > after_id)
+            .order_by(URLPair.id)
+            .limit(limit)
+        )
+
+        return ret.all()
+
+    @classmethod
+    async def get_last_created_at(cls, session: AsyncSession) -> dt.datetime:
+        """
+        Получить время создания самой новой видимой ссылки.
+
+        Args:
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+
+        Returns:
+            datetime: Наибольший `created_at` или текущее время БД, если ссылок нет.
+
+        """
+
+        ret = await session.execute(
+            select(func.coalesce(func.max(URLPair.created_at), func.now()))
+        )
+
+        return ret.scalar_one()
+
+    @classmethod
+    async def get_short_urls_created_since(
+        cls,
+        since: dt.datetime,
+        after_id: int,
+        limit: int,
+        session: AsyncSession,
+    ) -> Sequence[Row[int, str, dt.datetime]]:
+        """
+        Получить короткие ссылки, созданные не раньше заданного момента.
+
+        Args:
+            since (datetime): Начало окна догрузки.
+            after_id (int): Последний уже прочитанный id этой выборки.
+            limit (int): Максимальное количество строк.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+
+        Returns:
+            Sequence[Row[int, str, datetime]]: Строки (id, short_url, created_at)
+                по возрастанию id.
+
+        """
+
+        ret = await session.execute(
+            select(URLPair.id, URLPair.short_url, URLPair.created_at)
+            .where(URLPair.created_at >= since, URLPair.id > after_id)
+            .order_by(URLPair.id)
+            .limit(limit)
+        )
+
+        return ret.all()
+
+    @classmethod
+    async def get_last_id(cls, session: AsyncSession) -> int:
+        """
+        Получить наибольший id ссылки.
+
+        Args:
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+
+        Returns:
+            int: Наибольший id или 0, если ссылок нет.
+
+        """
+
+        ret = await session.execute(select(func.max(URLPair.id)))
+
+        return ret.scalar_one() or 0
+
+    @classmethod
+    async def reserve_code_ids(
+        cls,
+        count: int,
+        session: AsyncSession,
+    ) -> list[int]:
+        """
+        Резервирует блок номеров из последовательности коротких кодов.
+
+        Все номера выбираются одним запросом; `nextval` не откатывается
+        вместе с транзакцией, поэтому выданный номер никогда не повторится.
+
+        Args:
+            count (int): Количество номеров.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+
+        Returns:
+            list[int]: Зарезервированные номера.
+
+        """
+
+        stmt = select(short_code_seq.next_value()).select_from(
+            func.generate_series(1, count)
+        )
+
+        ret = await session.execute(stmt)
+
+        return list(ret.scalars().all())
+
+    @classmethod
+    async def get_active_by_original_urls(
+        cls,
+        original_urls: Sequence[str],
+        session: AsyncSession,
+    ) -> dict[str, URLStatsRow]:
+        """
+        Находит действующие короткие ссылки для оригинальных URL.
+
+        Поиск идёт по индексу `ix_urlpair_original_url_hash`; сам URL
+        сравнивается дополнительно, чтобы исключить коллизии хэша.
+
+        Args:
+            original_urls (Sequence[str]): Нормализованные оригинальные ссылки.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+
+        Returns:
+            dict[str, Row]: Пара со статистикой для каждого найденного URL.
+
+        """
+
+        found: dict[str, URLStatsRow] = {}
+        now = dt.datetime.now(dt.timezone.utc)
+        urls = list(dict.fromkeys(original_urls))
+
+        for start in range(0, len(urls), URL_INSERT_CHUNK_SIZE):
+            chunk = urls[start:start + URL_INSERT_CHUNK_SIZE]
+
+            stmt = (
+                select_urls_with_stats()
+                .where(
+                    URLPair.original_url_hash.in_(
+                        [original_url_hash(url) for url in chunk]
+                    ),
+                    URLPair.original_url.in_(chunk),
+                    URLPair.is_activated,
+                    ~URLPair.is_old,
+                    URLPair.expires_at > now,
+                )
+                .order_by(URLPair.id)
+            )
+
+            ret = await session.execute(stmt)
+
+            for row in ret:
+                found.setdefault(row.original_url, row)
+
+        return found
+
     @classmethod
     async def add_url_pair(
         cls,
@@ -79,11 +441,14 @@ class URLRepository:
         session: AsyncSession,
         is_activated: bool = True,
         is_old: bool = False, 
-    ) -> URLPair:
+    ) -> URLStatsRow | None:
         """
         Добавляет новую пару original_url и short_url в базу данных.
         Также создаёт связанный ClickStat.
 
+        Вставка выполняется одним запросом без предварительной проверки
+        существования и без повторного чтения строки после коммита.
+
         Args:
             original_url (HttpUrl): Полная оригинальная ссылка.
             short_url (str): Сгенерированная короткая ссылка.
@@ -91,49 +456,74 @@ class URLRepository:
             is_old (bool): Устаревшая ли ссылка.
 
         Returns:
-            URL: Сохранённая модель URL.
+            Row | None: Сохранённая пара со статистикой или None,
+                если short_url уже занят.
 
         """
 
-        urlstat = URLPairStat(
-            last_hour_clicks=0,
-            last_day_clicks=0,
-        ) # type: ignore
+        stmt = insert_url_pairs_stmt(
+            [
+                {
+                    "original_url": str(original_url),
+                    "original_url_hash": original_url_hash(str(original_url)),
+                    "short_url": short_url,
+                    "is_activated": is_activated,
+                    "is_old": is_old,
+                    "expires_at": default_expires_at(),
+                },
+            ]
+        )
 
-        url = URLPair(
-            original_url=str(original_url),
-            short_url=short_url,
-            is_activated=is_activated,
-            is_old=is_old,
-            stats=urlstat,
-        ) # type: ignore
+        ret = await session.execute(stmt)
+        row = ret.one_or_none()
 
-        session.add(url)
         await session.commit()
-        await session.refresh(url)
 
-        return url
+        return row
 
     @classmethod
-    async def increment_clicks(
+    async def add_url_pairs(
         cls,
-        url_obj: URLPair,
+        pairs: Sequence[tuple[str, str]],
         session: AsyncSession,
-    ) -> None:
+    ) -> list[URLStatsRow]:
         """
-        Инкрементирует счётчики кликов за последний час и день для ссылки по её ID.
+        Добавляет пачку пар original_url и short_url многострочными INSERT'ами.
+
+        Транзакция не фиксируется: вызывающий код сам делает commit после
+        обработки всей пачки.
 
         Args:
-            url_id (int): Идентификатор укороченной ссылки (URLPair).
+            pairs (Sequence[tuple[str, str]]): Пары (original_url, short_url).
             session (AsyncSession): Асинхронная сессия SQLAlchemy.
 
-        """
+        Returns:
+            list[Row]: Вставленные пары; пары с уже занятым short_url пропускаются.
 
-        url_obj.stats.last_day_clicks += 1
-        url_obj.stats.last_hour_clicks += 1
+        """
 
-        session.add(url_obj)
-        await session.commit()
+        rows: list[URLStatsRow] = []
+        expires_at = default_expires_at()
+
+        for start in range(0, len(pairs), URL_INSERT_CHUNK_SIZE):
+            stmt = insert_url_pairs_stmt(
+                [
+                    {
+                        "original_url": original_url,
+                        "original_url_hash": original_url_hash(original_url),
+                        "short_url": short_url,
+                        "is_activated": True,
+                        "is_old": False,
+                        "expires_at": expires_at,
+                    }
+                    for original_url, short_url in pairs[start:start + URL_INSERT_CHUNK_SIZE]
+                ]
+            )
+
+            ret = await session.execute(stmt)
+            rows.extend(ret.all())
+
+        return rows
 
     @classmethod
     async def get_all(
@@ -144,40 +534,116 @@ class URLRepository:
         offset: int = 0,
         sort_by_hour_clicks: bool = False,
         sort_by_day_clicks: bool = False,
-    ) -> Sequence["URLPair"]:
+        cursor: tuple[int, int] | None = None,
+    ) -> Sequence[URLStatsRow]:
         """
         Получает список ссылок с опциональной фильтрацией по статусу и сортировкой по кликам.
 
+        Страницы листаются по курсору (keyset-пагинация): курсор хранит ключ
+        сортировки и ID последней ссылки предыдущей страницы, поэтому каждая
+        следующая страница читается по индексу, а не через OFFSET.
+        Статистика присоединяется одним JOIN, ORM-объекты не создаются.
+
         Args:
             session (AsyncSession): Асинхронная сессия SQLAlchemy.
             is_activated (bool | None): Если указано, фильтрует по активности ссылки.
             limit (int): Максимальное количество ссылок для возврата.
-            offset (int): Количество пропущенных записей (для пагинации).
+            offset (int): Количество пропущенных записей; игнорируется при курсоре.
             sort_by_hour_clicks (bool): Если True — сортировать по кликам за час (убывание).
             sort_by_day_clicks (bool): Если True — сортировать по кликам за день (убывание).
+            cursor (tuple[int, int] | None): Ключ сортировки и ID последней
+                ссылки предыдущей страницы.
 
         Returns:
-            Sequence[URLPair]: Список объектов URLPair, соответствующих условиям.
+            Sequence[Row]: Строки ссылок со счётчиками кликов, соответствующие условиям.
 
         """
 
-        stmt = select(URLPair).options(joinedload(URLPair.stats))
+        stmt = select_urls_with_stats()
 
         if is_activated is not None:
             stmt = stmt.where(URLPair.is_activated == is_activated)
 
-        if sort_by_hour_clicks:
-            stmt = stmt.join(URLPair.stats).order_by(desc(URLPairStat.last_hour_clicks))
-        elif sort_by_day_clicks:
-            stmt = stmt.join(URLPair.stats).order_by(desc(URLPairStat.last_day_clicks))
-
-        stmt = stmt.limit(limit).offset(offset)
+        if sort_by_hour_clicks or sort_by_day_clicks:
+            clicks = (
+                URLPairStat.last_hour_clicks
+                if sort_by_hour_clicks
+                else URLPairStat.last_day_clicks
+            )
+            stmt = stmt.order_by(desc(clicks), URLPairStat.url_id)
+
+            if cursor is not None:
+                last_clicks, last_id = cursor
+                # `clicks <= last_clicks` повторяет условие OR, но в отличие
+                # от него ограничивает сканирование индекса по кликам.
+                stmt = stmt.where(
+                    clicks <= last_clicks,
+                    or_(
+                        clicks < last_clicks,
+                        and_(clicks == last_clicks, URLPairStat.url_id > last_id),
+                    ),
+                )
+        else:
+            stmt = stmt.order_by(URLPair.id)
+
+            if cursor is not None:
+                stmt = stmt.where(URLPair.id > cursor[1])
+
+        # Курсор уже задаёт начало страницы, OFFSET применяется только без него.
+        if cursor is None and offset:
+            stmt = stmt.offset(offset)
+
+        stmt = stmt.limit(limit)
 
         result = await session.execute(stmt)
 
-        return result.scalars().all()
+        return result.all()
+
+    @classmethod
+    async def deactivate_expired_chunk(
+        cls,
+        now: dt.datetime,
+        limit: int,
+        session: AsyncSession,
+    ) -> list[str]:
+        """
+        Деактивирует очередную пачку истёкших ссылок в отдельной транзакции.
+
+        Кандидаты выбираются по частичному индексу `ix_urlpair_expires_at`
+        с `FOR UPDATE SKIP LOCKED`, поэтому несколько реплик, запустивших
+        задачу одновременно, обрабатывают разные строки и не ждут друг друга.
+
+        Args:
+            now (datetime): Момент, на который ссылки считаются истёкшими.
+            limit (int): Максимальное количество ссылок в пачке.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+
+        Returns:
+            list[str]: Короткие коды деактивированных ссылок.
+
+        """
+
+        expired = (
+            select(URLPair.id)
+            .where(URLPair.expires_at <= now, URLPair.is_activated)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .cte("expired")
+        )
+
+        stmt = (
+            update(URLPair)
+            .where(URLPair.id.in_(select(expired.c.id)))
+            .values(is_activated=False, is_old=True)
+            .returning(URLPair.short_url)
+        )
+
+        ret = await session.execute(stmt)
+        short_urls = list(ret.scalars().all())
+        await session.commit()
+
+        return short_urls
 
-        
     @classmethod
     async def deactivate_link(
         cls,
@@ -187,6 +653,9 @@ class URLRepository:
         """
         Деактивирует укороченную ссылку (делает её недоступной для переходов) по коду.
 
+        Вместе с изменением в той же транзакции отправляется NOTIFY, по
+        которому все экземпляры удаляют код из своих кэшей редиректов.
+
         Args:
             short_code (str): Уникальный идентификатор укороченной ссылки (часть URL).
             session (AsyncSession): Асинхронная сессия SQLAlchemy.
@@ -200,4 +669,5 @@ class URLRepository:
         )
 
         await session.execute(stmt)
+        await session.execute(select(func.pg_notify(REDIRECT_INVALIDATE_CHANNEL, short_code)))
         await session.commit()
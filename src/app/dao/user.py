@@ -1,7 +1,6 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth.security import hash_password
 from app.models import User
 
 
@@ -34,13 +33,15 @@ class UserRepository:
         return result.scalar_one_or_none()
     
     @classmethod
-    async def add_new_user(cls, email: str, password: str, session: AsyncSession) -> User:
+    async def add_new_user(cls, email: str, hashed_password: str, session: AsyncSession) -> User:
         """
         Добавляет нового пользователя в базу данных с захешированным паролем.
 
+        Пароль хэшируется заранее, вне event loop'а, в вызывающем коде.
+
         Args:
             email (str): Email нового пользователя.
-            password (str): Пароль пользователя в открытом виде.
+            hashed_password (str): Уже захешированный пароль пользователя.
 
         Returns:
             User: Созданный и сохранённый объект пользователя.
@@ -49,7 +50,7 @@ class UserRepository:
 
         stmt = User(
             email=email,
-            password=hash_password(password)
+            password=hashed_password
         ) # type: ignore
 
         session.add(stmt)
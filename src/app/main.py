@@ -3,17 +3,61 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
 from app.api import main_router
-from app.core import settings
-from app.tasks import start_scheduler
+from app.auth.security import shutdown_password_executor
+from app.core import (
+    engine,
+    lifecycle,
+    read_engine,
+    settings,
+)
+from app.tasks import (
+    click_buffer,
+    click_events,
+    redirect_invalidation,
+    short_codes,
+    start_scheduler,
+    stop_scheduler,
+    visitor_buffer,
+)
+
+
+# Компоненты останавливаются в обратном порядке: сначала планировщик,
+# затем буферы дописывают данные, и только потом закрывается пул.
+lifecycle.register("db", shutdown=engine.dispose)
+
+if read_engine is not engine:
+    lifecycle.register("db_replica", shutdown=read_engine.dispose)
+
+lifecycle.register(
+    "redirect_invalidation",
+    redirect_invalidation.start,
+    redirect_invalidation.stop,
+)
+lifecycle.register("password_executor", shutdown=shutdown_password_executor)
+lifecycle.register("click_buffer", click_buffer.start, click_buffer.stop)
+
+if settings.click_events_enabled:
+    lifecycle.register("click_events", click_events.start, click_events.stop)
+
+if settings.unique_visitors_enabled:
+    lifecycle.register("visitor_buffer", visitor_buffer.start, visitor_buffer.stop)
+
+if settings.short_code_filter_enabled:
+    lifecycle.register("short_code_filter", short_codes.start)
+
+lifecycle.register("scheduler", start_scheduler, stop_scheduler)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
 
-    start_scheduler()
+    await lifecycle.startup()
+    lifecycle.install_signal_handlers(settings.shutdown_drain_delay)
 
     yield
 
+    await lifecycle.shutdown(timeout=settings.shutdown_timeout)
+
 
 app = FastAPI(
     title=settings.app_title,
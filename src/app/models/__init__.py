@@ -1,8 +1,26 @@
-from .url import URLPair, URLPairStat
+from .click import ClickEvent, ClickHour, ClickMinute, VisitorHour
+from .job import JobLease
+from .ratelimit import RateLimitBucket
+from .url import (
+    URLPair,
+    URLPairStat,
+    default_expires_at,
+    original_url_hash,
+    short_code_seq,
+)
 from .user import User
 
 __all__ = (
     "User",
     "URLPair",
     "URLPairStat",
+    "ClickMinute",
+    "ClickHour",
+    "ClickEvent",
+    "VisitorHour",
+    "JobLease",
+    "RateLimitBucket",
+    "short_code_seq",
+    "default_expires_at",
+    "original_url_hash",
 )
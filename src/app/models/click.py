@@ -0,0 +1,141 @@
+import datetime as dt
+import ipaddress
+
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    ForeignKey,
+    Identity,
+    Index,
+    LargeBinary,
+    Text,
+)
+from sqlalchemy.dialects.postgresql import CIDR
+from sqlalchemy.orm import (
+    Mapped,
+    mapped_column,
+)
+
+from app.core import Base
+
+
+class ClickMinute(Base):
+    """
+    Поминутный бакет кликов по ссылке.
+
+    Таблица секционирована по дням (`bucket_start`), старые секции удаляются
+    целиком, без массовых UPDATE/DELETE.
+
+    Attributes:
+        url_id (int): Идентификатор ссылки (URLPair).
+        bucket_start (datetime): Начало минуты (UTC).
+        clicks (int): Количество кликов за минуту.
+
+    """
+
+    __table_args__ = {"postgresql_partition_by": "RANGE (bucket_start)"}
+
+    url_id: Mapped[int] = mapped_column(
+        ForeignKey("urlpair.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    bucket_start: Mapped[dt.datetime] = mapped_column(
+        DateTime(timezone=True),
+        primary_key=True,
+    )
+    clicks: Mapped[int] = mapped_column(default=0, nullable=False)
+
+
+class ClickHour(Base):
+    """
+    Почасовой бакет кликов по ссылке (свёртка поминутных бакетов).
+
+    Attributes:
+        url_id (int): Идентификатор ссылки (URLPair).
+        bucket_start (datetime): Начало часа (UTC).
+        clicks (int): Количество кликов за час.
+
+    """
+
+    __table_args__ = {"postgresql_partition_by": "RANGE (bucket_start)"}
+
+    url_id: Mapped[int] = mapped_column(
+        ForeignKey("urlpair.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    bucket_start: Mapped[dt.datetime] = mapped_column(
+        DateTime(timezone=True),
+        primary_key=True,
+    )
+    clicks: Mapped[int] = mapped_column(default=0, nullable=False)
+
+
+class ClickEvent(Base):
+    """
+    Сырое событие перехода по ссылке.
+
+    Таблица секционирована по дням (`ts`) и пишется пачками через COPY.
+    Внешнего ключа на URLPair нет: журнал не должен замедлять удаление ссылок
+    и переживает их до истечения срока хранения секции.
+
+    Attributes:
+        id (int): Идентификатор события.
+        ts (datetime): Момент перехода (UTC).
+        url_id (int): Идентификатор ссылки (URLPair).
+        referrer (str | None): Заголовок Referer.
+        user_agent_hash (int | None): 64-битный хэш заголовка User-Agent.
+        ip_prefix (IPv4Network | IPv6Network | None): Сеть клиента
+            (/24 для IPv4, /48 для IPv6).
+
+    """
+
+    __table_args__ = (
+        Index("ix_clickevent_url_id_ts", "url_id", "ts"),
+        {"postgresql_partition_by": "RANGE (ts)"},
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    ts: Mapped[dt.datetime] = mapped_column(
+        DateTime(timezone=True),
+        primary_key=True,
+    )
+    url_id: Mapped[int] = mapped_column(nullable=False)
+    referrer: Mapped[str | None] = mapped_column(Text)
+    user_agent_hash: Mapped[int | None] = mapped_column(BigInteger)
+    ip_prefix: Mapped[ipaddress.IPv4Network | ipaddress.IPv6Network | None] = mapped_column(
+        CIDR
+    )
+
+
+class VisitorHour(Base):
+    """
+    Почасовой скетч HyperLogLog уникальных посетителей ссылки.
+
+    Скетчи разных часов и воркеров объединяются поразрядным максимумом,
+    поэтому уникальные за сутки считаются без хранения самих посетителей.
+    Таблица секционирована по дням, как и бакеты кликов.
+
+    Attributes:
+        url_id (int): Идентификатор ссылки (URLPair).
+        bucket_start (datetime): Начало часа (UTC).
+        sketch (bytes): Регистры скетча.
+        updated_at (datetime): Момент последнего обновления скетча.
+
+    """
+
+    __table_args__ = {"postgresql_partition_by": "RANGE (bucket_start)"}
+
+    url_id: Mapped[int] = mapped_column(
+        ForeignKey("urlpair.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    bucket_start: Mapped[dt.datetime] = mapped_column(
+        DateTime(timezone=True),
+        primary_key=True,
+    )
+    sketch: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    updated_at: Mapped[dt.datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        index=True,
+    )
@@ -0,0 +1,44 @@
+import datetime as dt
+
+from sqlalchemy import (
+    DateTime,
+    String,
+    Text,
+)
+from sqlalchemy.orm import (
+    Mapped,
+    mapped_column,
+)
+
+from app.core import Base
+
+
+class JobLease(Base):
+    """
+    Аренда плановой задачи и метрики её последних запусков.
+
+    Задачу выполняет только экземпляр, владеющий неистёкшей арендой, и
+    только когда с `last_started_at` прошёл её период. Аренда короткая,
+    поэтому после падения владельца очередной запуск забирает любой
+    другой экземпляр.
+
+    Attributes:
+        job_id (str): Идентификатор задачи.
+        owner (str): Экземпляр приложения, владеющий арендой.
+        lease_until (datetime): Момент истечения аренды.
+        last_started_at (datetime | None): Начало последнего запуска.
+        last_success_at (datetime | None): Окончание последнего успешного запуска.
+        last_duration (float | None): Длительность последнего запуска в секундах.
+        last_rows (int | None): Количество строк, обработанных последним запуском.
+        last_error (str | None): Ошибка последнего запуска, если он упал.
+
+    """
+
+    job_id: Mapped[str] = mapped_column(String(255), primary_key=True)
+    owner: Mapped[str] = mapped_column(String(255), nullable=False)
+    lease_until: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_started_at: Mapped[dt.datetime | None] = mapped_column(DateTime(timezone=True))
+    last_success_at: Mapped[dt.datetime | None] = mapped_column(DateTime(timezone=True))
+    last_duration: Mapped[float | None]
+    last_rows: Mapped[int | None]
+    last_error: Mapped[str | None] = mapped_column(Text)
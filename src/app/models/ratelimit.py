@@ -0,0 +1,33 @@
+import datetime as dt
+
+from sqlalchemy import (
+    DateTime,
+    String,
+)
+from sqlalchemy.orm import (
+    Mapped,
+    mapped_column,
+)
+
+from app.const import RATE_LIMIT_KEY_MAX_LEN
+from app.core import Base
+
+
+class RateLimitBucket(Base):
+    """
+    Общее для всех экземпляров состояние ограничителя частоты запросов.
+
+    Attributes:
+        key (str): Ключ ограничения (например, "login:email:user@mail.ru").
+        tokens (float): Количество жетонов в корзине на момент `updated_at`.
+        updated_at (datetime): Момент последнего обновления корзины.
+
+    """
+
+    key: Mapped[str] = mapped_column(String(RATE_LIMIT_KEY_MAX_LEN), primary_key=True)
+    tokens: Mapped[float] = mapped_column(nullable=False)
+    updated_at: Mapped[dt.datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        index=True,
+    )
@@ -1,9 +1,14 @@
 import datetime as dt
+import hashlib
 
 from sqlalchemy import (
+    BigInteger,
     DateTime,
     ForeignKey,
+    Index,
+    Sequence,
     String,
+    func,
 )
 from sqlalchemy.orm import (
     Mapped,
@@ -14,6 +19,41 @@ from sqlalchemy.orm import (
 from app.core import Base
 
 
+short_code_seq = Sequence("short_code_seq", metadata=Base.metadata)
+
+
+def default_expires_at() -> dt.datetime:
+    """
+    Возвращает момент истечения срока действия для новой ссылки.
+
+    Returns:
+        datetime: Текущее время UTC плюс время жизни ссылки.
+
+    """
+
+    return dt.datetime.now(dt.timezone.utc) + dt.timedelta(seconds=30) # days=1
+
+
+def original_url_hash(original_url: str) -> int:
+    """
+    Считает 64-битный хэш оригинальной ссылки для поиска дубликатов.
+
+    Совпадает с `('x' || substr(md5(original_url), 1, 16))::bit(64)::bigint`
+    в PostgreSQL, поэтому существующие строки можно заполнить SQL'ем.
+
+    Args:
+        original_url (str): Нормализованная оригинальная ссылка.
+
+    Returns:
+        int: Первые 8 байт md5 как знаковое целое.
+
+    """
+
+    digest = hashlib.md5(original_url.encode(), usedforsecurity=False).digest()
+
+    return int.from_bytes(digest[:8], "big", signed=True)
+
+
 class URLPair(Base):
     """
     Модель укороченной ссылки.
@@ -23,18 +63,40 @@ class URLPair(Base):
         original_url (str): Оригинальный (длинный) URL.
         is_activated (bool): Флаг активности ссылки (может ли она перенаправлять).
         is_old (bool): Флаг старой ссылки (для автоудаления или архивирования).
+        original_url_hash (int): Хэш оригинального URL для поиска дубликатов.
+        created_at (datetime): Начало транзакции, создавшей ссылку.
         clickstats (ClickStat): Статистика кликов по данной ссылке (one-to-one).
 
     """
 
+    __table_args__ = (
+        Index(
+            "ix_urlpair_original_url_hash",
+            "original_url_hash",
+            postgresql_where="is_activated",
+        ),
+        Index(
+            "ix_urlpair_expires_at",
+            "expires_at",
+            postgresql_where="is_activated",
+        ),
+        Index("ix_urlpair_created_at", "created_at"),
+    )
+
     id: Mapped[int] = mapped_column(primary_key=True)
     short_url: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
     original_url: Mapped[str] = mapped_column(nullable=False)
+    original_url_hash: Mapped[int | None] = mapped_column(BigInteger)
     is_activated: Mapped[bool] = mapped_column(default=True, nullable=False)
     is_old: Mapped[bool] = mapped_column(default=False, nullable=False)
     expires_at: Mapped[dt.datetime] = mapped_column(
         DateTime(timezone=True),
-        default=lambda: dt.datetime.now(dt.timezone.utc) + dt.timedelta(seconds=30), # days=1
+        default=default_expires_at,
+        nullable=False,
+    )
+    created_at: Mapped[dt.datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
         nullable=False,
     )
 
@@ -42,7 +104,8 @@ class URLPair(Base):
         back_populates="url",
         uselist=False,
         cascade="all",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise",
     )
 
 
@@ -54,6 +117,8 @@ class URLPairStat(Base):
         id (int): Первичный ключ.
         last_hour_clicks (int): Кол-во кликов за последний час.
         last_day_clicks (int): Кол-во кликов за последние сутки.
+        unique_last_hour (int): Оценка уникальных посетителей за текущий час.
+        unique_last_day (int): Оценка уникальных посетителей за последние сутки.
         url (URL): Обратная связь на модель URL.
 
     """
@@ -66,9 +131,23 @@ class URLPairStat(Base):
     )
     last_hour_clicks: Mapped[int] = mapped_column(default=0, nullable=False)
     last_day_clicks: Mapped[int] = mapped_column(default=0, nullable=False)
+    unique_last_hour: Mapped[int] = mapped_column(default=0, server_default="0", nullable=False)
+    unique_last_day: Mapped[int] = mapped_column(default=0, server_default="0", nullable=False)
 
     url: Mapped["URLPair"] = relationship(
         back_populates="stats",
         uselist=False,
-        lazy="selectin",
+        lazy="raise",
     )
+
+
+Index(
+    "ix_urlpairstat_last_hour_clicks_url_id",
+    URLPairStat.last_hour_clicks.desc(),
+    URLPairStat.url_id,
+)
+Index(
+    "ix_urlpairstat_last_day_clicks_url_id",
+    URLPairStat.last_day_clicks.desc(),
+    URLPairStat.url_id,
+)
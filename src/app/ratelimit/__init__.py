@@ -0,0 +1,21 @@
+from .dependency import (
+    api_rate_limit,
+    rate_limit,
+)
+from .gcra import MemoryGCRA
+from .limiter import (
+    Limit,
+    check_login_rate,
+    take,
+    too_many_requests,
+)
+
+__all__ = (
+    "MemoryGCRA",
+    "Limit",
+    "take",
+    "too_many_requests",
+    "check_login_rate",
+    "rate_limit",
+    "api_rate_limit",
+)
@@ -0,0 +1,173 @@
+from typing import (
+    Awaitable,
+    Callable,
+)
+
+from fastapi import Request
+from jose import JWTError
+
+from app.auth.security import decode_token_subject
+from app.core import settings
+from app.core.settings import RouteRateLimit
+from app.ratelimit.limiter import (
+    Limit,
+    take,
+    too_many_requests,
+)
+
+
+DEFAULT_ROUTE_LIMIT = RouteRateLimit()
+
+
+def _token_subject(request: Request) -> str | None:
+    """
+    Возвращает email из Bearer-токена запроса, если токен действителен.
+
+    Args:
+        request (Request): Входящий запрос.
+
+    Returns:
+        str | None: Email пользователя; None, если токена нет или он недействителен.
+
+    """
+
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+
+    if scheme.lower() != "bearer" or not token:
+        return None
+
+    try:
+        return decode_token_subject(token)
+
+    except JWTError:
+        return None
+
+
+async def _check_rate(
+    request: Request,
+    scope: str,
+    limit: Limit,
+    user_limit: Limit | None,
+    cost: float,
+) -> None:
+    """
+    Расходует лимит клиента и отклоняет запрос, если лимит исчерпан.
+
+    Аутентифицированный клиент ограничивается по email с лимитом
+    `user_limit`, остальные — по адресу с лимитом `limit`.
+
+    Args:
+        request (Request): Входящий запрос.
+        scope (str): Имя ограничения, входит в ключ.
+        limit (Limit): Лимит для клиента без токена.
+        user_limit (Limit | None): Лимит для аутентифицированного
+            пользователя; если не задан, все клиенты ограничиваются по адресу.
+        cost (float): Сколько запросов лимита расходует запрос.
+
+    Raises:
+        HTTPException: 429 - Если лимит исчерпан.
+
+    """
+
+    email = _token_subject(request) if user_limit is not None else None
+
+    if email is not None and user_limit is not None:
+        key, client_limit = f"{scope}:user:{email}", user_limit
+
+    else:
+        ip = request.client.host if request.client else "unknown"
+        key, client_limit = f"{scope}:ip:{ip}", limit
+
+    retry_after = await take(key, client_limit, cost)
+
+    if retry_after > 0:
+        raise too_many_requests(retry_after)
+
+
+def rate_limit(
+    scope: str,
+    limit: Limit,
+    user_limit: Limit | None = None,
+    cost: float = 1,
+) -> Callable[[Request], Awaitable[None]]:
+    """
+    Создаёт зависимость, ограничивающую частоту запросов.
+
+    Аутентифицированный клиент ограничивается по email с лимитом
+    `user_limit`, остальные — по адресу с лимитом `limit`. Счётчики
+    разных `scope` независимы.
+
+    Args:
+        scope (str): Имя ограничения, входит в ключ.
+        limit (Limit): Лимит для клиента без токена.
+        user_limit (Limit | None): Лимит для аутентифицированного
+            пользователя; если не задан, все клиенты ограничиваются по адресу.
+        cost (float): Сколько запросов лимита расходует один запрос;
+            не должен превышать ёмкость лимитов.
+
+    Returns:
+        Callable[[Request], Awaitable[None]]: Зависимость FastAPI.
+
+    """
+
+    async def dependency(request: Request) -> None:
+        """
+        Проверяет лимит частоты запросов клиента.
+
+        Raises:
+            HTTPException: 429 - Если лимит исчерпан.
+
+        """
+
+        if not settings.rate_limit_enabled:
+            return
+
+        await _check_rate(request, scope, limit, user_limit, cost)
+
+    return dependency
+
+
+async def api_rate_limit(request: Request) -> None:
+    """
+    Ограничивает частоту запросов к маршруту API.
+
+    Подключается к роутеру целиком: маршрут определяется по имени
+    функции эндпоинта, и у каждого маршрута свой счётчик, поэтому частые дешёвые
+    запросы не расходуют лимит дорогих, и наоборот. Лимиты маршрута
+    берутся из `api_route_limits`, незаданные — из общих лимитов API.
+
+    Args:
+        request (Request): Входящий запрос.
+
+    Raises:
+        HTTPException: 429 - Если лимит исчерпан.
+
+    """
+
+    if not settings.rate_limit_enabled:
+        return
+
+    endpoint = getattr(request.scope.get("route"), "endpoint", None)
+    route = getattr(endpoint, "__name__", request.url.path)
+    limits = settings.api_route_limits.get(route, DEFAULT_ROUTE_LIMIT)
+
+    if not limits.enabled:
+        return
+
+    await _check_rate(
+        request,
+        f"api:{route}",
+        Limit(
+            settings.api_rate_burst if limits.burst is None else limits.burst,
+            settings.api_rate_per_minute if limits.per_minute is None else limits.per_minute,
+        ),
+        Limit(
+            settings.api_user_rate_burst if limits.user_burst is None else limits.user_burst,
+            (
+                settings.api_user_rate_per_minute
+                if limits.user_per_minute is None
+                else limits.user_per_minute
+            ),
+        ),
+        limits.cost,
+    )
@@ -0,0 +1,58 @@
+import time
+from collections import OrderedDict
+
+
+class MemoryGCRA:
+    """
+    Ограничитель частоты по алгоритму GCRA в памяти процесса.
+
+    Для каждого ключа хранится одно число — теоретическое время прибытия
+    (TAT) следующего запроса. Запрос разрешён, если он пришёл не раньше
+    `TAT - capacity / rate`; поведение совпадает с корзиной жетонов той
+    же ёмкости и скорости. Проверка выполняется за O(1). При
+    переполнении вытесняются давно не использованные ключи: вытесненный
+    ключ считается новым, поэтому таблица не растёт под потоком
+    случайных ключей.
+
+    Attributes:
+        maxsize (int): Максимальное количество ключей.
+
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._tat: OrderedDict[str, float] = OrderedDict()
+
+    def take(self, key: str, capacity: float, rate: float, cost: float = 1) -> float:
+        """
+        Учитывает запрос, если он укладывается в лимит.
+
+        Args:
+            key (str): Ключ ограничения.
+            capacity (float): Допустимый всплеск запросов.
+            rate (float): Скорость восстановления в запросах в секунду.
+            cost (float): Сколько запросов лимита расходует этот запрос.
+
+        Returns:
+            float: 0, если запрос разрешён, иначе через сколько секунд повторить.
+
+        """
+
+        now = time.monotonic()
+        interval = 1 / rate
+        tat = max(self._tat.get(key, now), now)
+        allow_at = tat + cost * interval - capacity * interval
+
+        if now < allow_at:
+            return allow_at - now
+
+        self._tat[key] = tat + cost * interval
+        self._tat.move_to_end(key)
+
+        if len(self._tat) > self.maxsize:
+            self._tat.popitem(last=False)
+
+        return 0.0
+
+    def __len__(self) -> int:
+        return len(self._tat)
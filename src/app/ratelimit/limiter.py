@@ -0,0 +1,128 @@
+import math
+from typing import NamedTuple
+
+from fastapi import (
+    HTTPException,
+    status,
+)
+from loguru import logger
+
+from app.const import RATE_LIMIT_KEY_MAX_LEN
+from app.core import (
+    AsyncSessionLocal,
+    settings,
+)
+from app.dao import RateLimitRepository
+from app.ratelimit.gcra import MemoryGCRA
+
+
+class Limit(NamedTuple):
+    """
+    Параметры ограничения частоты запросов.
+
+    Attributes:
+        capacity (float): Допустимый всплеск запросов.
+        per_minute (float): Скорость пополнения в запросах в минуту.
+
+    """
+
+    capacity: float
+    per_minute: float
+
+    @property
+    def rate(self) -> float:
+        """Скорость пополнения в жетонах в секунду."""
+
+        return self.per_minute / 60
+
+
+memory_limiter = MemoryGCRA(maxsize=settings.rate_limit_table_size)
+
+
+async def take(key: str, limit: Limit, cost: float = 1) -> float:
+    """
+    Учитывает запрос в выбранном в настройках хранилище.
+
+    По умолчанию лимит считается в памяти процесса (GCRA). При
+    `rate_limit_backend="postgres"` используются корзины жетонов, общие
+    для всех экземпляров; если БД недоступна, используется память процесса.
+
+    Args:
+        key (str): Ключ ограничения.
+        limit (Limit): Параметры лимита.
+        cost (float): Сколько запросов лимита расходует этот запрос.
+
+    Returns:
+        float: 0, если запрос разрешён, иначе через сколько секунд повторить.
+
+    """
+
+    key = key[:RATE_LIMIT_KEY_MAX_LEN]
+
+    if settings.rate_limit_backend == "postgres":
+        try:
+            async with AsyncSessionLocal() as session:
+                return await RateLimitRepository.take(
+                    key,
+                    limit.capacity,
+                    limit.rate,
+                    session,
+                    cost=cost,
+                )
+
+        except Exception:
+            logger.exception("Ошибка общего ограничителя частоты, используем локальный")
+
+    return memory_limiter.take(key, limit.capacity, limit.rate, cost)
+
+
+def too_many_requests(retry_after: float) -> HTTPException:
+    """
+    Собирает ответ 429 с заголовком Retry-After.
+
+    Args:
+        retry_after (float): Через сколько секунд можно повторить запрос.
+
+    Returns:
+        HTTPException: Исключение 429.
+
+    """
+
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Слишком много запросов, повторите позже",
+        headers={"Retry-After": str(max(math.ceil(retry_after), 1))},
+    )
+
+
+async def check_login_rate(email: str, ip: str | None) -> None:
+    """
+    Ограничивает частоту попыток входа по email и по адресу клиента.
+
+    Вызывается до поиска пользователя и проверки пароля, поэтому
+    отклонённая попытка не стоит ни запроса к БД пользователей, ни bcrypt.
+
+    Args:
+        email (str): Email из формы входа.
+        ip (str | None): Адрес клиента.
+
+    Raises:
+        HTTPException: 429 - Если исчерпан лимит попыток для email или адреса.
+
+    """
+
+    checks = [
+        (f"login:email:{email.lower()}", Limit(settings.login_email_burst, settings.login_email_per_minute)),
+    ]
+
+    if ip:
+        checks.append(
+            (f"login:ip:{ip}", Limit(settings.login_ip_burst, settings.login_ip_per_minute))
+        )
+
+    for key, limit in checks:
+        retry_after = await take(key, limit)
+
+        if retry_after > 0:
+            logger.warning(f"Превышен лимит попыток входа: {key}")
+            raise too_many_requests(retry_after)
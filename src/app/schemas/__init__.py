@@ -1,9 +1,22 @@
 from .auth import RegisterRequest, TokenResponse
-from .url import URLRequest, URLResponse
+from .url import (
+    URLBatchItem,
+    URLBatchResult,
+    URLPage,
+    URLRequest,
+    ShortCodeFilterResponse,
+    TopLinkResponse,
+    URLResponse,
+)
 
 __all__ = (
     "TokenResponse",
     "RegisterRequest",
     "URLResponse",
     "URLRequest",
+    "URLBatchItem",
+    "URLBatchResult",
+    "URLPage",
+    "TopLinkResponse",
+    "ShortCodeFilterResponse",
 )
@@ -1,6 +1,9 @@
+from typing import Any
+
 from pydantic import (
     BaseModel,
     HttpUrl,
+    model_validator,
 )
 
 
@@ -16,6 +19,21 @@ class URLRequest(BaseModel):
     url: HttpUrl
 
 
+class URLBatchItem(BaseModel):
+    """
+    Элемент запроса на пакетное сокращение ссылок.
+
+    URL проверяется отдельно для каждого элемента, чтобы одна невалидная
+    ссылка не отклоняла всю пачку.
+
+    Attributes:
+        url (str): Исходная ссылка, которую необходимо сократить.
+
+    """
+
+    url: str
+
+
 class ClickStatResponse(BaseModel):
     """
     Схема ответа с данными о переходах по ссылке.
@@ -23,11 +41,15 @@ class ClickStatResponse(BaseModel):
     Attributes:
         last_hour_clicks (int): Количество переходов по ссылке за последний час.
         last_day_clicks (int): Количество переходов по ссылке за последние 24 часа.
+        unique_last_hour (int): Оценка уникальных посетителей за текущий час.
+        unique_last_day (int): Оценка уникальных посетителей за последние 24 часа.
 
     """
 
     last_hour_clicks: int
     last_day_clicks: int
+    unique_last_hour: int = 0
+    unique_last_day: int = 0
 
     class Config:
         from_attributes = True
@@ -56,3 +78,95 @@ class URLResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+    @model_validator(mode="before")
+    @classmethod
+    def nest_stats(cls, data: Any) -> Any:
+        """
+        Позволяет строить ответ из плоской строки запроса (Row, namedtuple),
+        в которой счётчики кликов лежат рядом с полями ссылки.
+
+        """
+
+        if hasattr(data, "_asdict"):
+            data = data._asdict()
+
+        if isinstance(data, dict) and "stats" not in data:
+            data = {**data, "stats": data}
+
+        return data
+
+
+class URLBatchResult(BaseModel):
+    """
+    Результат сокращения одной ссылки из пачки.
+
+    Attributes:
+        index (int): Позиция ссылки в запросе.
+        result (URLResponse | None): Сокращённая ссылка, если её удалось создать.
+        error (str | None): Описание ошибки, если ссылка невалидна.
+
+    """
+
+    index: int
+    result: URLResponse | None = None
+    error: str | None = None
+
+
+class URLPage(BaseModel):
+    """
+    Страница списка сокращённых ссылок.
+
+    Attributes:
+        items (list[URLResponse]): Ссылки на странице.
+        next_cursor (str | None): Курсор следующей страницы или None,
+            если страница последняя.
+
+    """
+
+    items: list[URLResponse]
+    next_cursor: str | None = None
+
+
+class TopLinkResponse(BaseModel):
+    """
+    Схема элемента рейтинга самых популярных ссылок.
+
+    Attributes:
+        short_url (str): Сокращённая ссылка.
+        clicks (int): Оценка количества переходов за окно (сверху).
+        error (int): Максимальное завышение оценки.
+
+    """
+
+    short_url: str
+    clicks: int
+    error: int
+
+
+class ShortCodeFilterResponse(BaseModel):
+    """
+    Схема метрик фильтра существующих коротких ссылок.
+
+    Attributes:
+        ready (bool): Фильтр загружен и используется.
+        capacity (int): Расчётная ёмкость фильтра.
+        estimated_codes (int): Оценка количества кодов в фильтре.
+        size_bytes (int): Память под битовый массив.
+        hash_count (int): Количество хэш-функций.
+        false_positive_rate (float): Оценка текущей доли ложных срабатываний.
+        missing_cached (int): Количество кодов в кэше недавних 404.
+        rejected (int): Количество запросов, отвеченных 404 без БД.
+        syncs (int): Количество догрузок кодов других экземпляров.
+
+    """
+
+    ready: bool
+    capacity: int
+    estimated_codes: int
+    size_bytes: int
+    hash_count: int
+    false_positive_rate: float
+    missing_cached: int
+    rejected: int
+    syncs: int
@@ -1,11 +1,16 @@
-from .add_pair import add_pair
+from .add_pair import add_pair, add_pairs
 from .deactivate import deactivate_url
 from .generate import gen_short_path
+from .pagination import cursor_sort, decode_cursor, encode_cursor
 from .redirect import redirect
 
 __all__ = (
     "gen_short_path",
     "add_pair",
+    "add_pairs",
     "redirect",
     "deactivate_url",
+    "encode_cursor",
+    "decode_cursor",
+    "cursor_sort",
 )
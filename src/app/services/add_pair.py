@@ -6,60 +6,198 @@ from loguru import logger
 from pydantic import HttpUrl
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dao import URLRepository
-from app.models import URLPair
+from app.const import MAX_TRY_TO_GEN_SHORT_URL
+from app.core import settings
+from app.dao import (
+    URLRepository,
+    URLStatsRow,
+)
+from app.services.generate import (
+    gen_short_path,
+    gen_short_paths,
+)
+from app.tasks import short_codes
 
 
 async def add_pair(
     original_url: HttpUrl,
-    short_url: str,
     session: AsyncSession,
-) -> URLPair:
+) -> URLStatsRow:
     """
     Добавляет новую пару короткой и оригинальной ссылок в базу данных.
 
+    Короткая ссылка не проверяется заранее: вставка отклоняется самой БД
+    при конфликте по short_url, и только тогда генерируется новый код.
+    Если включена дедупликация, для уже сокращённого действующего URL
+    возвращается существующая пара.
+
     Args:
         original_url (HttpUrl): Исходная (полная) URL-ссылка, которую нужно сократить.
-        short_url (str): Сгенерированная короткая ссылка (идентификатор).
         session (AsyncSession): Сессия для работы с БД.
 
     Returns:
-        URLPair: Объект модели URL, добавленный в базу данных.
+        Row: Добавленная (или найденная) пара со статистикой переходов.
 
     Raises:
-        HTTPException: 409 - Если короткая ссылка уже существует.
         HTTPException: 500 - При внутренней ошибке базы данных.
+        TimeoutError: Если не удалось подобрать свободную короткую ссылку.
 
     """
 
     logger.info("Добавляем новую пару")
 
-    try:
-        exist = await URLRepository.get_by_short_url(short_url, session)
+    if settings.url_dedup_enabled:
+        existing = await find_existing([original_url], session)
 
-    except Exception:
-        logger.critical("Ошибка проверки на существование короткой ссылки")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Ошибка проверки на существование короткой ссылки",
-        )
+        if existing:
+            logger.info("Ссылка уже сокращена, возвращаем существующую пару")
+            return existing[str(original_url)]
 
-    if exist:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=f"Short URL '{short_url}' уже существует",
-        )
+    for _ in range(MAX_TRY_TO_GEN_SHORT_URL):
+        short_url = await gen_short_path(session)
+
+        try:
+            ret = await URLRepository.add_url_pair(original_url, short_url, session)
+
+        except Exception:
+            logger.critical("Ошибка при добавлении пары")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Ошибка при добавлении ссылки",
+            )
+
+        if ret is not None:
+            short_codes.add(short_url)
+            logger.success("Добавлена новая пара")
+            return ret
+
+        logger.info(f"Short URL '{short_url}' уже существует, генерируем новый")
+
+    logger.warning("Превышено количество попыток генерации короткого url.")
+    raise TimeoutError("Превышено количество попыток генерации короткого url.")
+
+
+async def add_pairs(
+    original_urls: list[HttpUrl],
+    session: AsyncSession,
+) -> list[URLStatsRow]:
+    """
+    Добавляет пачку ссылок в одной транзакции.
+
+    Коды выделяются сразу на всю пачку, пары вставляются многострочными
+    INSERT'ами, а для отклонённых из-за конфликта short_url пар коды
+    генерируются заново. При включённой дедупликации повторяющиеся и уже
+    сокращённые URL получают существующую пару.
+
+    Args:
+        original_urls (list[HttpUrl]): Исходные ссылки.
+        session (AsyncSession): Сессия для работы с БД.
+
+    Returns:
+        list[Row]: Добавленные пары в порядке исходных ссылок.
+
+    Raises:
+        HTTPException: 500 - При внутренней ошибке базы данных.
+        TimeoutError: Если не удалось подобрать свободные короткие ссылки.
+
+    """
+
+    logger.info(f"Добавляем пачку из {len(original_urls)} пар")
+
+    results: dict[int, URLStatsRow] = {}
+    pending = list(range(len(original_urls)))
+    first_index: dict[str, int] = {}
+
+    if settings.url_dedup_enabled:
+        existing = await find_existing(original_urls, session)
+        pending = []
+
+        for index, original_url in enumerate(map(str, original_urls)):
+            if original_url in existing:
+                results[index] = existing[original_url]
+            elif original_url in first_index:
+                continue
+            else:
+                first_index[original_url] = index
+                pending.append(index)
+
+    for _ in range(MAX_TRY_TO_GEN_SHORT_URL):
+        if not pending:
+            break
+
+        short_urls = await gen_short_paths(len(pending), session)
+        pairs = [
+            (str(original_urls[index]), short_url)
+            for index, short_url in zip(pending, short_urls)
+        ]
+
+        try:
+            rows = await URLRepository.add_url_pairs(pairs, session)
+
+        except Exception:
+            logger.critical("Ошибка при добавлении пачки пар")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Ошибка при добавлении ссылок",
+            )
+
+        inserted = {row.short_url: row for row in rows}
+        rejected = []
+
+        for index, short_url in zip(pending, short_urls):
+            if short_url in inserted:
+                results[index] = inserted[short_url]
+            else:
+                rejected.append(index)
+
+        pending = rejected
+
+    if pending:
+        await session.rollback()
+        logger.warning("Превышено количество попыток генерации короткого url.")
+        raise TimeoutError("Превышено количество попыток генерации короткого url.")
+
+    await session.commit()
+
+    short_codes.add(*(row.short_url for row in results.values()))
+
+    logger.success(f"Добавлено пар: {len(results)}")
+
+    for index, original_url in enumerate(map(str, original_urls)):
+        if index not in results:
+            results[index] = results[first_index[original_url]]
+
+    return [results[index] for index in range(len(original_urls))]
+
+
+async def find_existing(
+    original_urls: list[HttpUrl],
+    session: AsyncSession,
+) -> dict[str, URLStatsRow]:
+    """
+    Ищет уже сокращённые действующие ссылки для дедупликации.
+
+    Args:
+        original_urls (list[HttpUrl]): Исходные ссылки.
+        session (AsyncSession): Сессия для работы с БД.
+
+    Returns:
+        dict[str, Row]: Существующие пары по строке оригинального URL.
+
+    Raises:
+        HTTPException: 500 - При внутренней ошибке базы данных.
+
+    """
 
     try:
-        ret = await URLRepository.add_url_pair(original_url, short_url, session)
+        return await URLRepository.get_active_by_original_urls(
+            [str(url) for url in original_urls],
+            session,
+        )
 
     except Exception:
-        logger.critical("Ошибка при добавлении пары")
+        logger.critical("Ошибка поиска существующей ссылки")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Ошибка при добавлении ссылки",
+            detail="Ошибка поиска существующей ссылки",
         )
-
-    logger.success("Добавлена новая пара")
-
-    return ret
@@ -8,6 +8,7 @@ from loguru import logger
 from pydantic import HttpUrl
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache import invalidate_redirect
 from app.dao import URLRepository
 
 
@@ -50,4 +51,6 @@ async def deactivate_url(
 
     await URLRepository.deactivate_link(short_path, session)
 
+    invalidate_redirect(short_path)
+
     logger.success("Ссылка деактивирована")
@@ -1,5 +1,8 @@
-import random
-import string
+import asyncio
+import hashlib
+import secrets
+from collections import deque
+from typing import Protocol
 
 from fastapi import (
     HTTPException,
@@ -9,57 +12,239 @@ from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.const import (
-    MAX_TRY_TO_GEN_SHORT_URL,
+    SHORT_CODE_FEISTEL_ROUNDS,
+    SHORT_LINK_ALPHABET,
     SHORT_LINK_LEN,
 )
+from app.core import settings
 from app.dao import URLRepository
 
 
+def encode_base62(number: int, length: int = SHORT_LINK_LEN) -> str:
+    """
+    Кодирует число в строку алфавита коротких ссылок фиксированной длины.
+
+    Args:
+        number (int): Неотрицательное число меньше 62 ** length.
+        length (int): Длина результата.
+
+    Returns:
+        str: Закодированное число, дополненное слева первым символом алфавита.
+
+    """
+
+    base = len(SHORT_LINK_ALPHABET)
+    chars = []
+
+    for _ in range(length):
+        number, rem = divmod(number, base)
+        chars.append(SHORT_LINK_ALPHABET[rem])
+
+    return "".join(reversed(chars))
+
+
+class ShortCodeAllocator(Protocol):
+    """Способ выделения коротких кодов."""
+
+    async def allocate(self, session: AsyncSession) -> str: ...
+
+    async def allocate_many(self, count: int, session: AsyncSession) -> list[str]: ...
+
+
+class RandomCodeAllocator:
+    """
+    Случайные коды заданной длины; символы могут повторяться.
+
+    Коды могут совпасть с уже выданными; такая вставка отклоняется БД
+    и код генерируется заново.
+
+    """
+
+    def __init__(self, length: int = SHORT_LINK_LEN) -> None:
+        self.length = length
+
+    async def allocate(self, session: AsyncSession) -> str:
+        return "".join(secrets.choice(SHORT_LINK_ALPHABET) for _ in range(self.length))
+
+    async def allocate_many(self, count: int, session: AsyncSession) -> list[str]:
+        codes: set[str] = set()
+
+        while len(codes) < count:
+            codes.add(await self.allocate(session))
+
+        return list(codes)
+
+
+class SequenceCodeAllocator:
+    """
+    Коды из последовательности БД, переставленные сетью Фейстеля.
+
+    Воркер резервирует номера блоками, поэтому обращение к БД нужно один раз
+    на `block_size` кодов. Номер биективно отображается в пространство
+    62 ** length ключевой сетью Фейстеля (с cycle-walking'ом), так что
+    соседние коды не угадываются, а совпадения исключены.
+
+    """
+
+    def __init__(
+        self,
+        block_size: int,
+        key: str,
+        length: int = SHORT_LINK_LEN,
+        rounds: int = SHORT_CODE_FEISTEL_ROUNDS,
+    ) -> None:
+        self.block_size = block_size
+        self.length = length
+        self.rounds = rounds
+        self._key = hashlib.blake2b(key.encode(), digest_size=32).digest()
+        self._domain: int = len(SHORT_LINK_ALPHABET) ** length
+        self._half_bits: int = ((self._domain - 1).bit_length() + 1) // 2
+        self._half_mask: int = (1 << self._half_bits) - 1
+        self._ids: deque[int] = deque()
+        self._lock = asyncio.Lock()
+
+    def _round(self, value: int, round_no: int) -> int:
+        digest = hashlib.blake2b(
+            value.to_bytes(8, "big"),
+            digest_size=8,
+            key=self._key,
+            salt=round_no.to_bytes(16, "big"),
+        ).digest()
+
+        return int.from_bytes(digest, "big") & self._half_mask
+
+    def _feistel(self, value: int) -> int:
+        left, right = value >> self._half_bits, value & self._half_mask
+
+        for round_no in range(self.rounds):
+            left, right = right, left ^ self._round(right, round_no)
+
+        return (left << self._half_bits) | right
+
+    def permute(self, number: int) -> int:
+        """
+        Биективно переставляет число внутри пространства кодов.
+
+        Args:
+            number (int): Номер из последовательности.
+
+        Returns:
+            int: Переставленный номер в диапазоне [0, 62 ** length).
+
+        """
+
+        if not 0 <= number < self._domain:
+            raise ValueError("Исчерпано пространство коротких кодов")
+
+        number = self._feistel(number)
+
+        while number >= self._domain:
+            number = self._feistel(number)
+
+        return number
+
+    async def allocate(self, session: AsyncSession) -> str:
+        return (await self.allocate_many(1, session))[0]
+
+    async def allocate_many(self, count: int, session: AsyncSession) -> list[str]:
+        async with self._lock:
+            if len(self._ids) < count:
+                self._ids.extend(
+                    await URLRepository.reserve_code_ids(
+                        max(self.block_size, count - len(self._ids)),
+                        session,
+                    )
+                )
+                logger.info(f"Зарезервировано номеров: {len(self._ids)}")
+
+            numbers = [self._ids.popleft() for _ in range(count)]
+
+        return [encode_base62(self.permute(number), self.length) for number in numbers]
+
+
+def get_allocator() -> ShortCodeAllocator:
+    """
+    Возвращает аллокатор коротких кодов, выбранный в настройках.
+
+    Returns:
+        ShortCodeAllocator: Аллокатор для режима `settings.short_code_mode`.
+
+    """
+
+    return ALLOCATORS[settings.short_code_mode]
+
+
+ALLOCATORS: dict[str, ShortCodeAllocator] = {
+    "random": RandomCodeAllocator(),
+    "sequence": SequenceCodeAllocator(
+        block_size=settings.short_code_block_size,
+        key=settings.short_code_key,
+    ),
+}
+
+
 async def gen_short_path(
     session: AsyncSession,
-    length=SHORT_LINK_LEN,
-) -> str | None:
+) -> str:
     """
-    Генерирует уникальный короткий идентификатор для сокращённой ссылки.
+    Генерирует короткий идентификатор для сокращённой ссылки.
+
+    Уникальность не проверяется запросом к БД: конфликт по short_url
+    обрабатывается при вставке пары.
 
     Args:
-        url_repo (URLRepository): Репозиторий для взаимодействия с таблицей URL'ов.
-        length (int, optional): Длина генерируемой строки. 
-            По умолчанию берётся значение из константы GENERATE_SHORT_LINK.
+        session (AsyncSession): Сессия для работы с БД.
 
     Raises:
-        HTTPException: 500 - Внутренняя ошибка при проверке существования короткой ссылки.
+        HTTPException: 500 - Внутренняя ошибка при выделении короткой ссылки.
 
     Returns:
-        str: Уникальный короткий идентификатор для сокращённой ссылки.
+        str: Короткий идентификатор для сокращённой ссылки.
 
     """
 
     logger.info("Начинаем генерировать short_path")
 
-    count = 0
+    try:
+        short_path = await get_allocator().allocate(session)
+
+    except Exception:
+        logger.critical("Ошибка генерации короткой ссылки")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Ошибка генерации короткой ссылки",
+        )
+
+    logger.success("short_path создан")
 
-    while True:
+    return short_path
 
-        characters = string.ascii_letters + string.digits
-        short_path = ''.join(random.sample(characters, length))
 
-        try:
-            exist = await URLRepository.get_by_short_url(short_path, session)
+async def gen_short_paths(
+    count: int,
+    session: AsyncSession,
+) -> list[str]:
+    """
+    Генерирует несколько различных коротких идентификаторов за раз.
 
-        except Exception:
-            logger.critical("Ошибка проверки на существование короткой ссылки")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Ошибка проверки на существование короткой ссылки",
-            )
+    Args:
+        count (int): Количество идентификаторов.
+        session (AsyncSession): Сессия для работы с БД.
+
+    Raises:
+        HTTPException: 500 - Внутренняя ошибка при выделении коротких ссылок.
+
+    Returns:
+        list[str]: Попарно различные короткие идентификаторы.
+
+    """
 
-        if not exist:
-            logger.success("short_path создан")
-            return short_path
-        
-        count += 1
+    try:
+        return await get_allocator().allocate_many(count, session)
 
-        if count > MAX_TRY_TO_GEN_SHORT_URL:
-            logger.warning("Превышено количество попыток генерации короткого url.")
-            raise TimeoutError("Превышено количество попыток генерации короткого url.")
+    except Exception:
+        logger.critical("Ошибка генерации коротких ссылок")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Ошибка генерации коротких ссылок",
+        )
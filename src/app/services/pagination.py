@@ -0,0 +1,94 @@
+import base64
+import binascii
+import json
+from typing import Literal
+
+from fastapi import (
+    HTTPException,
+    status,
+)
+
+
+CursorSort = Literal["id", "hour", "day"]
+
+
+def cursor_sort(sort_by_hour_clicks: bool, sort_by_day_clicks: bool) -> CursorSort:
+    """
+    Определяет сортировку списка по флагам запроса.
+
+    Args:
+        sort_by_hour_clicks (bool): Сортировка по кликам за час.
+        sort_by_day_clicks (bool): Сортировка по кликам за день.
+
+    Returns:
+        CursorSort: Ключ сортировки; клики за час приоритетнее кликов за день.
+
+    """
+
+    if sort_by_hour_clicks:
+        return "hour"
+
+    if sort_by_day_clicks:
+        return "day"
+
+    return "id"
+
+
+def encode_cursor(sort: CursorSort, sort_key: int, last_id: int) -> str:
+    """
+    Кодирует позицию в списке в непрозрачный курсор.
+
+    Args:
+        sort (CursorSort): Сортировка, для которой выдан курсор.
+        sort_key (int): Значение ключа сортировки последнего элемента страницы.
+        last_id (int): ID последнего элемента страницы.
+
+    Returns:
+        str: Курсор для запроса следующей страницы.
+
+    """
+
+    raw = json.dumps([sort, sort_key, last_id], separators=(",", ":")).encode()
+
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: CursorSort) -> tuple[int, int]:
+    """
+    Декодирует курсор, выданный `encode_cursor`.
+
+    Курсор действителен только для той сортировки, с которой он выдан:
+    позиция в списке по кликам за час ничего не значит для списка по ID.
+
+    Args:
+        cursor (str): Курсор из предыдущего ответа.
+        sort (CursorSort): Сортировка текущего запроса.
+
+    Raises:
+        HTTPException: 400 - Если курсор повреждён или выдан для другой сортировки.
+
+    Returns:
+        tuple[int, int]: Ключ сортировки и ID последнего элемента страницы.
+
+    """
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        issued_for, sort_key, last_id = json.loads(raw)
+
+        if type(sort_key) is not int or type(last_id) is not int:
+            raise ValueError
+
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Неверный курсор",
+        )
+
+    if issued_for != sort:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Курсор выдан для другой сортировки",
+        )
+
+    return sort_key, last_id
@@ -1,52 +1,137 @@
+import datetime as dt
+
 from fastapi import (
     HTTPException,
+    Request,
     status,
 )
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dao import URLRepository
-from app.models import URLPair
+from app.cache import (
+    RedirectEntry,
+    cache_redirect,
+    fingerprint_hash,
+    record_hit,
+    redirect_cache,
+)
+from app.core import (
+    AsyncSessionLocal,
+    engine,
+    read_engine,
+    settings,
+)
+from app.dao import (
+    ClickRepository,
+    URLRepository,
+)
+from app.tasks import (
+    click_buffer,
+    click_events,
+    short_codes,
+    visitor_buffer,
+)
+
+
+async def get_redirect_target(
+    short_url: str,
+    session: AsyncSession,
+) -> RedirectEntry | None:
+    """
+    Загружает данные для редиректа, при промахе на реплике читая основную БД.
+
+    Только что созданная ссылка может ещё не доехать до реплики, поэтому
+    отсутствие строки на реплике перепроверяется на основной БД.
+
+    Сессия берёт соединение из пула только при первом запросе и сразу после
+    чтения его возвращает, а не держит до отправки ответа.
+
+    Args:
+        short_url (str): Короткий идентификатор ссылки.
+        session (AsyncSession): Сессия чтения (реплика или основная БД).
+
+    Returns:
+        RedirectEntry | None: Данные для редиректа или None, если ссылки нет.
+
+    """
+
+    try:
+        row = await URLRepository.get_redirect_target(short_url, session)
+
+    finally:
+        await session.close()
+
+    if row is None and read_engine is not engine:
+        async with AsyncSessionLocal() as primary:
+            row = await URLRepository.get_redirect_target(short_url, primary)
+
+    return None if row is None else RedirectEntry._make(row)
 
 
 async def redirect(
     short_url: str,
     session: AsyncSession,
-) -> URLPair:
+    request: Request | None = None,
+) -> RedirectEntry:
     """
     Возвращает оригинальный URL по короткому идентификатору и увеличивает счётчик переходов.
 
+    Сначала ссылка ищется в in-process кэше редиректов, и только при промахе
+    выполняется запрос к БД, результат которого кладётся в кэш. Коды,
+    которых нет в фильтре коротких ссылок или которые недавно не нашлись
+    в БД, отвечаются 404 без запроса. Клики по
+    умолчанию копятся в буфере и записываются в БД фоновой задачей.
+    Переход также учитывается в in-process рейтинге популярных ссылок и,
+    по отпечатку (адрес и User-Agent), в скетче уникальных посетителей.
+    Если включён журнал событий, переход ставится в его очередь без ожидания.
+
     Args:
         short_url (str): Короткий идентификатор ссылки, по которому ищется оригинальный URL.
-        session (AsyncSession): Асинхронная сессия SQLAlchemy для выполнения операций с БД.
+        session (AsyncSession): Сессия чтения (реплика, если задана) для поиска ссылки.
+        request (Request | None): Запрос перехода, из которого берутся данные
+            посетителя для скетча уникальных и журнала событий.
 
     Returns:
-        URLPair: Объект с оригинальной ссылкой и сопутствующей информацией.
+        RedirectEntry: Оригинальная ссылка и сопутствующая информация.
 
     Raises:
         HTTPException: 404 - Если ссылка не найдена.
-        HTTPException: 410 - Если ссылка неактивна или устарела.
+        HTTPException: 410 - Если ссылка неактивна, устарела или истёк её срок действия.
         HTTPException: 500 - Внутренняя ошибка получения короткой ссылки.
 
     """
 
     logger.info("Начинаем переходить по ссылке")
 
-    try:
-        url = await URLRepository.get_by_short_url(short_url, session)
+    url = redirect_cache.get(short_url)
 
-    except Exception:
-        logger.critical("Ошибка получения короткой ссылки")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Ошибка получения короткой ссылки",
-        )
+    if url is None:
+        if settings.short_code_filter_enabled and not await short_codes.might_exist(short_url):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Ссылка не найдена"
+            )
 
-    if not url:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Ссылка не найдена"
-        )
+        try:
+            url = await get_redirect_target(short_url, session)
+
+        except Exception:
+            logger.critical("Ошибка получения короткой ссылки")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Ошибка получения короткой ссылки",
+            )
+
+        if url is None:
+            if settings.short_code_filter_enabled:
+                short_codes.remember_missing(short_url)
+
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Ссылка не найдена"
+            )
+
+        cache_redirect(short_url, url)
 
     if not url.is_activated:
         raise HTTPException(
@@ -54,7 +139,7 @@ async def redirect(
             detail="Ссылка неактивна"
         )
 
-    if url.is_old:
+    if url.is_old or url.expires_at <= dt.datetime.now(dt.timezone.utc):
         raise HTTPException(
             status_code=status.HTTP_410_GONE,
             detail="Ссылка устарела"
@@ -62,16 +147,38 @@ async def redirect(
     
     logger.info("Увеличиваем счетчик кликов")
 
-    try:
-        await URLRepository.increment_clicks(url, session)
+    record_hit(short_url)
+
+    if settings.click_buffer_enabled:
+        click_buffer.add(url.id)
+
+    else:
+        try:
+            async with AsyncSessionLocal() as primary:
+                await ClickRepository.add_clicks({url.id: 1}, primary)
+
+        except Exception:
+            logger.critical("Ошибка при увеличении кликов")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Ошибка при увеличении кликов",
+            )
+
+    if request is not None:
+        ip = request.client.host if request.client else None
+        user_agent = request.headers.get("user-agent")
+
+        if settings.unique_visitors_enabled:
+            visitor_buffer.add(url.id, fingerprint_hash(ip, user_agent))
+
+        if settings.click_events_enabled:
+            click_events.add(
+                url.id,
+                referrer=request.headers.get("referer"),
+                user_agent=user_agent,
+                ip=ip,
+            )
 
-    except Exception:
-        logger.critical("Ошибка при увеличении кликов")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Ошибка при увеличении кликов",
-        )
-    
     logger.success("Увеличили счетчик, переходим по ссылке...")
     
     return url
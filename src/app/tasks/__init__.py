@@ -1,5 +1,19 @@
-from .scheduler import start_scheduler
+from .clicks import click_buffer
+from .events import click_events
+from .invalidation import redirect_invalidation
+from .scheduler import (
+    start_scheduler,
+    stop_scheduler,
+)
+from .code_filter import short_codes
+from .visitors import visitor_buffer
 
 __all__ = (
     "start_scheduler",
-)
\ No newline at end of file
+    "stop_scheduler",
+    "click_buffer",
+    "click_events",
+    "visitor_buffer",
+    "short_codes",
+    "redirect_invalidation",
+)
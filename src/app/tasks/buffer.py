@@ -0,0 +1,118 @@
+import asyncio
+from abc import (
+    ABC,
+    abstractmethod,
+)
+from typing import (
+    Generic,
+    Sized,
+    TypeVar,
+)
+
+from loguru import logger
+
+
+B = TypeVar("B", bound=Sized)
+
+
+class WriteBehindBuffer(ABC, Generic[B]):
+    """
+    Основа буферов с отложенной записью в БД (write-behind).
+
+    Запрос только обновляет накопитель в памяти, а фоновая задача раз в
+    `flush_interval` секунд забирает его целиком и записывает в БД. Когда
+    накопитель достигает `max_size` записей, сброс запускается досрочно.
+    При ошибке записи пачка возвращается в буфер, чтобы не потерять
+    данные до следующей попытки.
+
+    Подклассы задают `name` для логов и реализуют абстрактные `__len__`,
+    `_swap`, `_write` и `_restore`.
+
+    Attributes:
+        name (str): Что накапливает буфер (для логов).
+        flush_interval (float): Период сброса буфера в секундах.
+        max_size (int): Размер накопителя, при котором буфер
+            сбрасывается досрочно.
+
+    """
+
+    name = ""
+
+    def __init__(self, flush_interval: float, max_size: int) -> None:
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+        self._early_flush: asyncio.Task[int] | None = None
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Размер накопителя, с которым сравнивается `max_size`."""
+
+    @abstractmethod
+    def _swap(self) -> B:
+        """Забирает накопитель, оставляя вместо него пустой."""
+
+    @abstractmethod
+    async def _write(self, batch: B) -> None:
+        """Записывает пачку в БД."""
+
+    @abstractmethod
+    def _restore(self, batch: B) -> None:
+        """Возвращает незаписанную пачку в накопитель."""
+
+    def _check_size(self) -> None:
+        """Запускает досрочный сброс, если накопитель переполнен."""
+
+        if len(self) >= self.max_size and (
+            self._early_flush is None or self._early_flush.done()
+        ):
+            self._early_flush = asyncio.create_task(self.flush())
+
+    async def flush(self) -> int:
+        """
+        Записывает накопленное в БД.
+
+        Returns:
+            int: Количество записанных элементов пачки.
+
+        """
+
+        async with self._lock:
+            if not len(self):
+                return 0
+
+            batch = self._swap()
+
+            try:
+                await self._write(batch)
+
+            except Exception:
+                logger.exception(f"Ошибка записи буфера {self.name}")
+                self._restore(batch)
+                return 0
+
+        logger.debug(f"Записан буфер {self.name}: {len(batch)}")
+
+        return len(batch)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def start(self) -> None:
+        """Запускает фоновую задачу периодического сброса буфера."""
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Останавливает фоновую задачу и сбрасывает остаток буфера."""
+
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        await self.flush()
@@ -0,0 +1,73 @@
+import datetime as dt
+from collections import Counter
+
+from app.core import (
+    AsyncSessionLocal,
+    settings,
+)
+from app.dao import ClickRepository
+from app.tasks.buffer import WriteBehindBuffer
+
+
+ClickDeltas = Counter[tuple[int, dt.datetime]]
+
+
+class ClickBuffer(WriteBehindBuffer[ClickDeltas]):
+    """
+    Буфер кликов с отложенной записью в БД (write-behind).
+
+    Редирект только увеличивает счётчик ссылки за текущую минуту в
+    памяти, а фоновая задача периодически записывает накопленные
+    приращения в бакеты кликов пакетными запросами. Клики попадают в
+    бакеты минуты, в которую сделаны, даже если пачку удалось записать
+    лишь со второй попытки. Досрочный сброс срабатывает по количеству
+    различных пар (ссылка, минута) в буфере.
+
+    """
+
+    name = "кликов"
+
+    def __init__(self, flush_interval: float, max_size: int) -> None:
+        super().__init__(flush_interval, max_size)
+        self._counts: ClickDeltas = Counter()
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def add(
+        self,
+        url_id: int,
+        clicks: int = 1,
+        now: dt.datetime | None = None,
+    ) -> None:
+        """
+        Учитывает клик по ссылке.
+
+        Args:
+            url_id (int): Идентификатор ссылки (URLPair).
+            clicks (int): Количество кликов.
+            now (datetime | None): Момент клика; по умолчанию текущее время UTC.
+
+        """
+
+        minute = (now or dt.datetime.now(dt.timezone.utc)).replace(second=0, microsecond=0)
+        self._counts[(url_id, minute)] += clicks
+        self._check_size()
+
+    def _swap(self) -> ClickDeltas:
+        deltas, self._counts = self._counts, Counter()
+
+        return deltas
+
+    async def _write(self, batch: ClickDeltas) -> None:
+        async with AsyncSessionLocal() as session:
+            await ClickRepository.add_minute_clicks(batch, session)
+
+    def _restore(self, batch: ClickDeltas) -> None:
+        self._counts.update(batch)
+
+
+click_buffer = ClickBuffer(
+    flush_interval=settings.click_flush_interval,
+    max_size=settings.click_buffer_max_size,
+)
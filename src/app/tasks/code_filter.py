@@ -0,0 +1,296 @@
+import asyncio
+import datetime as dt
+import time
+from typing import NamedTuple
+
+from loguru import logger
+
+from app.cache import (
+    BloomFilter,
+    TTLCache,
+)
+from app.const import (
+    SHORT_CODE_FILTER_GROWTH,
+    SHORT_CODE_LOAD_CHUNK_SIZE,
+)
+from app.core import (
+    AsyncSessionLocal,
+    settings,
+)
+from app.dao import URLRepository
+
+
+class ShortCodeFilterStats(NamedTuple):
+    """Метрики фильтра существующих коротких ссылок."""
+
+    ready: bool
+    capacity: int
+    estimated_codes: int
+    size_bytes: int
+    hash_count: int
+    false_positive_rate: float
+    missing_cached: int
+    rejected: int
+    syncs: int
+
+
+class ShortCodeFilter:
+    """
+    Отрицательный кэш коротких ссылок: фильтр Блума и кэш недавних 404.
+
+    Фильтр строится при запуске по всем `urlpair.short_url` и пополняется
+    при создании ссылок этим процессом. Отсутствие кода в фильтре
+    означает, что ссылки нет, поэтому запросы к несуществующим путям
+    отвечаются без обращения к БД. Ссылки, созданные другими
+    экземплярами, догружаются по `created_at`: каждая догрузка
+    перечитывает ссылки, созданные не раньше чем за `sync_overlap` секунд
+    до самой новой уже догруженной. `created_at` — начало создавшей ссылку
+    транзакции, поэтому ссылки, зафиксированные не по порядку, не теряются,
+    если транзакция короче этого окна; более поздние попадут в фильтр при
+    его перестроении. Догрузка выполняется
+    плановой задачей и при промахе фильтра, но не чаще раза в
+    `sync_interval` секунд; на это время код, созданный другим
+    экземпляром, может отвечать 404.
+
+    В кэш недавних 404 попадают только коды, которых не нашлось в БД;
+    догрузка удаляет из него созданные с тех пор коды. Переполненный
+    фильтр перестраивается плановой задачей вне запросов.
+
+    Attributes:
+        error_rate (float): Расчётная доля ложных срабатываний.
+        sync_interval (float): Минимальный период догрузки новых кодов.
+        sync_overlap (float): Окно перечитывания при догрузке, в секундах.
+        rejected (int): Количество запросов, отвеченных 404 без БД.
+        syncs (int): Количество выполненных догрузок.
+
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float,
+        sync_interval: float,
+        sync_overlap: float,
+        missing: TTLCache[str, bool],
+    ) -> None:
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.sync_overlap = sync_overlap
+        self.rejected = 0
+        self.syncs = 0
+        self._capacity = capacity
+        self._filter: BloomFilter | None = None
+        self._missing = missing
+        self._last_seen: dt.datetime | None = None
+        self._synced_at = float("-inf")
+        self._lock = asyncio.Lock()
+        self._pending: list[str] | None = None
+
+    async def _build(self) -> tuple[BloomFilter, dt.datetime]:
+        async with AsyncSessionLocal() as session:
+            last_id = await URLRepository.get_last_id(session)
+            bloom = BloomFilter(
+                max(self._capacity, last_id * SHORT_CODE_FILTER_GROWTH),
+                self.error_rate,
+            )
+            last_seen = await URLRepository.get_last_created_at(session)
+            after_id = 0
+
+            while rows := await URLRepository.get_short_urls_after(
+                after_id,
+                SHORT_CODE_LOAD_CHUNK_SIZE,
+                session,
+            ):
+                for row in rows:
+                    bloom.add(row.short_url)
+
+                after_id = rows[-1].id
+
+        logger.info(
+            f"Загружен фильтр коротких ссылок: ~{bloom.estimated_count()} кодов, "
+            f"{bloom.size_bytes} байт"
+        )
+
+        return bloom, last_seen
+
+    async def start(self) -> None:
+        """
+        Строит фильтр по всем коротким ссылкам в БД.
+
+        Ошибка загрузки не останавливает приложение: без фильтра все
+        запросы проверяются в БД, как раньше.
+
+        """
+
+        try:
+            synced_at = time.monotonic()
+            self._filter, self._last_seen = await self._build()
+            self._synced_at = synced_at
+
+        except Exception:
+            logger.exception("Ошибка загрузки фильтра коротких ссылок, работаем без него")
+
+    async def _sync(self) -> None:
+        # Догрузки выполняются по очереди: ожидающий запрос увидит коды,
+        # догруженные текущей, и не станет читать их повторно.
+        async with self._lock:
+            if (
+                self._filter is None
+                or self._last_seen is None
+                or time.monotonic() - self._synced_at < self.sync_interval
+            ):
+                return
+
+            self._synced_at = time.monotonic()
+            since = self._last_seen - dt.timedelta(seconds=self.sync_overlap)
+            last_seen = self._last_seen
+
+            try:
+                async with AsyncSessionLocal() as session:
+                    after_id = 0
+
+                    while rows := await URLRepository.get_short_urls_created_since(
+                        since,
+                        after_id,
+                        SHORT_CODE_LOAD_CHUNK_SIZE,
+                        session,
+                    ):
+                        self.add(*(row.short_url for row in rows))
+                        last_seen = max(last_seen, *(row.created_at for row in rows))
+                        after_id = rows[-1].id
+
+            except Exception:
+                logger.exception("Ошибка догрузки фильтра коротких ссылок")
+                return
+
+            self._last_seen = last_seen
+            self.syncs += 1
+
+    async def _rebuild(self) -> None:
+        # Коды, добавленные во время загрузки, могли не попасть в её выборку,
+        # поэтому они запоминаются и добавляются в новый фильтр перед заменой.
+        self._pending = []
+
+        try:
+            bloom, _ = await self._build()
+
+            for short_url in self._pending:
+                bloom.add(short_url)
+
+            self._filter = bloom
+
+        except Exception:
+            logger.exception("Ошибка перестроения фильтра коротких ссылок")
+
+        finally:
+            self._pending = None
+
+    async def refresh(self) -> None:
+        """
+        Плановая задача: догружает новые коды и перестраивает переполненный фильтр.
+
+        Новый фильтр строится без блокировки, а старый до замены продолжает
+        отвечать на запросы и пополняться.
+
+        """
+
+        await self._sync()
+
+        if self._filter is not None and self._filter.false_positive_rate() > 2 * self.error_rate:
+            await self._rebuild()
+
+    def add(self, *short_urls: str) -> None:
+        """
+        Учитывает созданные ссылки.
+
+        Args:
+            *short_urls (str): Короткие коды созданных ссылок.
+
+        """
+
+        for short_url in short_urls:
+            self._missing.pop(short_url)
+
+            if self._filter is not None:
+                self._filter.add(short_url)
+
+            if self._pending is not None:
+                self._pending.append(short_url)
+
+    async def might_exist(self, short_url: str) -> bool:
+        """
+        Проверяет, может ли существовать ссылка с таким кодом.
+
+        Args:
+            short_url (str): Короткий код.
+
+        Returns:
+            bool: False, если ссылки точно нет; True, если её нужно искать в БД.
+
+        """
+
+        if self._filter is None:
+            return True
+
+        if short_url in self._filter:
+            if self._missing.get(short_url):
+                self.rejected += 1
+                return False
+
+            return True
+
+        await self._sync()
+
+        if short_url in self._filter:
+            return True
+
+        self.rejected += 1
+
+        return False
+
+    def remember_missing(self, short_url: str) -> None:
+        """
+        Запоминает код, которого нет в БД.
+
+        Args:
+            short_url (str): Короткий код, не найденный в БД.
+
+        """
+
+        self._missing.set(short_url, True)
+
+    def stats(self) -> ShortCodeFilterStats:
+        """
+        Возвращает метрики фильтра.
+
+        Returns:
+            ShortCodeFilterStats: Размер, оценка количества кодов, доля
+                ложных срабатываний и счётчики отказов.
+
+        """
+
+        bloom = self._filter
+
+        return ShortCodeFilterStats(
+            ready=bloom is not None,
+            capacity=bloom.capacity if bloom else 0,
+            estimated_codes=bloom.estimated_count() if bloom else 0,
+            size_bytes=bloom.size_bytes if bloom else 0,
+            hash_count=bloom.hash_count if bloom else 0,
+            false_positive_rate=bloom.false_positive_rate() if bloom else 0.0,
+            missing_cached=len(self._missing),
+            rejected=self.rejected,
+            syncs=self.syncs,
+        )
+
+
+short_codes = ShortCodeFilter(
+    capacity=settings.short_code_filter_capacity,
+    error_rate=settings.short_code_filter_error_rate,
+    sync_interval=settings.short_code_sync_interval,
+    sync_overlap=settings.short_code_sync_overlap,
+    missing=TTLCache(
+        maxsize=settings.missing_cache_size,
+        ttl=settings.missing_cache_ttl,
+    ),
+)
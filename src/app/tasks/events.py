@@ -0,0 +1,199 @@
+import asyncio
+import datetime as dt
+import hashlib
+import ipaddress
+from typing import NamedTuple
+
+from loguru import logger
+
+from app.const import (
+    CLICK_EVENTS_IPV4_PREFIX,
+    CLICK_EVENTS_IPV6_PREFIX,
+    CLICK_EVENTS_REFERRER_MAX_LEN,
+)
+from app.core import (
+    AsyncSessionLocal,
+    settings,
+)
+from app.dao import ClickRepository
+
+
+class ClickEventRecord(NamedTuple):
+    """Строка журнала событий в порядке столбцов таблицы ClickEvent."""
+
+    ts: dt.datetime
+    url_id: int
+    referrer: str | None
+    user_agent_hash: int | None
+    ip_prefix: ipaddress.IPv4Network | ipaddress.IPv6Network | None
+
+
+def user_agent_hash(user_agent: str) -> int:
+    """
+    Считает 64-битный хэш заголовка User-Agent для журнала событий.
+
+    Args:
+        user_agent (str): Заголовок User-Agent.
+
+    Returns:
+        int: Первые 8 байт blake2b как знаковое целое (столбец BIGINT).
+
+    """
+
+    digest = hashlib.blake2b(user_agent.encode(), digest_size=8).digest()
+
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def ip_prefix(
+    ip: str | None,
+) -> ipaddress.IPv4Network | ipaddress.IPv6Network | None:
+    """
+    Обрезает адрес клиента до сети, чтобы не хранить точный IP.
+
+    Args:
+        ip (str | None): Адрес клиента.
+
+    Returns:
+        IPv4Network | IPv6Network | None: Сеть /24 для IPv4 или /48 для IPv6;
+            None, если адрес не передан или не разобран.
+
+    """
+
+    if not ip:
+        return None
+
+    try:
+        address = ipaddress.ip_address(ip)
+
+    except ValueError:
+        return None
+
+    prefix = CLICK_EVENTS_IPV4_PREFIX if address.version == 4 else CLICK_EVENTS_IPV6_PREFIX
+
+    return ipaddress.ip_network(f"{address}/{prefix}", strict=False)
+
+
+class ClickEventLog:
+    """
+    Журнал сырых событий перехода с пакетной записью через COPY.
+
+    Редирект только кладёт событие в ограниченную очередь и никогда её
+    не ждёт: при переполнении событие отбрасывается. Фоновая задача
+    забирает события пачками и пишет их в секционированную таблицу.
+
+    Attributes:
+        batch_size (int): Максимальное количество событий в одной записи.
+        flush_interval (float): Максимальное время накопления пачки в секундах.
+        dropped (int): Количество событий, отброшенных из-за переполнения.
+
+    """
+
+    def __init__(self, queue_size: int, batch_size: int, flush_interval: float) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue: asyncio.Queue[ClickEventRecord] = asyncio.Queue(queue_size)
+        self._batch: list[ClickEventRecord] = []
+        self._task: asyncio.Task[None] | None = None
+
+    def add(
+        self,
+        url_id: int,
+        referrer: str | None = None,
+        user_agent: str | None = None,
+        ip: str | None = None,
+    ) -> None:
+        """
+        Ставит событие перехода в очередь на запись.
+
+        Args:
+            url_id (int): Идентификатор ссылки (URLPair).
+            referrer (str | None): Заголовок Referer.
+            user_agent (str | None): Заголовок User-Agent; хранится только хэш.
+            ip (str | None): Адрес клиента; хранится только сеть.
+
+        """
+
+        record = ClickEventRecord(
+            ts=dt.datetime.now(dt.timezone.utc),
+            url_id=url_id,
+            referrer=referrer[:CLICK_EVENTS_REFERRER_MAX_LEN] if referrer else None,
+            user_agent_hash=user_agent_hash(user_agent) if user_agent else None,
+            ip_prefix=ip_prefix(ip),
+        )
+
+        try:
+            self._queue.put_nowait(record)
+
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+            if self.dropped % self.batch_size == 1:
+                logger.warning(f"Очередь событий переполнена, отброшено: {self.dropped}")
+
+    async def _collect(self) -> None:
+        self._batch.append(await self._queue.get())
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+
+        while len(self._batch) < self.batch_size:
+            timeout = deadline - loop.time()
+
+            if timeout <= 0:
+                break
+
+            try:
+                self._batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+
+            except asyncio.TimeoutError:
+                break
+
+    def _drain(self) -> list[ClickEventRecord]:
+        while not self._queue.empty() and len(self._batch) < self.batch_size:
+            self._batch.append(self._queue.get_nowait())
+
+        batch, self._batch = self._batch, []
+
+        return batch
+
+    async def _write(self, batch: list[ClickEventRecord]) -> None:
+        try:
+            async with AsyncSessionLocal() as session:
+                await ClickRepository.copy_events(batch, session)
+
+        except Exception:
+            logger.exception(f"Ошибка записи событий перехода, потеряно: {len(batch)}")
+            return
+
+        logger.debug(f"Записано событий перехода: {len(batch)}")
+
+    async def _run(self) -> None:
+        while True:
+            await self._collect()
+            batch, self._batch = self._batch, []
+            await self._write(batch)
+
+    def start(self) -> None:
+        """Запускает фоновую задачу записи событий."""
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Останавливает фоновую задачу и записывает остаток очереди."""
+
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        while batch := self._drain():
+            await self._write(batch)
+
+
+click_events = ClickEventLog(
+    queue_size=settings.click_events_queue_size,
+    batch_size=settings.click_events_batch_size,
+    flush_interval=settings.click_events_flush_interval,
+)
@@ -0,0 +1,86 @@
+import asyncio
+from typing import Any
+
+import asyncpg
+from loguru import logger
+
+from app.cache import (
+    invalidate_redirect,
+    redirect_cache,
+)
+from app.const import (
+    REDIRECT_INVALIDATE_CHANNEL,
+    REDIRECT_INVALIDATE_RETRY,
+)
+from app.core import engine
+
+
+class RedirectInvalidationListener:
+    """
+    Подписка на сброс кэша редиректов, общая для всех экземпляров.
+
+    При деактивации ссылки репозиторий отправляет NOTIFY в канал
+    `REDIRECT_INVALIDATE_CHANNEL`, а каждый процесс слушает его на
+    отдельном соединении вне пула и удаляет код из своего кэша. Пока
+    соединение потеряно, уведомления не доходят, поэтому после каждого
+    (пере)подключения кэш очищается целиком.
+
+    Attributes:
+        retry_interval (float): Пауза перед повторным подключением в секундах.
+
+    """
+
+    def __init__(self, retry_interval: float) -> None:
+        self.retry_interval = retry_interval
+        self._task: asyncio.Task[None] | None = None
+
+    @staticmethod
+    def _on_notify(connection: Any, pid: int, channel: str, payload: str) -> None:
+        invalidate_redirect(payload)
+
+    async def _listen(self) -> None:
+        dsn = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        connection = await asyncpg.connect(dsn)
+        closed = asyncio.Event()
+
+        try:
+            connection.add_termination_listener(lambda _: closed.set())
+            await connection.add_listener(REDIRECT_INVALIDATE_CHANNEL, self._on_notify)
+            redirect_cache.clear()
+
+            logger.info("Подписка на сброс кэша редиректов установлена")
+
+            await closed.wait()
+
+        finally:
+            await connection.close()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._listen()
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception:
+                logger.exception("Потеряна подписка на сброс кэша редиректов")
+
+            await asyncio.sleep(self.retry_interval)
+
+    def start(self) -> None:
+        """Запускает фоновую подписку."""
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Останавливает подписку и закрывает её соединение."""
+
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+redirect_invalidation = RedirectInvalidationListener(retry_interval=REDIRECT_INVALIDATE_RETRY)
@@ -1,25 +1,69 @@
+import asyncio
+import os
+import socket
+import time
 from contextlib import asynccontextmanager
 from datetime import (
     datetime,
+    timedelta,
     timezone,
 )
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+)
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler # type: ignore
 from loguru import logger
-from sqlalchemy import update
 
+from app.cache import (
+    RedirectEntry,
+    cache_redirect,
+    invalidate_redirect,
+    redirect_cache,
+    top_links,
+)
 from app.const import (
+    CLICK_HOUR_RETENTION_DAYS,
+    CLICK_MINUTE_RETENTION_DAYS,
+    CLICK_PARTITIONS_AHEAD_DAYS,
+    CLICK_STATS_REFRESH_MINUTES,
     DAILY_JOB,
+    EXPIRE_CHUNK_SIZE,
     HOURLY_JOB,
+    JOB_LEASE_FACTOR,
+    JOB_LEASE_MAX_MINUTES,
+    JOB_POLL_SECONDS,
+    RATE_LIMIT_IDLE_HOURS,
+    REDIRECT_CACHE_PREWARM_MINUTES,
+    UNIQUE_STATS_REFRESH_MINUTES,
+    VISITOR_SKETCH_RETENTION_DAYS,
+)
+from app.core import (
+    get_async_session,
+    settings,
+)
+from app.dao import (
+    ClickRepository,
+    JobRepository,
+    RateLimitRepository,
+    URLRepository,
 )
-from app.core import get_async_session
 from app.models import (
-    URLPair,
-    URLPairStat,
+    ClickEvent,
+    ClickHour,
+    ClickMinute,
+    VisitorHour,
 )
+from app.tasks.code_filter import short_codes
 
 scheduler = AsyncIOScheduler(timezone="Europe/Moscow")
 
+INSTANCE_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+running_jobs: set[asyncio.Task[Any]] = set()
+
 
 @asynccontextmanager
 async def get_session():
@@ -35,7 +79,126 @@ async def get_session():
         yield session
 
 
-async def deactivate_expired_urls():
+def poll_interval(interval: timedelta) -> timedelta:
+    """
+    Возвращает период, с которым экземпляр проверяет, пора ли выполнить задачу.
+
+    Args:
+        interval (timedelta): Период запуска задачи.
+
+    Returns:
+        timedelta: Период задачи, но не больше `JOB_POLL_SECONDS`.
+
+    """
+
+    return min(interval, timedelta(seconds=JOB_POLL_SECONDS))
+
+
+async def run_exclusive(
+    job: Callable[..., Awaitable[int | None]],
+    job_id: str,
+    interval: timedelta,
+    **kwargs: Any,
+) -> None:
+    """
+    Выполняет задачу, если подошёл её срок и аренду получил этот экземпляр.
+
+    Срок наступает через `interval` после начала предыдущего запуска в
+    кластере (с допуском на период проверки). Аренда выдаётся на
+    `JOB_LEASE_FACTOR` периодов, но не дольше `JOB_LEASE_MAX_MINUTES`,
+    поэтому после падения владельца задачу не позже чем через
+    `JOB_LEASE_MAX_MINUTES` и период проверки выполняет другой
+    экземпляр. Длительность, количество строк и ошибка запуска
+    сохраняются в таблице аренд.
+
+    Args:
+        job (Callable): Задача, возвращающая количество обработанных строк.
+        job_id (str): Идентификатор задачи (и аренды).
+        interval (timedelta): Период запуска задачи.
+        **kwargs (Any): Аргументы задачи.
+
+    """
+
+    task = asyncio.current_task()
+
+    if task is not None:
+        running_jobs.add(task)
+        task.add_done_callback(running_jobs.discard)
+
+    async with get_session() as session:
+
+        if not await JobRepository.acquire(
+            job_id,
+            INSTANCE_ID,
+            min(interval * JOB_LEASE_FACTOR, timedelta(minutes=JOB_LEASE_MAX_MINUTES)),
+            interval - poll_interval(interval),
+            session,
+        ):
+            logger.debug(f"Задача {job_id} выполнена или выполняется другим экземпляром")
+            return
+
+    started = time.monotonic()
+    rows, error = None, None
+
+    try:
+        rows = await job(**kwargs)
+
+    except Exception as exc:
+        logger.exception(f"Ошибка выполнения задачи {job_id}")
+        error = repr(exc)
+
+    async with get_session() as session:
+
+        await JobRepository.record_run(
+            job_id,
+            INSTANCE_ID,
+            time.monotonic() - started,
+            rows,
+            error,
+            session,
+        )
+
+
+def add_exclusive_job(
+    job: Callable[..., Awaitable[int | None]],
+    job_id: str,
+    interval: timedelta,
+    trigger: str = "interval",
+    kwargs: dict[str, Any] | None = None,
+    **trigger_args: Any,
+) -> None:
+    """
+    Регистрирует задачу, которую во всём кластере выполняет один экземпляр.
+
+    Интервальная задача проверяется каждым экземпляром раз в
+    `poll_interval`, а выполняется раз в `interval` тем, кто первым
+    застанет её срок (см. `run_exclusive`).
+
+    Args:
+        job (Callable): Задача, возвращающая количество обработанных строк.
+        job_id (str): Идентификатор задачи.
+        interval (timedelta): Период запуска задачи.
+        trigger (str): Триггер APScheduler.
+        kwargs (dict[str, Any] | None): Аргументы задачи.
+        **trigger_args (Any): Параметры триггера.
+
+    """
+
+    if trigger == "interval":
+        trigger_args.setdefault("seconds", poll_interval(interval).total_seconds())
+
+    scheduler.add_job(
+        run_exclusive,
+        trigger,
+        args=[job, job_id, interval],
+        kwargs=kwargs,
+        id=job_id,
+        replace_existing=True,
+        **trigger_args,
+    )
+
+
+async def deactivate_expired_urls() -> int:
     """
     Плановая задача для деактивации истёкших ссылок.
 
@@ -43,78 +206,240 @@ async def deactivate_expired_urls():
     и которые всё ещё активны (is_activated=True). Также устанавливает is_old=True
     для дальнейшей фильтрации.
 
+    Ссылки обрабатываются пачками по `EXPIRE_CHUNK_SIZE`, каждая в своей
+    короткой транзакции; строки, заблокированные другой репликой, пропускаются.
+
+    Редирект сам проверяет `expires_at`, поэтому задача только приводит
+    флаги в соответствие (для фильтрации и поиска дубликатов) и может
+    выполняться редко.
+
     """
 
     logger.info("Запущена задача деактивации ссылок")
 
+    now = datetime.now(timezone.utc)
+    started = time.monotonic()
+    chunks = total = 0
+
     async with get_session() as session:
-        now = datetime.now(timezone.utc)
 
-        stmt = (
-            update(URLPair)
-            .where(URLPair.expires_at <= now, URLPair.is_activated)
-            .values(is_activated=False, is_old=True)
-        )
+        while True:
+            short_urls = await URLRepository.deactivate_expired_chunk(
+                now,
+                EXPIRE_CHUNK_SIZE,
+                session,
+            )
+            invalidate_redirect(*short_urls)
 
-        result = await session.execute(stmt)
-        await session.commit()
+            chunks += 1
+            total += len(short_urls)
 
-        logger.success(f"Деактивировано ссылок: {result.rowcount}")
+            logger.info(
+                f"Пачка {chunks}: деактивировано {len(short_urls)}, всего {total}, "
+                f"{time.monotonic() - started:.1f} с"
+            )
 
-async def reset_hourly_clicks():
+            if len(short_urls) < EXPIRE_CHUNK_SIZE:
+                break
+
+    logger.success(
+        f"Деактивировано ссылок: {total} за {chunks} пачек, "
+        f"{time.monotonic() - started:.1f} с"
+    )
+
+    return total
+
+
+async def refresh_click_stats() -> int:
     """
-    Ежечасная задача: обнуляет поле `hourly_clicks` у всех записей.
+    Поминутная задача: пересчитывает клики за последний час и сутки
+    скользящими окнами по бакетам кликов.
     """
-    logger.info("Запущена задача сброса hourly_clicks")
+    logger.info("Запущена задача пересчёта статистики кликов")
 
     async with get_session() as session:
 
-        stmt = update(URLPairStat).values(last_hour_clicks=0)
+        rowcount = await ClickRepository.refresh_windows(session)
 
-        result = await session.execute(stmt)
+        logger.success(f"Обновлена статистика у {rowcount} записей")
 
-        await session.commit()
+    return rowcount
 
-        logger.success(f"Сброшено hourly_clicks у {result.rowcount} записей")
 
+async def refresh_unique_stats(full: bool = False) -> int:
+    """
+    Пересчитывает оценки уникальных посетителей по скетчам HyperLogLog.
 
-async def reset_daily_clicks():
+    Частый запуск обрабатывает только ссылки со свежими скетчами, полный
+    (в начале часа) — все ссылки, у которых меняются окна час/сутки.
     """
-    Ежедневная задача: обнуляет поле `daily_clicks` у всех записей.
+    logger.info("Запущена задача пересчёта уникальных посетителей")
+
+    since = None if full else (
+        datetime.now(timezone.utc) - timedelta(minutes=2 * UNIQUE_STATS_REFRESH_MINUTES)
+    )
+
+    async with get_session() as session:
+
+        refreshed = await ClickRepository.refresh_uniques(session, since=since)
+
+        logger.success(f"Пересчитаны уникальные посетители у {refreshed} ссылок")
+
+    return refreshed
+
+
+async def maintain_click_partitions() -> int:
+    """
+    Ежечасная задача: создаёт секции бакетов кликов, скетчей посетителей
+    (и журнала событий, если он включён) на ближайшие дни и удаляет секции старше срока хранения.
+    """
+    logger.info("Запущена задача обслуживания секций кликов")
+
+    today = datetime.now(timezone.utc).date()
+    days = [today + timedelta(days=i) for i in range(CLICK_PARTITIONS_AHEAD_DAYS + 1)]
+    retention = {
+        ClickMinute.__tablename__: CLICK_MINUTE_RETENTION_DAYS,
+        ClickHour.__tablename__: CLICK_HOUR_RETENTION_DAYS,
+        VisitorHour.__tablename__: VISITOR_SKETCH_RETENTION_DAYS,
+    }
+
+    if settings.click_events_enabled:
+        retention[ClickEvent.__tablename__] = settings.click_events_retention_days
+
+    total = 0
+
+    async with get_session() as session:
+
+        for table, retention_days in retention.items():
+            created = await ClickRepository.create_partitions(table, days, session)
+            dropped = await ClickRepository.drop_partitions_before(
+                table,
+                today - timedelta(days=retention_days),
+                session,
+            )
+
+            if created:
+                logger.success(f"Созданы секции: {', '.join(created)}")
+
+            if dropped:
+                logger.success(f"Удалены секции: {', '.join(dropped)}")
+
+            total += len(created) + len(dropped)
+
+    return total
+
+
+async def delete_idle_rate_limits() -> int:
     """
-    logger.info("Запущена задача сброса daily_clicks")
+    Ежечасная задача: удаляет корзины ограничителя частоты, которые давно
+    не использовались. Такая корзина уже полностью пополнилась, поэтому
+    удаление не меняет лимитов.
+    """
+    before = datetime.now(timezone.utc) - timedelta(hours=RATE_LIMIT_IDLE_HOURS)
 
     async with get_session() as session:
 
-        stmt = update(URLPairStat).values(last_day_clicks=0)
+        deleted = await RateLimitRepository.delete_idle(before, session)
+
+        logger.success(f"Удалено неактивных корзин ограничителя: {deleted}")
+
+    return deleted
 
-        result = await session.execute(stmt)
 
-        await session.commit()
+async def prewarm_redirect_cache() -> None:
+    """
+    Плановая задача: загружает в кэш редиректов самые популярные за час
+    ссылки, которых в нём ещё нет, одним запросом к БД.
+    """
+    short_urls = [
+        short_url
+        for short_url, _, _ in top_links["hour"].top(settings.redirect_cache_prewarm_size)
+        if short_url not in redirect_cache
+    ]
+
+    if not short_urls:
+        return
+
+    async with get_session() as session:
+
+        targets = await URLRepository.get_redirect_targets(short_urls, session)
+
+    for short_url, row in targets.items():
+        cache_redirect(short_url, RedirectEntry._make(row))
 
-        logger.success(f"Сброшено daily_clicks у {result.rowcount} записей")
+    logger.success(f"Прогрето ссылок в кэше редиректов: {len(targets)}")
 
 
 def start_scheduler():
-    scheduler.add_job(
+    add_exclusive_job(
         deactivate_expired_urls,
-        "interval",
-        hours=DAILY_JOB,
-        id="deactivate_expired_urls",
-        replace_existing=True,
+        "deactivate_expired_urls",
+        timedelta(hours=DAILY_JOB),
     )
-    scheduler.add_job(
-        reset_hourly_clicks,
-        "interval",
-        hours=HOURLY_JOB,
-        id="reset_hourly_clicks",
-        replace_existing=True,
+    add_exclusive_job(
+        refresh_click_stats,
+        "refresh_click_stats",
+        timedelta(minutes=CLICK_STATS_REFRESH_MINUTES),
     )
-    scheduler.add_job(
-        reset_daily_clicks,
-        "interval",
-        hours=DAILY_JOB,
-        id="reset_daily_clicks",
-        replace_existing=True,
+    add_exclusive_job(
+        maintain_click_partitions,
+        "maintain_click_partitions",
+        timedelta(hours=HOURLY_JOB),
+        next_run_time=datetime.now(timezone.utc),
     )
+    if settings.unique_visitors_enabled:
+        add_exclusive_job(
+            refresh_unique_stats,
+            "refresh_unique_stats",
+            timedelta(minutes=UNIQUE_STATS_REFRESH_MINUTES),
+        )
+        add_exclusive_job(
+            refresh_unique_stats,
+            "refresh_unique_stats_full",
+            timedelta(hours=HOURLY_JOB),
+            trigger="cron",
+            kwargs={"full": True},
+            minute=0,
+        )
+    if settings.rate_limit_backend == "postgres":
+        add_exclusive_job(
+            delete_idle_rate_limits,
+            "delete_idle_rate_limits",
+            timedelta(hours=HOURLY_JOB),
+        )
+    # Кэш редиректов и фильтр коротких ссылок у каждого процесса свои,
+    # поэтому прогрев и догрузка выполняются в каждом экземпляре.
+    if settings.redirect_cache_prewarm_size > 0:
+        scheduler.add_job(
+            prewarm_redirect_cache,
+            "interval",
+            minutes=REDIRECT_CACHE_PREWARM_MINUTES,
+            id="prewarm_redirect_cache",
+            replace_existing=True,
+        )
+    if settings.short_code_filter_enabled:
+        scheduler.add_job(
+            short_codes.refresh,
+            "interval",
+            seconds=settings.short_code_sync_interval,
+            id="refresh_short_code_filter",
+            replace_existing=True,
+        )
     scheduler.start()
+
+
+async def stop_scheduler() -> None:
+    """
+    Останавливает планировщик и дожидается выполняющихся задач.
+
+    Новые запуски прекращаются сразу, а начатые задачи завершаются сами;
+    время ожидания ограничивает дедлайн остановки приложения.
+
+    """
+
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
+
+    if running_jobs:
+        logger.info(f"Ожидаем завершения задач: {len(running_jobs)}")
+        await asyncio.gather(*running_jobs, return_exceptions=True)
@@ -0,0 +1,77 @@
+import datetime as dt
+
+from app.cache import HyperLogLog
+from app.core import (
+    AsyncSessionLocal,
+    settings,
+)
+from app.dao import ClickRepository
+from app.tasks.buffer import WriteBehindBuffer
+
+
+VisitorSketches = dict[tuple[int, dt.datetime], HyperLogLog]
+
+
+class VisitorBuffer(WriteBehindBuffer[VisitorSketches]):
+    """
+    Буфер почасовых скетчей уникальных посетителей.
+
+    Редирект добавляет хэш отпечатка посетителя в скетч ссылки за текущий
+    час, а фоновая задача периодически объединяет накопленные скетчи
+    со скетчами в БД. Память ограничена: не больше `max_size` скетчей
+    по 1 КБ, после чего буфер сбрасывается досрочно.
+
+    """
+
+    name = "скетчей посетителей"
+
+    def __init__(self, flush_interval: float, max_size: int) -> None:
+        super().__init__(flush_interval, max_size)
+        self._sketches: VisitorSketches = {}
+
+    def __len__(self) -> int:
+        return len(self._sketches)
+
+    def add(self, url_id: int, visitor_hash: int) -> None:
+        """
+        Учитывает посетителя ссылки в скетче текущего часа.
+
+        Args:
+            url_id (int): Идентификатор ссылки (URLPair).
+            visitor_hash (int): 64-битный хэш отпечатка посетителя.
+
+        """
+
+        bucket_start = dt.datetime.now(dt.timezone.utc).replace(minute=0, second=0, microsecond=0)
+        key = (url_id, bucket_start)
+        sketch = self._sketches.get(key)
+
+        if sketch is None:
+            sketch = self._sketches[key] = HyperLogLog()
+
+        sketch.add(visitor_hash)
+        self._check_size()
+
+    def _swap(self) -> VisitorSketches:
+        sketches, self._sketches = self._sketches, {}
+
+        return sketches
+
+    async def _write(self, batch: VisitorSketches) -> None:
+        async with AsyncSessionLocal() as session:
+            await ClickRepository.merge_visitor_sketches(batch, session)
+
+    def _restore(self, batch: VisitorSketches) -> None:
+        # Скетчи объединяются с накопленными за время записи, чтобы не
+        # потерять посетителей.
+        for key, sketch in batch.items():
+            if key in self._sketches:
+                sketch.merge(self._sketches[key])
+
+            self._sketches[key] = sketch
+
+
+visitor_buffer = VisitorBuffer(
+    flush_interval=settings.click_flush_interval,
+    max_size=settings.visitor_buffer_max_size,
+)
@@ -0,0 +1,226 @@
+"""
+Бенчмарк списка ссылок `/statistic/all_crated_links`.
+
+Сравнивает три варианта на первой и на глубокой странице:
+
+- прежний запрос (ORM-объекты, `joinedload` + `join` по urlpairstat,
+  LIMIT/OFFSET);
+- текущий `URLRepository.get_all` (одна проекция колонок с одним join)
+  с тем же OFFSET, что показывает эффект отказа от двойного join
+  отдельно от смены пагинации;
+- `URLRepository.get_all` с keyset-курсором.
+
+Печатает планы EXPLAIN ANALYZE и медиану/p99 задержки.
+
+Запускается из каталога src против БД из настроек после
+`alembic upgrade head`:
+
+    python -m benchmarks.listing --rows 1000000
+
+Тестовые ссылки (short_url с префиксом `bench-`) создаются один раз и
+переиспользуются; `--cleanup` удаляет их после замера.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+)
+
+from sqlalchemy import (
+    Select,
+    desc,
+    event,
+    func,
+    select,
+    text,
+)
+from sqlalchemy.orm import joinedload
+
+from app.core import (
+    AsyncSessionLocal,
+    engine,
+)
+from app.dao import URLRepository
+from app.models import (
+    URLPair,
+    URLPairStat,
+)
+
+
+PREFIX = "bench-"
+
+
+async def seed(rows: int) -> None:
+    async with AsyncSessionLocal() as session:
+        existing = await session.scalar(
+            select(func.count()).where(URLPair.short_url.startswith(PREFIX))
+        )
+
+        if existing and existing >= rows:
+            print(f"Тестовых ссылок уже {existing}")
+            return
+
+        print(f"Создаём {rows - (existing or 0)} тестовых ссылок...")
+        await session.execute(
+            text(
+                """
+                WITH pairs AS (
+                    INSERT INTO urlpair (short_url, original_url, is_activated, is_old, expires_at)
+                    SELECT CAST(:prefix AS text) || g, 'https://example.com/' || g, true, false,
+                           now() + interval '1 day'
+                    FROM generate_series(CAST(:start AS int), CAST(:stop AS int)) AS g
+                    RETURNING id
+                )
+                INSERT INTO urlpairstat (url_id, last_hour_clicks, last_day_clicks)
+                SELECT id, (random() * 1000)::int, (random() * 20000)::int FROM pairs
+                """
+            ),
+            {"prefix": PREFIX, "start": (existing or 0) + 1, "stop": rows},
+        )
+        await session.commit()
+
+    async with engine.connect() as conn:
+        await conn.execute(text("ANALYZE urlpair"))
+        await conn.execute(text("ANALYZE urlpairstat"))
+        await conn.commit()
+
+
+async def cleanup() -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            text("DELETE FROM urlpair WHERE short_url LIKE :prefix"),
+            {"prefix": f"{PREFIX}%"},
+        )
+        await session.commit()
+
+
+def legacy_stmt(limit: int, offset: int) -> Select[Any]:
+    """Запрос `get_all` до перехода на проекцию колонок и курсоры."""
+
+    return (
+        select(URLPair)
+        .options(joinedload(URLPair.stats))
+        .join(URLPair.stats)
+        .order_by(desc(URLPairStat.last_hour_clicks))
+        .limit(limit)
+        .offset(offset)
+    )
+
+
+async def explain(query: Callable[[], Awaitable[object]]) -> str:
+    """Выполняет запрос и возвращает EXPLAIN ANALYZE отправленного им SQL."""
+
+    executed: list[tuple[str, Any]] = []
+
+    def capture(conn: Any, cursor: Any, statement: str, parameters: Any, *_: Any) -> None:
+        executed.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+
+    try:
+        await query()
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+    statement, parameters = executed[-1]
+
+    async with engine.connect() as conn:
+        ret = await conn.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+
+        return "\n".join(row[0] for row in ret)
+
+
+async def measure(
+    name: str,
+    query: Callable[[], Awaitable[object]],
+    repeat: int,
+) -> None:
+    await query()
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await query()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    print(f"{name:<40} median {statistics.median(timings):8.2f} ms   p99 {p99:8.2f} ms")
+
+
+async def cursor_at(depth: int) -> tuple[int, int]:
+    async with AsyncSessionLocal() as session:
+        row = (
+            await session.execute(
+                select(URLPairStat.last_hour_clicks, URLPairStat.url_id)
+                .order_by(desc(URLPairStat.last_hour_clicks), URLPairStat.url_id)
+                .offset(depth - 1)
+                .limit(1)
+            )
+        ).one()
+
+    return row.last_hour_clicks, row.url_id
+
+
+async def main(args: argparse.Namespace) -> None:
+    await seed(args.rows)
+    cursor = await cursor_at(args.depth)
+
+    async def legacy(offset: int) -> object:
+        async with AsyncSessionLocal() as session:
+            return (await session.execute(legacy_stmt(args.page_size, offset))).unique().all()
+
+    async def projection(offset: int) -> object:
+        async with AsyncSessionLocal() as session:
+            return await URLRepository.get_all(
+                session,
+                limit=args.page_size,
+                offset=offset,
+                sort_by_hour_clicks=True,
+            )
+
+    async def keyset(page_cursor: tuple[int, int] | None) -> object:
+        async with AsyncSessionLocal() as session:
+            return await URLRepository.get_all(
+                session,
+                limit=args.page_size,
+                sort_by_hour_clicks=True,
+                cursor=page_cursor,
+            )
+
+    runs: list[tuple[str, Callable[[], Awaitable[object]]]] = [
+        ("до: первая страница", lambda: legacy(0)),
+        (f"до: OFFSET {args.depth}", lambda: legacy(args.depth)),
+        (f"один join: OFFSET {args.depth}", lambda: projection(args.depth)),
+        ("после: первая страница", lambda: keyset(None)),
+        (f"после: курсор на глубине {args.depth}", lambda: keyset(cursor)),
+    ]
+
+    for name, query in runs:
+        print(f"\n== {name} ==\n{await explain(query)}")
+
+    print()
+
+    for name, query in runs:
+        await measure(name, query, args.repeat)
+
+    if args.cleanup:
+        await cleanup()
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--depth", type=int, default=500_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--cleanup", action="store_true")
+
+    asyncio.run(main(parser.parse_args()))
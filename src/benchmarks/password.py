@@ -0,0 +1,129 @@
+"""
+Бенчмарк влияния потока логинов на задержку редиректов.
+
+Редирект из кэша целиком выполняется в event loop, поэтому его задержка
+равна задержке цикла. Бенчмарк каждые `--interval` секунд измеряет, на
+сколько позже запланированного проснулась пробная корутина, и сравнивает
+три режима:
+
+- без нагрузки;
+- поток проверок пароля, вызывающих bcrypt прямо в корутине (как было
+  до выноса хэширования в пул);
+- тот же поток через `verify_password_async` (пул потоков с ограничением
+  очереди; отклонённые с 429 попытки считаются отдельно).
+
+Запускается из каталога src:
+
+    python -m benchmarks.password --logins 64 --duration 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import (
+    Awaitable,
+    Callable,
+)
+
+from fastapi import HTTPException
+
+from app.auth.security.password import (
+    hash_password,
+    shutdown_password_executor,
+    verify_password,
+    verify_password_async,
+)
+
+
+async def probe(interval: float, stop: asyncio.Event) -> list[float]:
+    lags = []
+
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append((time.perf_counter() - start - interval) * 1000)
+
+    return lags
+
+
+async def flood(
+    login: Callable[[], Awaitable[bool]],
+    workers: int,
+    stop: asyncio.Event,
+) -> tuple[int, int]:
+    done = rejected = 0
+
+    async def worker() -> None:
+        nonlocal done, rejected
+
+        while not stop.is_set():
+            try:
+                await login()
+                done += 1
+
+            except HTTPException:
+                rejected += 1
+                await asyncio.sleep(0.01)
+
+            # Каждый логин - отдельный запрос: между ними цикл обслуживает
+            # остальные задачи, даже если сама проверка его блокирует.
+            await asyncio.sleep(0)
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
+
+    return done, rejected
+
+
+async def run(
+    name: str,
+    login: Callable[[], Awaitable[bool]] | None,
+    args: argparse.Namespace,
+) -> None:
+    stop = asyncio.Event()
+    start = time.perf_counter()
+    probe_task = asyncio.create_task(probe(args.interval, stop))
+    flood_task = (
+        asyncio.create_task(flood(login, args.logins, stop))
+        if login is not None
+        else None
+    )
+
+    await asyncio.sleep(args.duration)
+    stop.set()
+
+    lags = sorted(await probe_task)
+    done, rejected = await flood_task if flood_task is not None else (0, 0)
+    elapsed = time.perf_counter() - start
+    p99 = lags[min(len(lags) - 1, int(len(lags) * 0.99))]
+
+    print(
+        f"{name:<24} lag median {statistics.median(lags):8.2f} ms"
+        f"   p99 {p99:8.2f} ms   max {lags[-1]:8.2f} ms"
+        f"   logins {done / elapsed:6.1f}/s   429 {rejected}   elapsed {elapsed:5.1f} s"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    hashed = hash_password("benchmark-password")
+
+    async def blocking_login() -> bool:
+        return verify_password("benchmark-password", hashed)
+
+    async def pooled_login() -> bool:
+        return await verify_password_async("benchmark-password", hashed)
+
+    await run("без нагрузки", None, args)
+    await run("bcrypt в event loop", blocking_login, args)
+    await run("bcrypt в пуле", pooled_login, args)
+
+    await shutdown_password_executor()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--interval", type=float, default=0.005)
+
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,82 @@
+import asyncio
+import os
+from typing import (
+    Any,
+    Coroutine,
+    TypeVar,
+)
+
+import pytest
+
+
+# Настройки читаются при импорте приложения, поэтому обязательные
+# переменные задаются до него. Значения из окружения и .env не перекрываются.
+for name, value in {
+    "APP_HOST": "127.0.0.1",
+    "APP_PORT": "8000",
+    "APP_TITLE": "YADRO url alias service",
+    "APP_DESCRIPTION": "tests",
+    "POSTGRES_USER": "postgres",
+    "POSTGRES_PASSWORD": "postgres",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_DB": "postgres",
+    "POSTGRES_PORT": "5432",
+    "HASH_SECRET_KEY": "test-secret",
+    "ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+}.items():
+    os.environ.setdefault(name, value)
+
+from sqlalchemy import text  # noqa: E402
+
+from app.core import engine  # noqa: E402
+
+
+T = TypeVar("T")
+
+
+async def _run_and_dispose(coro: Coroutine[Any, Any, T]) -> T:
+    try:
+        return await coro
+    finally:
+        # Соединения пула привязаны к циклу событий, а каждый тест
+        # запускается в собственном цикле.
+        await engine.dispose()
+
+
+def run(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Выполняет корутину в новом цикле событий и закрывает пул соединений.
+
+    Args:
+        coro (Coroutine): Корутина теста.
+
+    Returns:
+        T: Результат корутины.
+
+    """
+
+    return asyncio.run(_run_and_dispose(coro))
+
+
+async def _database_ready() -> bool:
+    try:
+        async with engine.connect() as conn:
+            result = await conn.execute(text("SELECT to_regclass('urlpair')"))
+            return result.scalar() is not None
+    except Exception:
+        return False
+
+
+@pytest.fixture(scope="session")
+def database() -> None:
+    """
+    Пропускает тест, если БД из настроек недоступна или не мигрирована.
+
+    Тесты с этой фикстурой работают с настоящим PostgreSQL
+    (`alembic upgrade head`) и удаляют созданные ими строки.
+
+    """
+
+    if not run(_database_ready()):
+        pytest.skip("PostgreSQL недоступен или миграции не применены")
@@ -0,0 +1,65 @@
+import pytest
+
+from app.cache import BloomFilter
+
+
+def _filled(capacity: int, error_rate: float, count: int) -> BloomFilter:
+    bloom = BloomFilter(capacity, error_rate)
+
+    for value in range(count):
+        bloom.add(f"code-{value}")
+
+    return bloom
+
+
+def _measured_false_positives(bloom: BloomFilter, probes: int = 50_000) -> float:
+    hits = sum(f"missing-{value}" in bloom for value in range(probes))
+
+    return hits / probes
+
+
+def test_empty_filter_contains_nothing() -> None:
+    bloom = BloomFilter(1_000, 0.01)
+
+    assert "code" not in bloom
+    assert bloom.estimated_count() == 0
+    assert bloom.false_positive_rate() == 0
+
+
+def test_no_false_negatives() -> None:
+    bloom = _filled(10_000, 0.01, 10_000)
+
+    assert all(f"code-{value}" in bloom for value in range(10_000))
+
+
+@pytest.mark.parametrize("error_rate", [0.01, 0.001])
+def test_false_positive_rate_near_target(error_rate: float) -> None:
+    bloom = _filled(20_000, error_rate, 20_000)
+    measured = _measured_false_positives(bloom)
+
+    assert measured <= 2 * error_rate
+    assert bloom.false_positive_rate() <= 2 * error_rate
+
+
+def test_overfilled_filter_reports_higher_error_rate() -> None:
+    bloom = _filled(1_000, 0.01, 5_000)
+
+    # По этой оценке ShortCodeFilter решает перестроить фильтр.
+    assert bloom.false_positive_rate() > 2 * bloom.error_rate
+    assert _measured_false_positives(bloom) > 2 * bloom.error_rate
+
+
+def test_estimated_count_within_error() -> None:
+    bloom = _filled(50_000, 0.01, 20_000)
+
+    assert abs(bloom.estimated_count() - 20_000) <= 0.05 * 20_000
+
+
+def test_duplicates_do_not_change_filter() -> None:
+    bloom = _filled(1_000, 0.01, 500)
+    bits_set = bloom.bits_set
+
+    for value in range(500):
+        bloom.add(f"code-{value}")
+
+    assert bloom.bits_set == bits_set
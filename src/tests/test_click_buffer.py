@@ -0,0 +1,158 @@
+import asyncio
+import datetime as dt
+from collections import Counter
+from typing import (
+    Any,
+    Mapping,
+)
+
+import pytest
+
+from app.dao import ClickRepository
+from app.tasks.buffer import WriteBehindBuffer
+from app.tasks.clicks import ClickBuffer
+
+
+class FakeClicks:
+    """Подменяет запись бакетов и запоминает записанные приращения."""
+
+    def __init__(self) -> None:
+        self.written: Counter[int] = Counter()
+        self.buckets: Counter[tuple[int, dt.datetime]] = Counter()
+        self.calls = 0
+        self.fail = False
+        self.delay = 0.0
+
+    async def add_minute_clicks(
+        self,
+        deltas: Mapping[tuple[int, dt.datetime], int],
+        session: Any,
+    ) -> None:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+
+        if self.fail:
+            raise RuntimeError("БД недоступна")
+
+        self.buckets.update(deltas)
+
+        for (url_id, _), clicks in deltas.items():
+            self.written[url_id] += clicks
+
+
+@pytest.fixture
+def clicks(monkeypatch: pytest.MonkeyPatch) -> FakeClicks:
+    fake = FakeClicks()
+    monkeypatch.setattr(ClickRepository, "add_minute_clicks", fake.add_minute_clicks)
+    return fake
+
+
+def test_flush_writes_summed_deltas(clicks: FakeClicks) -> None:
+    buffer = ClickBuffer(flush_interval=60, max_size=1000)
+
+    async def scenario() -> int:
+        for url_id in (1, 1, 2, 1):
+            buffer.add(url_id)
+
+        return await buffer.flush()
+
+    assert asyncio.run(scenario()) == 2
+    assert clicks.written == Counter({1: 3, 2: 1})
+    assert clicks.calls == 1
+    assert len(buffer) == 0
+
+
+def test_clicks_during_flush_are_kept(clicks: FakeClicks) -> None:
+    buffer = ClickBuffer(flush_interval=60, max_size=1000)
+    clicks.delay = 0.05
+
+    async def scenario() -> None:
+        buffer.add(1)
+        flush = asyncio.create_task(buffer.flush())
+        await asyncio.sleep(0.01)
+
+        for _ in range(5):
+            buffer.add(1)
+
+        await flush
+        await buffer.flush()
+
+    asyncio.run(scenario())
+
+    assert clicks.written == Counter({1: 6})
+
+
+def test_failed_write_is_restored(clicks: FakeClicks) -> None:
+    buffer = ClickBuffer(flush_interval=60, max_size=1000)
+    now = dt.datetime(2026, 1, 1, 12, 30, 15, tzinfo=dt.timezone.utc)
+
+    async def scenario() -> None:
+        buffer.add(1, 2, now=now)
+        clicks.fail = True
+        assert await buffer.flush() == 0
+
+        buffer.add(1, now=now)
+        clicks.fail = False
+        assert await buffer.flush() == 1
+
+    asyncio.run(scenario())
+
+    assert clicks.written == Counter({1: 3})
+
+
+def test_restored_clicks_keep_their_minute(clicks: FakeClicks) -> None:
+    buffer = ClickBuffer(flush_interval=60, max_size=1000)
+    first = dt.datetime(2026, 1, 1, 12, 30, 15, tzinfo=dt.timezone.utc)
+    second = first + dt.timedelta(minutes=2)
+
+    async def scenario() -> None:
+        buffer.add(1, 2, now=first)
+        clicks.fail = True
+        await buffer.flush()
+
+        buffer.add(1, now=second)
+        clicks.fail = False
+        await buffer.flush()
+
+    asyncio.run(scenario())
+
+    assert clicks.buckets == Counter({
+        (1, first.replace(second=0)): 2,
+        (1, second.replace(second=0)): 1,
+    })
+
+
+def test_full_buffer_flushes_early(clicks: FakeClicks) -> None:
+    buffer = ClickBuffer(flush_interval=60, max_size=3)
+
+    async def scenario() -> None:
+        for url_id in range(3):
+            buffer.add(url_id)
+
+        await asyncio.sleep(0)
+
+    asyncio.run(scenario())
+
+    assert clicks.written == Counter({0: 1, 1: 1, 2: 1})
+
+
+def test_stop_flushes_remainder(clicks: FakeClicks) -> None:
+    buffer = ClickBuffer(flush_interval=60, max_size=1000)
+
+    async def scenario() -> None:
+        buffer.start()
+        buffer.add(7, 4)
+        await buffer.stop()
+
+    asyncio.run(scenario())
+
+    assert clicks.written == Counter({7: 4})
+
+
+def test_buffer_without_overrides_cannot_be_created() -> None:
+    class Incomplete(WriteBehindBuffer[Counter[int]]):
+        def __len__(self) -> int:
+            return 0
+
+    with pytest.raises(TypeError, match="_restore"):
+        Incomplete(flush_interval=60, max_size=1)  # type: ignore[abstract]
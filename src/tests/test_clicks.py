@@ -0,0 +1,112 @@
+import asyncio
+import datetime as dt
+import uuid
+
+import pytest
+from sqlalchemy import (
+    delete,
+    func,
+    select,
+)
+
+from app.core import AsyncSessionLocal
+from app.dao import (
+    ClickRepository,
+    URLRepository,
+)
+from app.models import (
+    ClickHour,
+    ClickMinute,
+    URLPair,
+)
+from tests.conftest import run
+
+
+CONCURRENT_CLICKS = 50
+
+
+async def _create_link() -> int:
+    short_url = f"t{uuid.uuid4().hex[:12]}"
+
+    async with AsyncSessionLocal() as session:
+        row = await URLRepository.add_url_pair(
+            original_url=f"https://example.com/{short_url}",  # type: ignore[arg-type]
+            short_url=short_url,
+            session=session,
+        )
+
+    assert row is not None
+    return int(row.id)
+
+
+async def _delete_link(url_id: int) -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(URLPair).where(URLPair.id == url_id))
+        await session.commit()
+
+
+async def _click(url_id: int) -> None:
+    async with AsyncSessionLocal() as session:
+        await ClickRepository.add_clicks({url_id: 1}, session)
+
+
+async def _concurrent_clicks(clicks: int) -> tuple[int, int]:
+    url_id = await _create_link()
+
+    try:
+        await asyncio.gather(*(_click(url_id) for _ in range(clicks)))
+
+        async with AsyncSessionLocal() as session:
+            totals = []
+            for model in (ClickMinute, ClickHour):
+                total = await session.scalar(
+                    select(func.coalesce(func.sum(model.clicks), 0))
+                    .where(model.url_id == url_id)
+                )
+                totals.append(int(total or 0))
+    finally:
+        await _delete_link(url_id)
+
+    return totals[0], totals[1]
+
+
+@pytest.mark.usefixtures("database")
+def test_concurrent_clicks_are_not_lost() -> None:
+    minute, hour = run(_concurrent_clicks(CONCURRENT_CLICKS))
+
+    assert minute == CONCURRENT_CLICKS
+    assert hour == CONCURRENT_CLICKS
+
+
+async def _clicks_in_two_minutes() -> tuple[list[int], list[int]]:
+    url_id = await _create_link()
+    minute = dt.datetime.now(dt.timezone.utc).replace(minute=10, second=0, microsecond=0)
+
+    try:
+        async with AsyncSessionLocal() as session:
+            await ClickRepository.add_minute_clicks(
+                {(url_id, minute): 2, (url_id, minute + dt.timedelta(minutes=1)): 3},
+                session,
+            )
+
+        async with AsyncSessionLocal() as session:
+            totals = []
+            for model in (ClickMinute, ClickHour):
+                ret = await session.scalars(
+                    select(model.clicks)
+                    .where(model.url_id == url_id)
+                    .order_by(model.bucket_start)
+                )
+                totals.append(list(ret))
+    finally:
+        await _delete_link(url_id)
+
+    return totals[0], totals[1]
+
+
+@pytest.mark.usefixtures("database")
+def test_minute_clicks_are_summed_per_hour() -> None:
+    minute, hour = run(_clicks_in_two_minutes())
+
+    assert minute == [2, 3]
+    assert hour == [5]
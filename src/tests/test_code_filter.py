@@ -0,0 +1,249 @@
+import asyncio
+import contextlib
+import datetime as dt
+import uuid
+from typing import (
+    Any,
+    NamedTuple,
+)
+
+import pytest
+from sqlalchemy import (
+    delete,
+    text,
+)
+
+from app.cache import TTLCache
+from app.core import (
+    AsyncSessionLocal,
+    engine,
+)
+from app.dao import URLRepository
+from app.models import URLPair
+from app.tasks.code_filter import ShortCodeFilter
+from tests.conftest import run
+
+
+class FakeRow(NamedTuple):
+    id: int
+    short_url: str
+    created_at: dt.datetime
+
+
+class FakeURLs:
+    """Подменяет чтение коротких ссылок таблицей в памяти."""
+
+    def __init__(self, *short_urls: str) -> None:
+        self.rows: list[FakeRow] = []
+        self.windows: list[dt.datetime] = []
+        self.gate: asyncio.Event | None = None
+        self.loading = asyncio.Event()
+        self._now = dt.datetime(2026, 1, 1, tzinfo=dt.timezone.utc)
+
+        for short_url in short_urls:
+            self.create(short_url)
+
+    def create(self, short_url: str, started: float = 0) -> None:
+        """Создаёт ссылку в транзакции, начатой `started` секунд назад."""
+
+        self._now += dt.timedelta(seconds=1)
+        created_at = self._now - dt.timedelta(seconds=started)
+        self.rows.append(FakeRow(len(self.rows) + 1, short_url, created_at))
+
+    async def get_last_id(self, session: Any) -> int:
+        return len(self.rows)
+
+    async def get_last_created_at(self, session: Any) -> dt.datetime:
+        return max(row.created_at for row in self.rows)
+
+    async def get_short_urls_after(self, after_id: int, limit: int, session: Any) -> list[FakeRow]:
+        self.loading.set()
+
+        if self.gate is not None:
+            await self.gate.wait()
+
+        return [row for row in self.rows if row.id > after_id][:limit]
+
+    async def get_short_urls_created_since(
+        self,
+        since: dt.datetime,
+        after_id: int,
+        limit: int,
+        session: Any,
+    ) -> list[FakeRow]:
+        if after_id == 0:
+            self.windows.append(since)
+
+        return [row for row in self.rows if row.created_at >= since and row.id > after_id][:limit]
+
+
+@pytest.fixture
+def urls(monkeypatch: pytest.MonkeyPatch) -> FakeURLs:
+    fake = FakeURLs("a", "b", "c")
+
+    for name in (
+        "get_last_id",
+        "get_last_created_at",
+        "get_short_urls_after",
+        "get_short_urls_created_since",
+    ):
+        monkeypatch.setattr(URLRepository, name, getattr(fake, name))
+
+    monkeypatch.setattr("app.tasks.code_filter.AsyncSessionLocal", contextlib.nullcontext)
+
+    return fake
+
+
+def _filter(capacity: int = 1_000, sync_interval: float = 0.0) -> ShortCodeFilter:
+    return ShortCodeFilter(
+        capacity=capacity,
+        error_rate=0.01,
+        sync_interval=sync_interval,
+        sync_overlap=60,
+        missing=TTLCache(maxsize=100, ttl=60),
+    )
+
+
+def test_unknown_code_rejected_without_404_cache(urls: FakeURLs) -> None:
+    codes = _filter(sync_interval=60)
+
+    async def scenario() -> tuple[bool, bool]:
+        await codes.start()
+        return await codes.might_exist("a"), await codes.might_exist("zzz")
+
+    assert asyncio.run(scenario()) == (True, False)
+    assert codes.stats().rejected == 1
+    # Отказ по фильтру не запоминается: код, созданный другим
+    # экземпляром, станет доступен после ближайшей догрузки.
+    assert codes.stats().missing_cached == 0
+
+
+def test_miss_syncs_codes_of_other_instances(urls: FakeURLs) -> None:
+    codes = _filter()
+
+    async def scenario() -> bool:
+        await codes.start()
+        urls.create("d")
+        return await codes.might_exist("d")
+
+    assert asyncio.run(scenario())
+    assert codes.stats().syncs == 1
+
+
+def test_skipped_sync_picks_up_code_later(urls: FakeURLs) -> None:
+    codes = _filter(sync_interval=60)
+
+    async def scenario() -> tuple[bool, bool]:
+        await codes.start()
+        urls.create("d")
+        before = await codes.might_exist("d")
+
+        codes.sync_interval = 0
+        return before, await codes.might_exist("d")
+
+    assert asyncio.run(scenario()) == (False, True)
+
+
+def test_sync_rescans_only_overlap_window(urls: FakeURLs) -> None:
+    codes = _filter()
+
+    async def scenario() -> bool:
+        await codes.start()
+
+        for value in range(100):
+            urls.create(f"new-{value}")
+
+        await codes.refresh()
+        # Транзакция началась до уже догруженных ссылок, но в пределах окна.
+        urls.create("slow", started=30)
+        await codes.refresh()
+
+        return await codes.might_exist("slow")
+
+    assert asyncio.run(scenario())
+
+    newest = max(row.created_at for row in urls.rows)
+    # Перечитывается только окно перед самой новой догруженной ссылкой.
+    assert urls.windows[-1] == newest - dt.timedelta(seconds=60)
+
+
+def test_refresh_clears_404_of_created_code(urls: FakeURLs) -> None:
+    codes = _filter()
+
+    async def scenario() -> tuple[bool, bool]:
+        await codes.start()
+        # "c" есть в фильтре, но не нашёлся в БД (ложное срабатывание
+        # или удалённая ссылка), а затем его создал другой экземпляр.
+        codes.remember_missing("c")
+        before = await codes.might_exist("c")
+
+        urls.create("c")
+        await codes.refresh()
+        return before, await codes.might_exist("c")
+
+    assert asyncio.run(scenario()) == (False, True)
+
+
+def test_rebuild_keeps_codes_added_during_load(urls: FakeURLs) -> None:
+    codes = _filter(capacity=10, sync_interval=60)
+
+    async def scenario() -> tuple[bool, bool, bool]:
+        await codes.start()
+
+        for value in range(200):
+            urls.create(f"extra-{value}")
+            codes.add(f"extra-{value}")
+
+        urls.gate = asyncio.Event()
+        urls.loading.clear()
+        refresh = asyncio.create_task(codes.refresh())
+        await urls.loading.wait()
+
+        # Пока новый фильтр загружается, запросы обслуживает старый.
+        served = await codes.might_exist("a")
+        codes.add("fresh")
+
+        urls.gate.set()
+        await refresh
+
+        return served, await codes.might_exist("fresh"), await codes.might_exist("extra-1")
+
+    capacity = codes.stats().capacity
+    assert asyncio.run(scenario()) == (True, True, True)
+    assert codes.stats().capacity > capacity
+    assert codes.stats().false_positive_rate <= 2 * codes.error_rate
+
+
+async def _out_of_order_commit() -> tuple[bool, bool, bool]:
+    codes = _filter()
+    early, late = (f"t{uuid.uuid4().hex[:12]}" for _ in range(2))
+    insert = text(
+        "INSERT INTO urlpair (short_url, original_url, is_activated, is_old, expires_at) "
+        "VALUES (:code, 'https://example.com', true, false, now() + interval '1 day')"
+    )
+
+    await codes.start()
+
+    try:
+        async with engine.connect() as slow, engine.connect() as fast:
+            # Транзакция с меньшим id фиксируется позже.
+            await slow.execute(insert, {"code": late})
+            await fast.execute(insert, {"code": early})
+            await fast.commit()
+
+            early_seen = await codes.might_exist(early)
+            late_before_commit = await codes.might_exist(late)
+
+            await slow.commit()
+
+        return early_seen, late_before_commit, await codes.might_exist(late)
+
+    finally:
+        async with AsyncSessionLocal() as session:
+            await session.execute(delete(URLPair).where(URLPair.short_url.in_([early, late])))
+            await session.commit()
+
+
+@pytest.mark.usefixtures("database")
+def test_sync_finds_links_committed_out_of_order() -> None:
+    assert run(_out_of_order_commit()) == (True, False, True)
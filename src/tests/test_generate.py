@@ -0,0 +1,98 @@
+import asyncio
+from typing import Any
+
+import pytest
+from pydantic import ValidationError
+
+from app.const import (
+    SHORT_LINK_ALPHABET,
+    SHORT_LINK_LEN,
+)
+from app.core.settings import ShortCodeSettings
+from app.dao import URLRepository
+from app.services.generate import (
+    RandomCodeAllocator,
+    SequenceCodeAllocator,
+    encode_base62,
+)
+
+
+def test_encode_base62_pads_to_length() -> None:
+    assert encode_base62(0) == SHORT_LINK_ALPHABET[0] * SHORT_LINK_LEN
+    assert encode_base62(len(SHORT_LINK_ALPHABET), length=3) == (
+        SHORT_LINK_ALPHABET[0] + SHORT_LINK_ALPHABET[1] + SHORT_LINK_ALPHABET[0]
+    )
+
+
+def test_encode_base62_is_injective() -> None:
+    codes = {encode_base62(number, length=2) for number in range(62 ** 2)}
+
+    assert len(codes) == 62 ** 2
+    assert all(len(code) == 2 for code in codes)
+
+
+def test_sequence_mode_requires_key() -> None:
+    with pytest.raises(ValidationError, match="SHORT_CODE_KEY"):
+        ShortCodeSettings(short_code_mode="sequence", short_code_key="")
+
+    assert ShortCodeSettings(short_code_mode="sequence", short_code_key="secret").short_code_key
+    assert ShortCodeSettings(short_code_mode="random", short_code_key="").short_code_mode == "random"
+
+
+def test_feistel_permutation_is_bijective() -> None:
+    allocator = SequenceCodeAllocator(block_size=10, key="secret", length=2)
+    domain = len(SHORT_LINK_ALPHABET) ** 2
+
+    permuted = [allocator.permute(number) for number in range(domain)]
+
+    assert sorted(permuted) == list(range(domain))
+    assert permuted[:100] != list(range(100))
+
+
+def test_feistel_permutation_depends_on_key() -> None:
+    first = SequenceCodeAllocator(block_size=10, key="first")
+    second = SequenceCodeAllocator(block_size=10, key="second")
+
+    assert [first.permute(n) for n in range(20)] != [second.permute(n) for n in range(20)]
+    assert [first.permute(n) for n in range(20)] == [
+        SequenceCodeAllocator(block_size=10, key="first").permute(n) for n in range(20)
+    ]
+
+
+def test_feistel_permutation_rejects_exhausted_space() -> None:
+    allocator = SequenceCodeAllocator(block_size=10, key="secret", length=2)
+
+    with pytest.raises(ValueError):
+        allocator.permute(62 ** 2)
+
+
+def test_sequence_allocator_reserves_blocks(monkeypatch: pytest.MonkeyPatch) -> None:
+    reserved: list[int] = []
+
+    async def reserve_code_ids(count: int, session: Any) -> list[int]:
+        start = sum(reserved)
+        reserved.append(count)
+        return list(range(start, start + count))
+
+    monkeypatch.setattr(URLRepository, "reserve_code_ids", reserve_code_ids)
+    allocator = SequenceCodeAllocator(block_size=100, key="secret")
+
+    async def allocate() -> list[str]:
+        codes = await asyncio.gather(*(allocator.allocate(None) for _ in range(150)))  # type: ignore[arg-type]
+        codes.extend(await allocator.allocate_many(300, None))  # type: ignore[arg-type]
+        return codes
+
+    codes = asyncio.run(allocate())
+
+    assert len(set(codes)) == len(codes) == 450
+    assert all(len(code) == SHORT_LINK_LEN for code in codes)
+    assert reserved == [100, 100, 250]
+
+
+def test_random_allocator_returns_distinct_codes() -> None:
+    allocator = RandomCodeAllocator()
+
+    codes = asyncio.run(allocator.allocate_many(1000, None))  # type: ignore[arg-type]
+
+    assert len(set(codes)) == 1000
+    assert all(set(code) <= set(SHORT_LINK_ALPHABET) for code in codes)
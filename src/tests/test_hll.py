@@ -0,0 +1,69 @@
+import pytest
+
+from app.cache import (
+    HyperLogLog,
+    fingerprint_hash,
+)
+
+
+def _sketch(values: range) -> HyperLogLog:
+    sketch = HyperLogLog()
+
+    for value in values:
+        sketch.add(fingerprint_hash(str(value)))
+
+    return sketch
+
+
+def test_empty_sketch_counts_zero() -> None:
+    assert HyperLogLog().count() == 0
+
+
+@pytest.mark.parametrize("cardinality", [10, 1_000, 50_000])
+def test_count_within_error(cardinality: int) -> None:
+    sketch = _sketch(range(cardinality))
+
+    # Стандартная ошибка ~3%; допускаем четыре сигмы.
+    assert abs(sketch.count() - cardinality) <= max(2, 0.13 * cardinality)
+
+
+def test_duplicates_do_not_change_estimate() -> None:
+    sketch = _sketch(range(1_000))
+    estimate = sketch.count()
+
+    for value in range(1_000):
+        sketch.add(fingerprint_hash(str(value)))
+
+    assert sketch.count() == estimate
+
+
+def test_merge_equals_union() -> None:
+    left = _sketch(range(0, 6_000))
+    right = _sketch(range(4_000, 10_000))
+
+    left.merge(right)
+
+    assert left.to_bytes() == _sketch(range(10_000)).to_bytes()
+
+
+def test_round_trip_through_bytes() -> None:
+    sketch = _sketch(range(500))
+
+    restored = HyperLogLog(sketch.precision, sketch.to_bytes())
+
+    assert restored.count() == sketch.count()
+
+
+def test_rejects_mismatched_precision() -> None:
+    with pytest.raises(ValueError):
+        HyperLogLog(precision=10).merge(HyperLogLog(precision=12))
+
+    with pytest.raises(ValueError):
+        HyperLogLog(precision=10, registers=bytes(10))
+
+
+def test_fingerprint_hash_is_stable() -> None:
+    assert fingerprint_hash("1.2.3.4", "ua") == fingerprint_hash("1.2.3.4", "ua")
+    assert fingerprint_hash("1.2.3.4", "ua") != fingerprint_hash("1.2.3.4ua")
+    assert fingerprint_hash(None) == fingerprint_hash("")
+    assert 0 <= fingerprint_hash("x") < 2 ** 64
@@ -0,0 +1,83 @@
+import datetime as dt
+import uuid
+
+import pytest
+from sqlalchemy import (
+    delete,
+    update,
+)
+
+from app.core import AsyncSessionLocal
+from app.dao import JobRepository
+from app.models import JobLease
+from tests.conftest import run
+
+
+TTL = dt.timedelta(minutes=10)
+HOUR = dt.timedelta(hours=1)
+
+
+async def _acquire(job_id: str, owner: str, period: dt.timedelta) -> bool:
+    async with AsyncSessionLocal() as session:
+        return await JobRepository.acquire(job_id, owner, TTL, period, session)
+
+
+async def _shift(job_id: str, **values: dt.timedelta) -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(JobLease)
+            .where(JobLease.job_id == job_id)
+            .values({
+                getattr(JobLease, column): getattr(JobLease, column) - delta
+                for column, delta in values.items()
+            })
+        )
+        await session.commit()
+
+
+async def _delete(job_id: str) -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(JobLease).where(JobLease.job_id == job_id))
+        await session.commit()
+
+
+async def _leases() -> list[bool]:
+    job_id = f"test-{uuid.uuid4().hex[:12]}"
+
+    try:
+        return [
+            await _acquire(job_id, "a", HOUR),
+            # Срок не наступил: ни владелец, ни другой экземпляр не запускают.
+            await _acquire(job_id, "a", HOUR),
+            await _acquire(job_id, "b", HOUR),
+            # Короткий период: владелец продлевает аренду, другой ждёт её истечения.
+            await _acquire(job_id, "a", dt.timedelta(0)),
+            await _acquire(job_id, "b", dt.timedelta(0)),
+        ]
+    finally:
+        await _delete(job_id)
+
+
+async def _takeover() -> list[bool]:
+    job_id = f"test-{uuid.uuid4().hex[:12]}"
+
+    try:
+        await _acquire(job_id, "a", HOUR)
+        # Владелец упал: аренда истекла, но срок запуска ещё не наступил.
+        await _shift(job_id, lease_until=TTL, last_started_at=TTL)
+        before_due = await _acquire(job_id, "b", HOUR)
+
+        await _shift(job_id, last_started_at=HOUR)
+        return [before_due, await _acquire(job_id, "b", HOUR)]
+    finally:
+        await _delete(job_id)
+
+
+@pytest.mark.usefixtures("database")
+def test_lease_is_exclusive_and_waits_for_period() -> None:
+    assert run(_leases()) == [True, False, False, True, False]
+
+
+@pytest.mark.usefixtures("database")
+def test_other_instance_takes_over_when_due() -> None:
+    assert run(_takeover()) == [False, True]
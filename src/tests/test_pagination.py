@@ -0,0 +1,51 @@
+import pytest
+from fastapi import HTTPException
+
+from app.services import (
+    cursor_sort,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+@pytest.mark.parametrize(
+    ("sort_key", "last_id"),
+    [(0, 1), (17, 42), (2 ** 40, 2 ** 31 - 1)],
+)
+def test_cursor_round_trip(sort_key: int, last_id: int) -> None:
+    cursor = encode_cursor("hour", sort_key, last_id)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, "hour") == (sort_key, last_id)
+
+
+def test_cursor_rejects_other_sort() -> None:
+    cursor = encode_cursor("hour", 5, 10)
+
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor, "day")
+
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64!",
+        "W10",  # []
+        "WyJob3VyIiwiMSIsMl0",  # ["hour","1",2]
+        "WyJob3VyIix0cnVlLDJd",  # ["hour",true,2]
+        "eyJhIjoxfQ",  # {"a":1}
+    ],
+)
+def test_cursor_rejects_malformed(cursor: str) -> None:
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor, "hour")
+
+    assert exc.value.status_code == 400
+
+
+def test_cursor_sort_prefers_hour_clicks() -> None:
+    assert cursor_sort(False, False) == "id"
+    assert cursor_sort(False, True) == "day"
+    assert cursor_sort(True, True) == "hour"
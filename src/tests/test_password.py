@@ -0,0 +1,94 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
+
+import pytest
+from fastapi import HTTPException
+
+from app.auth.security import password
+from app.core import settings
+
+
+@pytest.fixture
+def release() -> Iterator[threading.Event]:
+    event = threading.Event()
+    yield event
+    # Не оставляем заблокированный поток, даже если тест упал.
+    event.set()
+
+
+@pytest.fixture
+def pool(
+    monkeypatch: pytest.MonkeyPatch,
+    release: threading.Event,
+) -> Iterator[ThreadPoolExecutor]:
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(password, "password_executor", executor)
+    monkeypatch.setattr(settings, "password_hash_queue_size", 1)
+    yield executor
+    release.set()
+    executor.shutdown(wait=True)
+
+
+def test_hash_and_verify_in_pool() -> None:
+    async def scenario() -> tuple[bool, bool]:
+        hashed = await password.hash_password_async("correct horse")
+
+        return (
+            await password.verify_password_async("correct horse", hashed),
+            await password.verify_password_async("wrong", hashed),
+        )
+
+    assert asyncio.run(scenario()) == (True, False)
+
+
+def test_full_queue_is_rejected_with_429(
+    pool: ThreadPoolExecutor,
+    release: threading.Event,
+) -> None:
+    async def scenario() -> None:
+        busy = asyncio.create_task(password._run_in_pool(release.wait))
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(HTTPException) as exc:
+            await password._run_in_pool(str, "x")
+
+        assert exc.value.status_code == 429
+
+        release.set()
+        await busy
+
+        assert await password._run_in_pool(str, "x") == "x"
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_request_holds_slot_until_thread_finishes(
+    pool: ThreadPoolExecutor,
+    release: threading.Event,
+) -> None:
+    finished = threading.Event()
+
+    def slow() -> None:
+        release.wait()
+        finished.set()
+
+    async def scenario() -> None:
+        waiter = asyncio.create_task(password._run_in_pool(slow))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+
+        # Поток всё ещё хэширует, поэтому место в очереди не освобождено.
+        with pytest.raises(HTTPException):
+            await asyncio.wait_for(password._run_in_pool(str, "x"), timeout=1)
+
+        release.set()
+        await asyncio.to_thread(finished.wait)
+        await asyncio.sleep(0.01)
+
+        assert password._pending == 0
+        assert await password._run_in_pool(str, "x") == "x"
+
+    asyncio.run(scenario())
@@ -0,0 +1,225 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+)
+
+import pytest
+from fastapi import (
+    HTTPException,
+    Request,
+)
+from jose import JWTError
+from sqlalchemy import delete
+
+from app.auth.security import (
+    create_access_token,
+    decode_token_subject,
+)
+from app.core import (
+    AsyncSessionLocal,
+    settings,
+)
+from app.core.settings import RateLimitSettings
+from app.dao import RateLimitRepository
+from app.models import RateLimitBucket
+from app.ratelimit import (
+    Limit,
+    MemoryGCRA,
+    api_rate_limit,
+    rate_limit,
+)
+from app.ratelimit.limiter import memory_limiter
+from tests.conftest import run
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr("app.ratelimit.gcra.time.monotonic", clock)
+    return clock
+
+
+def test_gcra_allows_burst_then_limits(clock: Clock) -> None:
+    limiter = MemoryGCRA(maxsize=10)
+
+    assert [limiter.take("k", capacity=3, rate=1) for _ in range(3)] == [0, 0, 0]
+    assert limiter.take("k", capacity=3, rate=1) == pytest.approx(1.0)
+
+    clock.now += 1
+    assert limiter.take("k", capacity=3, rate=1) == 0
+    assert limiter.take("k", capacity=3, rate=1) == pytest.approx(1.0)
+
+
+def test_gcra_refills_to_capacity_only(clock: Clock) -> None:
+    limiter = MemoryGCRA(maxsize=10)
+    limiter.take("k", capacity=2, rate=1)
+
+    clock.now += 3600
+
+    assert [limiter.take("k", capacity=2, rate=1) for _ in range(3)] == [0, 0, pytest.approx(1.0)]
+
+
+def test_gcra_cost_spends_several_requests(clock: Clock) -> None:
+    limiter = MemoryGCRA(maxsize=10)
+
+    assert limiter.take("k", capacity=10, rate=2, cost=8) == 0
+    assert limiter.take("k", capacity=10, rate=2, cost=8) == pytest.approx(3.0)
+    assert limiter.take("k", capacity=10, rate=2, cost=2) == 0
+
+    clock.now += 4
+    assert limiter.take("k", capacity=10, rate=2, cost=8) == 0
+
+
+def test_gcra_keys_are_independent_and_bounded(clock: Clock) -> None:
+    limiter = MemoryGCRA(maxsize=2)
+    limiter.take("a", capacity=1, rate=1)
+
+    assert limiter.take("b", capacity=1, rate=1) == 0
+    assert limiter.take("a", capacity=1, rate=1) > 0
+
+    limiter.take("c", capacity=1, rate=1)
+
+    assert len(limiter) == 2
+    assert limiter.take("b", capacity=1, rate=1) > 0
+    # "a" вытеснен как давно не использованный и снова считается новым.
+    assert limiter.take("a", capacity=1, rate=1) == 0
+
+
+def _request(
+    ip: str,
+    token: str | None = None,
+    endpoint: Callable[..., Any] | None = None,
+) -> Request:
+    headers = [(b"authorization", f"Bearer {token}".encode())] if token else []
+
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "headers": headers,
+            "client": (ip, 1234),
+            "route": SimpleNamespace(endpoint=endpoint),
+        }
+    )
+
+
+def _allowed(
+    dependency: Callable[[Request], Awaitable[None]],
+    request: Request,
+    times: int,
+) -> int:
+    async def attempt() -> int:
+        allowed = 0
+
+        for _ in range(times):
+            try:
+                await dependency(request)
+                allowed += 1
+
+            except HTTPException as exc:
+                assert exc.status_code == 429
+
+        return allowed
+
+    return asyncio.run(attempt())
+
+
+@pytest.fixture
+def memory_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "rate_limit_enabled", True)
+    monkeypatch.setattr(settings, "rate_limit_backend", "memory")
+    monkeypatch.setattr(memory_limiter, "_tat", type(memory_limiter._tat)())
+
+
+@pytest.mark.usefixtures("memory_backend", "clock")
+def test_routes_have_independent_limits() -> None:
+    ip = "10.0.0.1"
+    cheap = rate_limit("test:cheap", Limit(5, 1))
+    costly = rate_limit("test:costly", Limit(5, 1), cost=5)
+
+    assert _allowed(costly, _request(ip), 3) == 1
+    assert _allowed(cheap, _request(ip), 6) == 5
+
+
+@pytest.mark.usefixtures("memory_backend", "clock")
+def test_authenticated_clients_are_limited_per_user() -> None:
+    dependency = rate_limit("test:user", Limit(1, 1), user_limit=Limit(3, 1))
+    token = create_access_token({"sub": f"{uuid.uuid4().hex}@example.com"})
+
+    assert _allowed(dependency, _request("10.1.0.1", token), 2) == 2
+    assert _allowed(dependency, _request("10.1.0.2", token), 2) == 1
+    assert _allowed(dependency, _request("10.1.0.3", "not-a-token"), 2) == 1
+
+
+async def cut_url_batch() -> None: ...
+
+
+async def top() -> None: ...
+
+
+async def login() -> None: ...
+
+
+@pytest.mark.usefixtures("memory_backend", "clock")
+def test_api_limit_applies_route_overrides(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("API_ROUTE_LIMITS", '{"top": {"burst": 2}, "login": {"burst": 3}}')
+    monkeypatch.setattr(settings, "api_rate_burst", 20)
+    monkeypatch.setattr(settings, "api_route_limits", RateLimitSettings().api_route_limits)
+    ip = "10.2.0.1"
+
+    assert _allowed(api_rate_limit, _request(ip, endpoint=top), 3) == 2
+    # Стоимость пакетного создания ссылок задана по умолчанию.
+    assert _allowed(api_rate_limit, _request(ip, endpoint=cut_url_batch), 3) == 2
+    # Вход ограничивается своими лимитами, переопределение поля их не включает.
+    assert _allowed(api_rate_limit, _request(ip, endpoint=login), 30) == 30
+
+
+def test_decode_token_subject() -> None:
+    email = f"{uuid.uuid4().hex}@example.com"
+    token = create_access_token({"sub": email})
+
+    assert decode_token_subject(token) == email
+    assert decode_token_subject(create_access_token({})) is None
+
+    with pytest.raises(JWTError):
+        decode_token_subject(token[:-2] + "xx")
+
+
+async def _take_many(key: str, costs: list[float]) -> list[float]:
+    results = []
+
+    try:
+        for cost in costs:
+            async with AsyncSessionLocal() as session:
+                results.append(await RateLimitRepository.take(key, 10, 0.001, session, cost=cost))
+
+    finally:
+        async with AsyncSessionLocal() as session:
+            await session.execute(delete(RateLimitBucket).where(RateLimitBucket.key == key))
+            await session.commit()
+
+    return results
+
+
+@pytest.mark.usefixtures("database")
+def test_postgres_bucket_spends_cost() -> None:
+    key = f"test:{uuid.uuid4().hex}"
+
+    first, second, third = run(_take_many(key, [6, 6, 4]))
+
+    assert first == 0
+    assert second > 0
+    assert third == 0
@@ -0,0 +1,109 @@
+import random
+from collections import Counter
+
+import pytest
+
+from app.cache import (
+    SlidingTopK,
+    SpaceSaving,
+)
+
+
+def test_space_saving_is_exact_below_capacity() -> None:
+    summary: SpaceSaving[str] = SpaceSaving(capacity=10)
+
+    for key, count in {"a": 5, "b": 3, "c": 1}.items():
+        for _ in range(count):
+            summary.add(key)
+
+    assert sorted(summary.items()) == [("a", 5, 0), ("b", 3, 0), ("c", 1, 0)]
+
+
+def test_space_saving_bounds_hold_on_skewed_stream() -> None:
+    rng = random.Random(42)
+    capacity = 50
+    stream = [int(rng.paretovariate(1.1)) for _ in range(50_000)]
+    exact = Counter(stream)
+    summary: SpaceSaving[int] = SpaceSaving(capacity)
+
+    for key in stream:
+        summary.add(key)
+
+    items = summary.items()
+    tracked = {key: (count, error) for key, count, error in items}
+
+    assert len(items) <= capacity
+    assert sum(count for _, count, _ in items) == len(stream)
+
+    for key, (count, error) in tracked.items():
+        assert count - error <= exact[key] <= count
+
+    # Любой ключ с частотой больше N / capacity гарантированно отслеживается.
+    for key, count in exact.items():
+        if count > len(stream) / capacity:
+            assert key in tracked
+
+
+def test_space_saving_clear() -> None:
+    summary: SpaceSaving[str] = SpaceSaving(capacity=2)
+    summary.add("a")
+    summary.clear()
+    summary.add("b")
+
+    assert summary.items() == [("b", 1, 0)]
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr("app.cache.topk.time.monotonic", clock)
+    return clock
+
+
+def test_sliding_top_k_ranks_within_window(clock: Clock) -> None:
+    tracker: SlidingTopK[str] = SlidingTopK(window=60, slots=6, capacity=10, query_ttl=0)
+
+    for key, count in {"a": 3, "b": 5, "c": 1}.items():
+        for _ in range(count):
+            tracker.add(key)
+
+    assert tracker.top(2) == [("b", 5, 0), ("a", 3, 0)]
+
+
+def test_sliding_top_k_forgets_expired_slots(clock: Clock) -> None:
+    tracker: SlidingTopK[str] = SlidingTopK(window=60, slots=6, capacity=10, query_ttl=0)
+
+    tracker.add("old")
+    clock.now += 30
+    tracker.add("new")
+
+    assert {key for key, _, _ in tracker.top(10)} == {"old", "new"}
+
+    clock.now += 40
+
+    assert tracker.top(10) == [("new", 1, 0)]
+
+    clock.now += 3600
+
+    assert tracker.top(10) == []
+
+
+def test_sliding_top_k_caches_ranking(clock: Clock) -> None:
+    tracker: SlidingTopK[str] = SlidingTopK(window=60, slots=6, capacity=10, query_ttl=5)
+
+    tracker.add("a")
+    assert tracker.top(10) == [("a", 1, 0)]
+
+    tracker.add("b")
+    assert tracker.top(10) == [("a", 1, 0)]
+
+    clock.now += 5
+    assert sorted(tracker.top(10)) == [("a", 1, 0), ("b", 1, 0)]